@@ -1,89 +1,215 @@
 import asyncio
 import base64
+import hashlib
+import json
+import mimetypes
+import os
 import time
-import io
-from typing import Any
-
-from faster_whisper import WhisperModel
-import instructor
-from google import genai
-from langfuse import get_client
-from langfuse.openai import AsyncOpenAI
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Coroutine
+
+import numpy as np
 from loguru import logger
-from openinference.instrumentation.google_genai import GoogleGenAIInstrumentor
 
+from ai_feedback.audio import PreparedAudio, TrimStats, prepare_audio
+from ai_feedback.cache import LRUCache, TieredCache, make_cache_key
+from ai_feedback.challenge_registry import CompiledChallenge, challenge_registry
 from ai_feedback.config import settings
-from ai_feedback.constants.conditional_prompts import COACHING_RECOMMENDATIONS_PROMPTS
-from ai_feedback.constants.fallback_prompts import (
-    FALLBACK_INCLUDE_COACHING_RECOMMENDATIONS,
-    FALLBACK_MAX_WORDS_PER_SPEECH_DIMENSION,
+from ai_feedback.constants.conditional_prompts import (
+    COACHING_RECOMMENDATIONS_INSTRUCTIONS,
 )
 from ai_feedback.constants.prompts import (
     AUDIO_ANALYSIS_PROMPT,
     AUDIO_ANALYSIS_PROMPT_LEGACY,
     TEXT_ANALYSIS_PROMPT,
     EXTRACT_KEYWORDS_PROMPT,
+    EXTRACT_KEYWORDS_TRANSLATION_INSTRUCTION,
     JUDGE_FEEDBACK_PROMPT,
+    SINGLE_PASS_COACHING_TASK,
+    SINGLE_PASS_NO_COACHING_TASK,
+    SINGLE_PASS_TEXT_ANALYSIS_PROMPT,
     SPEECH_ANALYSIS_SKIPPED,
+    TRANSLATE_KEYWORDS_PROMPT,
     VIDEO_ANALYSIS_PROMPT,
 )
 from ai_feedback.constants.translations import STYLE_CATEGORY_TITLES
+from ai_feedback.keyword_matching import (
+    match_keywords_locally,
+    supports_local_matching,
+)
+from ai_feedback.keyword_translations import keyword_translations
+from ai_feedback.lesson_match import score_lesson_match
+from ai_feedback.metrics import metrics
 from ai_feedback.models import (
     ScriptDetails,
     AudioAnalysis,
     AudioAnalysisLegacy,
+    KeyElementAssessment,
+    KeyElementCoaching,
     LessonDetailsExtractedKeywords,
+    LessonDetailsKeywordMatches,
+    ScriptWithExtractedKeywords,
+    SinglePassTextAnalysis,
     SupportedLanguage,
     StyleCategory,
+    TextAnalysis,
+    TranslatedKeywords,
 )
-from ai_feedback.utils import (
-    lf,
-    read_audio,
-    generate_session_id,
-)
-
-MAX_ITERATIONS = 60  # e.g. ~60 seconds total
-SLEEP_SECONDS = 1
-
-LANGUAGE_TO_WHISPER_CODE = {
-    "english": "en",
-    "german": "de",
-    "dutch": "nl",
-    "french": "fr",
-    "malay": "ms",
-    "spanish": "es",
-    "polish": "pl",
+from ai_feedback.prompt_registry import prompt_registry
+from ai_feedback.rendering import render_key_element_table
+from ai_feedback.transcription import MODEL_SPECS, get_fast_transcription
+from ai_feedback.utils import generate_session_id
+
+if TYPE_CHECKING:
+    import instructor
+    from google import genai
+    from langfuse.openai import AsyncOpenAI
+
+# Polling of Gemini file processing: a fast first check, then exponential backoff
+FILE_POLL_INITIAL_SECONDS = 0.25
+FILE_POLL_BACKOFF_FACTOR = 2
+FILE_POLL_MAX_SECONDS = 4
+FILE_PROCESSING_TIMEOUT_SECONDS = 60
+# Video formats Gemini accepts as inline request data
+INLINE_VIDEO_MIME_TYPES = {
+    "video/mp4",
+    "video/mpeg",
+    "video/quicktime",
+    "video/x-msvideo",
+    "video/x-flv",
+    "video/webm",
+    "video/x-ms-wmv",
+    "video/3gpp",
 }
 
+VIDEO_ANALYSIS_MODEL = "gemini-3-flash-preview"
 
-logger.info("Initializing Faster Whisper model...")
-try:
-    whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
-    logger.info("Faster Whisper model loaded successfully.")
-except Exception as e:
-    logger.exception(f"Failed to load Whisper model: {e}")
-    whisper_model = None
+EXTRACT_KEYWORDS_PROMPT_HASH = hashlib.sha256(
+    (EXTRACT_KEYWORDS_PROMPT + EXTRACT_KEYWORDS_TRANSLATION_INSTRUCTION).encode("utf-8")
+).hexdigest()[:12]
 
-langfuse = get_client()
-GoogleGenAIInstrumentor().instrument()
+PROMPT_TEMPLATES_HASH = hashlib.sha256(
+    "".join(
+        [
+            AUDIO_ANALYSIS_PROMPT,
+            AUDIO_ANALYSIS_PROMPT_LEGACY,
+            TEXT_ANALYSIS_PROMPT,
+            EXTRACT_KEYWORDS_PROMPT,
+            EXTRACT_KEYWORDS_TRANSLATION_INSTRUCTION,
+            SINGLE_PASS_TEXT_ANALYSIS_PROMPT,
+            VIDEO_ANALYSIS_PROMPT,
+            COACHING_RECOMMENDATIONS_INSTRUCTIONS,
+        ]
+    ).encode("utf-8")
+).hexdigest()[:12]
 
-client = AsyncOpenAI(
-    api_key=settings.ai_api_key,
-    base_url=settings.ai_base_url,
-)
-instructor_client = instructor.from_openai(client)
 
-genai_client = genai.Client(api_key=settings.ai_api_key)
+# The LLM SDKs are slow to import and set up tracing as a side effect, so
+# they are imported and created on first use (or during app startup, see
+# init_clients) rather than when this module is imported.
+
+
+@cache
+def init_tracing():
+    from langfuse import get_client
+    from openinference.instrumentation.google_genai import GoogleGenAIInstrumentor
+
+    get_client()
+    GoogleGenAIInstrumentor().instrument()
+
+
+@cache
+def get_openai_client() -> "AsyncOpenAI":
+    from langfuse.openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=settings.ai_api_key,
+        base_url=settings.ai_base_url,
+    )
+
+
+@cache
+def get_instructor_client() -> "instructor.AsyncInstructor":
+    import instructor
+
+    return instructor.from_openai(get_openai_client())
+
+
+@cache
+def get_genai_client() -> "genai.Client":
+    from google import genai
+
+    init_tracing()
+    return genai.Client(api_key=settings.ai_api_key)
+
+
+def init_clients():
+    """Imports the LLM SDKs and creates all clients ahead of the first request."""
+    t0 = time.time()
+    init_tracing()
+    get_instructor_client()
+    get_genai_client()
+    logger.info(f"LLM clients initialized in {time.time() - t0:.2f}s")
+
+
+def record_token_usage(stage: str, input_tokens: int | None, output_tokens: int | None):
+    metrics.increment(f"llm_calls_{stage}")
+    metrics.increment(f"llm_input_tokens_{stage}", input_tokens or 0)
+    metrics.increment(f"llm_output_tokens_{stage}", output_tokens or 0)
+
+
+def record_genai_token_usage(stage: str, response: Any):
+    usage = getattr(response, "usage_metadata", None)
+    record_token_usage(
+        stage,
+        usage.prompt_token_count if usage is not None else None,
+        usage.candidates_token_count if usage is not None else None,
+    )
+
+
+keyword_cache = TieredCache(
+    "keyword_equivalents",
+    memory=LRUCache(
+        max_entries=settings.keyword_cache_max_entries,
+        ttl_seconds=settings.keyword_cache_ttl_seconds,
+    ),
+)
 
 
 async def delete_gemini_file(file_name: str):
     try:
-        await genai_client.aio.files.delete(name=file_name)
+        await get_genai_client().aio.files.delete(name=file_name)
         logger.info(f"Deleted uploaded file in background: {file_name}")
     except Exception as e:
         logger.warning(f"Failed to delete uploaded file in background: {e}")
 
 
+def get_pipeline_fingerprint() -> dict[str, Any]:
+    """
+    Everything besides the request itself that determines a response:
+    model names and the versions of the prompts in use.
+    """
+    return {
+        "ai_model_name": settings.ai_model_name,
+        "video_analysis_model": VIDEO_ANALYSIS_MODEL,
+        "whisper_models": {
+            language: str(spec) for language, spec in MODEL_SPECS.items()
+        },
+        "vad_trim": (
+            settings.vad_max_pause_seconds if settings.vad_trim_enabled else None
+        ),
+        "text_pipeline_mode": settings.text_pipeline_mode,
+        "lesson_precheck": (
+            settings.lesson_precheck_off_topic_threshold
+            if settings.lesson_precheck_enabled
+            else None
+        ),
+        "prompt_templates": PROMPT_TEMPLATES_HASH,
+        "langfuse_prompts": prompt_registry.versions(),
+    }
+
+
 def get_scores_and_matching_keywords(
     keyword_equivalents: LessonDetailsExtractedKeywords,
 ) -> tuple[dict[str, int], dict[str, list[str]]]:
@@ -125,18 +251,26 @@ def get_scores_and_matching_keywords(
     return scores, matching_keywords
 
 
+def get_trim_note_content(trim_stats: TrimStats | None) -> list[dict[str, str]]:
+    if trim_stats is None or trim_stats.seconds_removed <= 0:
+        return []
+    return [{"type": "text", "text": trim_stats.describe()}]
+
+
 async def get_audio_analysis(
-    audio: bytes, session_id: str, language: str = SupportedLanguage.ENGLISH.value
+    audio: bytes,
+    session_id: str,
+    language: str = SupportedLanguage.ENGLISH.value,
+    audio_format: str = "mp3",
+    trim_stats: TrimStats | None = None,
 ) -> AudioAnalysis:
     encoded_string = base64.b64encode(audio).decode("utf-8")
 
-    max_words_per_speech_dimension = lf.get_prompt(
-        "max-words-per-speech-dimension",
-        label="production",
-        fallback=FALLBACK_MAX_WORDS_PER_SPEECH_DIMENSION,
-    ).prompt
+    max_words_per_speech_dimension = prompt_registry.get(
+        "max-words-per-speech-dimension"
+    )
 
-    audio_analysis = await instructor_client.chat.completions.create(
+    audio_analysis = await get_instructor_client().chat.completions.create(
         model=settings.ai_model_name,
         modalities=["text"],
         messages=[
@@ -152,8 +286,12 @@ async def get_audio_analysis(
                 "content": [
                     {
                         "type": "input_audio",
-                        "input_audio": {"data": encoded_string, "format": "wav"},
+                        "input_audio": {
+                            "data": encoded_string,
+                            "format": audio_format,
+                        },
                     },
+                    *get_trim_note_content(trim_stats),
                 ],
             },
         ],
@@ -170,16 +308,16 @@ async def get_audio_analysis_legacy(
     audio: bytes,
     session_id: str,
     language: str = SupportedLanguage.ENGLISH.value,
+    audio_format: str = "mp3",
+    trim_stats: TrimStats | None = None,
 ) -> AudioAnalysisLegacy:
     encoded_string = base64.b64encode(audio).decode("utf-8")
 
-    max_words_per_speech_dimension = lf.get_prompt(
-        "max-words-per-speech-dimension",
-        label="production",
-        fallback=FALLBACK_MAX_WORDS_PER_SPEECH_DIMENSION,
-    ).prompt
+    max_words_per_speech_dimension = prompt_registry.get(
+        "max-words-per-speech-dimension"
+    )
 
-    audio_analysis = await instructor_client.chat.completions.create(
+    audio_analysis = await get_instructor_client().chat.completions.create(
         model=settings.ai_model_name,
         modalities=["text"],
         messages=[
@@ -195,8 +333,12 @@ async def get_audio_analysis_legacy(
                 "content": [
                     {
                         "type": "input_audio",
-                        "input_audio": {"data": encoded_string, "format": "wav"},
+                        "input_audio": {
+                            "data": encoded_string,
+                            "format": audio_format,
+                        },
                     },
+                    *get_trim_note_content(trim_stats),
                 ],
             },
         ],
@@ -209,77 +351,92 @@ async def get_audio_analysis_legacy(
     return audio_analysis
 
 
-def _transcribe_audio_sync(audio_source: bytes | str, language: str) -> str:
-    if whisper_model is None:
-        raise RuntimeError("Whisper model not initialized")
-
-    # audio_source could be `bytes` (from get_feedback/legacy) or `str` (from get_feedback_from_video file path)
-    if isinstance(audio_source, bytes):
-        audio_input = io.BytesIO(audio_source)
-    else:
-        audio_input = audio_source
-
-    whisper_lang = LANGUAGE_TO_WHISPER_CODE.get(language.lower(), "en")
-    segments, _ = whisper_model.transcribe(audio_input, language=whisper_lang)
-    return " ".join([segment.text for segment in segments])
-
-
-async def get_fast_transcription(
-    audio_source: bytes | str, language: str = SupportedLanguage.ENGLISH.value
-) -> str:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(
-        None, _transcribe_audio_sync, audio_source, language
-    )
-
-
-async def upload_and_wait_for_file(video_filename: str) -> Any:
+async def upload_and_wait_for_file(
+    video_filename: str, timing_logs: list[str]
+) -> Any:
     logger.info(f"Uploading video file: {video_filename}")
 
-    myfile = await genai_client.aio.files.upload(file=video_filename)
+    t0_up = time.time()
+    try:
+        myfile = await get_genai_client().aio.files.upload(file=video_filename)
+    except asyncio.CancelledError:
+        # Aborting the request leaves no finalized file behind
+        metrics.increment("video_pipeline_cancelled_upload")
+        raise
+    timing_logs.append(f"gemini_file_upload: {time.time() - t0_up:.2f}s")
     logger.info(f"Video uploaded with URI: {myfile.uri}")
 
-    for i in range(MAX_ITERATIONS):
-        if myfile.state.name != "PROCESSING":
-            break
-
-        logger.info(f"Waiting for video processing... ({i + 1}/{MAX_ITERATIONS})")
-        await asyncio.sleep(SLEEP_SECONDS)
-        myfile = await genai_client.aio.files.get(name=myfile.name)
-    else:
-        raise TimeoutError("File processing timed out")
-
-    if myfile.state.name == "FAILED":
-        raise RuntimeError(f"Video processing failed: {myfile.state}")
+    t0_wait = time.time()
+    polls = 0
+    delay = FILE_POLL_INITIAL_SECONDS
+    try:
+        while myfile.state.name == "PROCESSING":
+            if time.time() - t0_wait > FILE_PROCESSING_TIMEOUT_SECONDS:
+                raise TimeoutError("File processing timed out")
+
+            logger.info(f"Waiting {delay:.2f}s for video processing...")
+            await asyncio.sleep(delay)
+            delay = min(delay * FILE_POLL_BACKOFF_FACTOR, FILE_POLL_MAX_SECONDS)
+            myfile = await get_genai_client().aio.files.get(name=myfile.name)
+            polls += 1
+
+        if myfile.state.name == "FAILED":
+            raise RuntimeError(f"Video processing failed: {myfile.state}")
+    except BaseException as e:
+        # Processing failed, timed out or was cancelled: the file is of no use
+        if isinstance(e, asyncio.CancelledError):
+            metrics.increment("video_pipeline_cancelled_processing")
+        asyncio.create_task(delete_gemini_file(myfile.name))
+        raise
+    wait_seconds = time.time() - t0_wait
+    metrics.observe("gemini_file_processing", wait_seconds)
+    metrics.increment("gemini_file_polls", polls)
+    timing_logs.append(f"gemini_file_processing: {wait_seconds:.2f}s ({polls} polls)")
 
     logger.info("Video processing complete.")
     return myfile
 
 
+async def get_inline_video(video_filename: str) -> Any | None:
+    """
+    The video as inline request data when it is small enough to skip the
+    Files API upload and processing wait, None otherwise.
+    """
+    from google.genai import types
+
+    mime_type, _ = mimetypes.guess_type(video_filename)
+    if (
+        mime_type not in INLINE_VIDEO_MIME_TYPES
+        or os.path.getsize(video_filename) > settings.video_inline_max_bytes
+    ):
+        return None
+    data = await asyncio.to_thread(Path(video_filename).read_bytes)
+    return types.Part.from_bytes(data=data, mime_type=mime_type)
+
+
 async def get_video_analysis(
-    myfile: Any, session_id: str, language: str = SupportedLanguage.ENGLISH.value
+    video: Any, session_id: str, language: str = SupportedLanguage.ENGLISH.value
 ) -> AudioAnalysis:
     """
     Analyze video using Gemini 3.0's multimodal capabilities.
-    Processes both audio and visual streams from an already uploaded file.
+    Processes both audio and visual streams from an already uploaded file or
+    inline video data.
     Returns AudioAnalysis structure for compatibility with existing pipeline.
     """
     logger.info("Generating video analysis...")
 
-    max_words_per_speech_dimension = lf.get_prompt(
-        "max-words-per-speech-dimension",
-        label="production",
-        fallback=FALLBACK_MAX_WORDS_PER_SPEECH_DIMENSION,
-    ).prompt
+    max_words_per_speech_dimension = prompt_registry.get(
+        "max-words-per-speech-dimension"
+    )
 
-    response = await genai_client.aio.models.generate_content(
-        model="gemini-3-flash-preview",
+    response = await get_genai_client().aio.models.generate_content(
+        model=VIDEO_ANALYSIS_MODEL,
         contents=[
             VIDEO_ANALYSIS_PROMPT.format(
                 max_words_per_speech_dimension=max_words_per_speech_dimension,
                 language=language,
             ),
-            myfile,
+            video,
         ],
         config={
             "response_mime_type": "application/json",
@@ -295,6 +452,22 @@ async def get_video_analysis(
     return response.parsed
 
 
+def map_coaching_recommendations(
+    scores: dict[str, int], elements: list[KeyElementCoaching | KeyElementAssessment]
+) -> dict[str, str]:
+    """Coaching per scored key element, by script or else by position."""
+    by_script = {element.script: element for element in elements}
+    coaching_recommendations = {}
+    for position, script in enumerate(scores):
+        element = by_script.get(script) or (
+            elements[position] if position < len(elements) else None
+        )
+        coaching_recommendations[script] = (
+            element.coaching_recommendation if element is not None else ""
+        )
+    return coaching_recommendations
+
+
 async def get_text_analysis(
     *,
     transcript: str,
@@ -305,16 +478,9 @@ async def get_text_analysis(
     language: str = SupportedLanguage.ENGLISH.value,
 ) -> str:
     include_coaching_recommendations = (
-        lf.get_prompt(
-            "include-coaching-recommendations",
-            label="production",
-            fallback=FALLBACK_INCLUDE_COACHING_RECOMMENDATIONS,
-        )
-        .prompt.strip()
-        .lower()
+        prompt_registry.get("include-coaching-recommendations").strip().lower()
         == "true"
     )
-    prompt_values = COACHING_RECOMMENDATIONS_PROMPTS[include_coaching_recommendations]
     logger.info(
         f"Include coaching recommendations: <{include_coaching_recommendations}>"
     )
@@ -322,49 +488,53 @@ async def get_text_analysis(
     titles = STYLE_CATEGORY_TITLES.get(
         language, STYLE_CATEGORY_TITLES[SupportedLanguage.ENGLISH.value]
     )
-    response = await client.chat.completions.create(  # pyright: ignore
+    # Without coaching the table is fully determined by the scores
+    if not include_coaching_recommendations:
+        return render_key_element_table(scores, matching_keywords, titles)
+
+    challenge = await challenge_registry.compile(script_details, language)
+    (
+        text_analysis,
+        completion,
+    ) = await get_instructor_client().chat.completions.create_with_completion(
         model=settings.ai_model_name,
         modalities=["text"],
         messages=[
             {
                 "role": "developer",
                 "content": TEXT_ANALYSIS_PROMPT.format(
-                    coaching_column_mention=prompt_values["coaching_column_mention"],
-                    table_example=prompt_values["table_example"],
-                    coaching_column_instructions=prompt_values[
-                        "coaching_column_instructions"
-                    ],
                     language=language,
-                    assessment_heading=titles["assessment_heading"],
-                    key_elements_col=titles["key_elements_col"],
-                    recording_matches_col=titles["recording_matches_col"],
-                    score_col=titles["score_col"],
-                    yes=titles["yes"],
-                    partially=titles["partially"],
-                    no=titles["no"],
+                    coaching_instructions=COACHING_RECOMMENDATIONS_INSTRUCTIONS,
                 ),
             },
             {
                 "role": "user",
                 "content": (
                     f"<transcript>{transcript}</transcript>\n\n"
-                    f"<script_details>{script_details}</script_details>\n\n"
+                    f"{challenge.text_analysis_lesson_segment}\n\n"
                     f"<key_elements_scores>{scores}</key_elements_scores>\n\n"
+                    f"<key_elements_keywords>{matching_keywords}</key_elements_keywords>\n\n"
                 ),
             },
         ],
+        response_model=TextAnalysis,
     )
 
-    text_analysis = response.choices[0].message.content
     if text_analysis is None:
         raise RuntimeError("External API call failed: received None")
+    if completion.usage is not None:
+        record_token_usage(
+            "text_analysis",
+            completion.usage.prompt_tokens,
+            completion.usage.completion_tokens,
+        )
 
-    for script, keywords in matching_keywords.items():
-        # replacing script with list of bold-formatted keywords
-        # text_analysis = text_analysis.replace(script, f"- {', '.join(keywords)}")
-        text_analysis = text_analysis.replace(script, "- " + " \| ".join(keywords))
-
-    return text_analysis
+    return render_key_element_table(
+        scores,
+        matching_keywords,
+        titles,
+        map_coaching_recommendations(scores, text_analysis.key_elements),
+    )
 
 
 async def get_keyword_equivalents(
@@ -374,17 +544,103 @@ async def get_keyword_equivalents(
     session_id: str,
     language: str = SupportedLanguage.ENGLISH.value,
 ) -> LessonDetailsExtractedKeywords:
+    challenge = await challenge_registry.compile(script_details, language)
+    match_locally = settings.local_keyword_matching_enabled and supports_local_matching(
+        language
+    )
+    cache_key = None
+    if settings.keyword_cache_enabled:
+        cache_key = make_cache_key(
+            " ".join(transcript.split()),
+            challenge.challenge_hash,
+            language,
+            settings.ai_model_name,
+            EXTRACT_KEYWORDS_PROMPT_HASH,
+            match_locally,
+            settings.local_keyword_matching_skip_llm,
+        )
+        cached = await keyword_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Keyword equivalents served from cache")
+            return apply_keyword_translations(cached, challenge.translated_keywords)
+
+    if match_locally:
+        local_matches = match_keywords_locally(
+            script_details,
+            transcript,
+            challenge.keyword_index,
+            challenge.translated_keywords,
+        )
+        metrics.increment("keywords_matched_locally", local_matches.resolved_count)
+        metrics.increment("keywords_matched_fuzzy", local_matches.fuzzy_matches)
+        metrics.increment("keywords_sent_to_llm", local_matches.unresolved_count)
+        logger.info(
+            f"Matched {local_matches.resolved_count} keywords locally, "
+            f"{local_matches.unresolved_count} left for the LLM"
+        )
+        if (
+            settings.local_keyword_matching_skip_llm
+            and local_matches.unresolved_count == 0
+            and not local_matches.looks_like_keyword_recitation
+        ):
+            metrics.increment("keyword_llm_calls_skipped")
+            keyword_equivalents = local_matches.merge()
+        else:
+            unresolved_lesson = local_matches.unresolved_script_details()
+            keyword_equivalents = await extract_keyword_equivalents(
+                transcript,
+                challenge,
+                f"<lesson_details>{unresolved_lesson}</lesson_details>",
+            )
+            if keyword_equivalents is not None:
+                keyword_equivalents = local_matches.merge(keyword_equivalents)
+    else:
+        keyword_equivalents = await extract_keyword_equivalents(
+            transcript, challenge, challenge.keyword_lesson_segment
+        )
+
+    if keyword_equivalents is None:
+        return None
+    if cache_key is not None:
+        await keyword_cache.set(cache_key, keyword_equivalents)
+    return apply_keyword_translations(
+        keyword_equivalents, challenge.translated_keywords
+    )
+
 
+def apply_keyword_translations(
+    keyword_equivalents: LessonDetailsExtractedKeywords,
+    translated_keywords: dict[str, str],
+) -> LessonDetailsExtractedKeywords:
+    """Shows stored translations, so keywords read the same in every response."""
+    keyword_equivalents = keyword_equivalents.model_copy(deep=True)
+    for script in keyword_equivalents.scripts:
+        for mapping in script.keywords_with_equivalents:
+            mapping.translated_keyword = translated_keywords.get(
+                mapping.keyword, mapping.translated_keyword
+            )
+    return keyword_equivalents
+
+
+async def extract_keyword_equivalents(
+    transcript: str, challenge: CompiledChallenge, lesson_segment: str
+) -> LessonDetailsExtractedKeywords | None:
+    # Known translations are not asked for, which saves output tokens
+    response_schema = (
+        LessonDetailsKeywordMatches
+        if challenge.has_all_translations
+        else LessonDetailsExtractedKeywords
+    )
     logger.info(f"Before calling instructor_client")
-    keyword_equivalents = await genai_client.aio.models.generate_content(
+    keyword_equivalents = await get_genai_client().aio.models.generate_content(
         model=settings.ai_model_name,
         contents=[
-            EXTRACT_KEYWORDS_PROMPT.format(language=language),
-            f"<transcript>{transcript}</transcript>\n\n <lesson_details>{script_details}</lesson_details>",
+            challenge.keyword_prompt,
+            f"<transcript>{transcript}</transcript>\n\n {lesson_segment}",
         ],
         config={
             "response_mime_type": "application/json",
-            "response_schema": LessonDetailsExtractedKeywords,
+            "response_schema": response_schema,
         },
     )
     # log keyword_equivalents
@@ -392,12 +648,153 @@ async def get_keyword_equivalents(
 
     if keyword_equivalents is None:
         raise RuntimeError("External API call failed: received None")
+    record_genai_token_usage("keyword_extraction", keyword_equivalents)
+    if keyword_equivalents.parsed is None:
+        return None
 
-    return keyword_equivalents.parsed
+    parsed = LessonDetailsExtractedKeywords.model_validate(
+        keyword_equivalents.parsed.model_dump()
+    )
+    await store_generated_translations(challenge, parsed)
+    return parsed
+
+
+async def store_generated_translations(
+    challenge: CompiledChallenge, keyword_equivalents: LessonDetailsExtractedKeywords
+):
+    if challenge.has_all_translations:
+        return
+    await keyword_translations.store(
+        {
+            mapping.keyword: mapping.translated_keyword
+            for script in keyword_equivalents.scripts
+            for mapping in script.keywords_with_equivalents
+            if mapping.keyword in challenge.keywords
+        },
+        challenge.language,
+    )
+
+
+async def translate_keywords(keywords: list[str], language: str) -> dict[str, str]:
+    """
+    Translations of `keywords` into `language`, generating and storing the
+    ones that are not known yet.
+    """
+    translated_keywords = await keyword_translations.lookup(keywords, language)
+    missing = [keyword for keyword in keywords if keyword not in translated_keywords]
+    if not missing:
+        return translated_keywords
+
+    response = await get_genai_client().aio.models.generate_content(
+        model=settings.ai_model_name,
+        contents=[
+            TRANSLATE_KEYWORDS_PROMPT.format(language=language),
+            json.dumps(list(dict.fromkeys(missing)), ensure_ascii=False),
+        ],
+        config={
+            "response_mime_type": "application/json",
+            "response_schema": TranslatedKeywords,
+        },
+    )
+    if response is None or response.parsed is None:
+        raise RuntimeError("External API call failed: received None")
+
+    await keyword_translations.store(
+        {
+            translation.keyword: translation.translated_keyword
+            for translation in response.parsed.translations
+            if translation.keyword in missing
+        },
+        language,
+    )
+    return await keyword_translations.lookup(keywords, language)
 
 
 async def process_text_feedback(
     transcript, script_details, session_id, language, timing_logs
+):
+    t0 = time.time()
+    mode = settings.text_pipeline_mode
+    if mode == "single_pass":
+        result = await process_text_feedback_single_pass(
+            transcript, script_details, session_id, language, timing_logs
+        )
+    else:
+        result = await process_text_feedback_two_pass(
+            transcript, script_details, session_id, language, timing_logs
+        )
+    metrics.observe(f"text_pipeline_{mode}", time.time() - t0)
+    return result
+
+
+async def is_clearly_off_topic(
+    transcript: str, script_details: ScriptDetails, language: str, timing_logs
+) -> bool:
+    """
+    Local lesson-match pre-check. Only recordings scoring below the
+    calibrated threshold are decided locally; everything else is left to the
+    LLM's lesson match.
+    """
+    challenge = await challenge_registry.compile(script_details, language)
+    lesson_match = score_lesson_match(challenge, transcript)
+    if lesson_match is None:
+        return False
+    off_topic = lesson_match.score < settings.lesson_precheck_off_topic_threshold
+    metrics.increment(
+        "lesson_precheck_off_topic" if off_topic else "lesson_precheck_passed"
+    )
+    timing_logs.append(
+        f"lesson_precheck: {lesson_match.score:.2f}"
+        f"{' (off topic)' if off_topic else ''}"
+    )
+    return off_topic
+
+
+async def process_text_feedback_off_topic(
+    transcript, script_details, session_id, language, timing_logs
+):
+    """
+    Feedback for a recording the pre-check found clearly off topic: keywords
+    are only matched locally and the transcript is marked as not matching the
+    lesson, so the style analysis is never started.
+    """
+    t0 = time.time()
+    challenge = await challenge_registry.compile(script_details, language)
+    kw_eq = (
+        match_keywords_locally(
+            script_details,
+            transcript,
+            challenge.keyword_index,
+            challenge.translated_keywords,
+        )
+        .merge()
+        .model_copy(update={"transcript_matches_lesson": False})
+    )
+    kw_eq = apply_keyword_translations(kw_eq, challenge.translated_keywords)
+
+    logger.info(f"Keyword equivalents: {kw_eq}")
+    scores, matching_keywords = get_scores_and_matching_keywords(kw_eq)
+    try:
+        average_score = int(sum(scores.values()) / len(scores))
+    except ZeroDivisionError:
+        average_score = 0
+
+    t0_text = time.time()
+    txt_analysis = await get_text_analysis(
+        transcript=transcript,
+        script_details=script_details,
+        scores=scores,
+        matching_keywords=matching_keywords,
+        session_id=session_id,
+        language=language,
+    )
+    timing_logs.append(f"get_text_analysis: {time.time() - t0_text:.2f}s")
+    metrics.observe("text_pipeline_off_topic", time.time() - t0)
+    return kw_eq, txt_analysis, average_score, timing_logs
+
+
+async def process_text_feedback_two_pass(
+    transcript, script_details, session_id, language, timing_logs
 ):
     t0_kw = time.time()
     kw_eq = await get_keyword_equivalents(
@@ -431,10 +828,101 @@ async def process_text_feedback(
     return kw_eq, txt_analysis, average_score, timing_logs
 
 
+async def process_text_feedback_single_pass(
+    transcript, script_details, session_id, language, timing_logs
+):
+    """
+    Keyword equivalents and per-element coaching from one structured call,
+    with the content assessment table rendered locally.
+    """
+    t0 = time.time()
+    challenge = await challenge_registry.compile(script_details, language)
+    include_coaching_recommendations = (
+        prompt_registry.get("include-coaching-recommendations").strip().lower()
+        == "true"
+    )
+    prompt = SINGLE_PASS_TEXT_ANALYSIS_PROMPT.format(
+        language=language,
+        translation_instruction=(
+            ""
+            if challenge.has_all_translations
+            else EXTRACT_KEYWORDS_TRANSLATION_INSTRUCTION.format(language=language)
+        ),
+        coaching_task=(
+            SINGLE_PASS_COACHING_TASK
+            if include_coaching_recommendations
+            else SINGLE_PASS_NO_COACHING_TASK
+        ),
+        coaching_instructions=(
+            COACHING_RECOMMENDATIONS_INSTRUCTIONS
+            if include_coaching_recommendations
+            else ""
+        ),
+    )
+    response = await get_genai_client().aio.models.generate_content(
+        model=settings.ai_model_name,
+        contents=[
+            prompt,
+            f"<transcript>{transcript}</transcript>\n\n {challenge.keyword_lesson_segment}",
+        ],
+        config={
+            "response_mime_type": "application/json",
+            "response_schema": SinglePassTextAnalysis,
+        },
+    )
+    if response is None or response.parsed is None:
+        raise RuntimeError("External API call failed: received None")
+    record_genai_token_usage("single_pass_text_analysis", response)
+    analysis: SinglePassTextAnalysis = response.parsed
+    timing_logs.append(f"single_pass_text_analysis: {time.time() - t0:.2f}s")
+
+    kw_eq = LessonDetailsExtractedKeywords(
+        scripts=[
+            ScriptWithExtractedKeywords(
+                script=element.script,
+                keywords_with_equivalents=element.keywords_with_equivalents,
+            )
+            for element in analysis.scripts
+        ],
+        transcript_matches_lesson=analysis.transcript_matches_lesson,
+    )
+    await store_generated_translations(challenge, kw_eq)
+    if settings.local_keyword_matching_enabled and supports_local_matching(language):
+        # Keywords found locally take precedence, as in the two-pass mode
+        kw_eq = match_keywords_locally(
+            script_details,
+            transcript,
+            challenge.keyword_index,
+            challenge.translated_keywords,
+        ).merge(kw_eq)
+    kw_eq = apply_keyword_translations(kw_eq, challenge.translated_keywords)
+
+    logger.info(f"Keyword equivalents: {kw_eq}")
+    scores, matching_keywords = get_scores_and_matching_keywords(kw_eq)
+    try:
+        average_score = int(sum(scores.values()) / len(scores))
+    except ZeroDivisionError:
+        average_score = 0
+
+    coaching_recommendations = (
+        map_coaching_recommendations(scores, analysis.scripts)
+        if include_coaching_recommendations
+        else None
+    )
+
+    titles = STYLE_CATEGORY_TITLES.get(
+        language, STYLE_CATEGORY_TITLES[SupportedLanguage.ENGLISH.value]
+    )
+    txt_analysis = render_key_element_table(
+        scores, matching_keywords, titles, coaching_recommendations
+    )
+    return kw_eq, txt_analysis, average_score, timing_logs
+
+
 async def judge_feedback(
     *, ai_input: str, ai_feedback: str, session_id: str
 ) -> LessonDetailsExtractedKeywords:
-    response = await client.chat.completions.create(  # pyright: ignore
+    response = await get_openai_client().chat.completions.create(  # pyright: ignore
         model=settings.ai_model_name,
         modalities=["text"],
         messages=[
@@ -455,70 +943,236 @@ async def judge_feedback(
     return judged_feedback
 
 
+def log_trim_stats(audio: PreparedAudio, timing_logs: list[str]):
+    if audio.trim_stats is None:
+        return
+    metrics.increment("vad_trimmed_seconds", audio.trim_stats.seconds_removed)
+    timing_logs.append(
+        f"vad_trim: {audio.trim_stats.seconds_removed:.1f}s removed "
+        f"({audio.trim_stats.original_seconds:.1f}s -> "
+        f"{audio.trim_stats.trimmed_seconds:.1f}s)"
+    )
+
+
 async def run_audio_pipeline(
-    audio: bytes, session_id: str, language: str, timing_logs: list[str]
+    audio: PreparedAudio, session_id: str, language: str, timing_logs: list[str]
 ) -> AudioAnalysis:
     t0_aa = time.time()
-    analysis = await get_audio_analysis(audio, session_id, language)
+    analysis = await get_audio_analysis(
+        audio.encoded,
+        session_id,
+        language,
+        audio.encoded_format,
+        trim_stats=audio.trim_stats,
+    )
     timing_logs.append(f"get_audio_analysis: {time.time() - t0_aa:.2f}s")
     return analysis
 
 
 async def run_audio_pipeline_legacy(
-    audio: bytes, session_id: str, language: str, timing_logs: list[str]
+    audio: PreparedAudio, session_id: str, language: str, timing_logs: list[str]
 ) -> AudioAnalysisLegacy:
     t0_aa = time.time()
-    analysis = await get_audio_analysis_legacy(audio, session_id, language)
+    analysis = await get_audio_analysis_legacy(
+        audio.encoded,
+        session_id,
+        language,
+        audio.encoded_format,
+        trim_stats=audio.trim_stats,
+    )
     timing_logs.append(f"get_audio_analysis_legacy: {time.time() - t0_aa:.2f}s")
     return analysis
 
 
 async def run_video_pipeline(
     video_filename: str, session_id: str, language: str, timing_logs: list[str]
-) -> tuple[Any, AudioAnalysis]:
-    t0_up = time.time()
-    mfile = await upload_and_wait_for_file(video_filename)
-    timing_logs.append(f"upload_and_wait_for_file: {time.time() - t0_up:.2f}s")
+) -> AudioAnalysis:
+    """
+    Analyses the video, sent inline or uploaded to the Files API. An uploaded
+    file is deleted once the analysis is done, failed or was cancelled.
+    """
+    mfile = None
+    video = await get_inline_video(video_filename)
+    if video is None:
+        mfile = await upload_and_wait_for_file(video_filename, timing_logs)
+        video = mfile
+    else:
+        metrics.increment("video_inline_requests")
+        timing_logs.append("gemini_file_upload: inline")
     t0_va = time.time()
-    analysis = await get_video_analysis(mfile, session_id, language)
+    try:
+        analysis = await get_video_analysis(video, session_id, language)
+    except asyncio.CancelledError:
+        metrics.increment("video_pipeline_cancelled_analysis")
+        raise
+    finally:
+        if mfile is not None:
+            asyncio.create_task(delete_gemini_file(mfile.name))
     timing_logs.append(f"get_video_analysis: {time.time() - t0_va:.2f}s")
-    return mfile, analysis
+    return analysis
+
+
+async def transcribe_recording(
+    audio_source: np.ndarray | str,
+    language: str,
+    timing_logs: list[str],
+    decode_profile: str | None = None,
+) -> str:
+    t0_tr = time.time()
+    trscrpt = await get_fast_transcription(audio_source, language, decode_profile)
+    timing_logs.append(f"get_fast_transcription: {time.time() - t0_tr:.2f}s")
+    return trscrpt.text
 
 
 async def run_text_pipeline(
-    audio_source: bytes | str,
+    audio_source: np.ndarray | str,
     script_details: ScriptDetails,
     session_id: str,
     language: str,
     timing_logs: list[str],
+    decode_profile: str | None = None,
 ):
-    t0_tr = time.time()
-    trscrpt = await get_fast_transcription(audio_source, language)
-    timing_logs.append(f"get_fast_transcription: {time.time() - t0_tr:.2f}s")
+    transcript = await transcribe_recording(
+        audio_source, language, timing_logs, decode_profile
+    )
     return await process_text_feedback(
-        trscrpt, script_details, session_id, language, timing_logs
+        transcript, script_details, session_id, language, timing_logs
+    )
+
+
+async def run_pipelines(
+    style_pipeline: Coroutine[Any, Any, Any],
+    text_pipeline: Coroutine[Any, Any, Any],
+    style_name: str,
+    timing_logs: list[str],
+) -> tuple[Any, Any]:
+    """
+    Runs the style pipeline (audio or video analysis) alongside the text
+    pipeline. The style analysis is thrown away when the transcript does not
+    match the lesson, so a mismatch cancels the style task instead of waiting
+    for it; the style result is None when it was cancelled or failed.
+    """
+    t0 = time.time()
+
+    def observe_style_pipeline(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is None:
+            metrics.observe(f"style_pipeline_{style_name}", time.time() - t0)
+
+    style_task = asyncio.create_task(style_pipeline)
+    style_task.add_done_callback(observe_style_pipeline)
+    try:
+        text_res = await text_pipeline
+    except BaseException:
+        if style_task.done():
+            # It has cleaned up after itself; mark a failure as seen
+            if not style_task.cancelled():
+                style_task.exception()
+        else:
+            style_task.cancel()
+        raise
+
+    keyword_equivalents = text_res[0]
+    if keyword_equivalents.transcript_matches_lesson:
+        return await style_task, text_res
+
+    elapsed = time.time() - t0
+    if style_task.done():
+        # Finished (or failed) before the mismatch was known, nothing to save
+        if style_task.cancelled() or style_task.exception() is not None:
+            return None, text_res
+        return style_task.result(), text_res
+
+    style_task.cancel()
+    metrics.increment(f"style_pipeline_{style_name}_cancelled")
+    # Estimated from the mean duration of the style pipelines that completed
+    mean_duration = metrics.mean(f"style_pipeline_{style_name}")
+    if mean_duration is not None:
+        metrics.increment(
+            f"style_pipeline_{style_name}_seconds_saved",
+            max(mean_duration - elapsed, 0.0),
+        )
+    timing_logs.append(f"style_pipeline_cancelled: after {elapsed:.2f}s")
+    return None, text_res
+
+
+async def run_feedback_pipelines(
+    style_pipeline: Callable[[], Coroutine[Any, Any, Any]],
+    audio_source: np.ndarray | str,
+    script_details: ScriptDetails,
+    session_id: str,
+    language: str,
+    timing_logs: list[str],
+    decode_profile: str | None,
+    style_name: str,
+) -> tuple[Any, Any]:
+    """
+    Runs the style and text pipelines of a recording. With the lesson
+    pre-check on, English recordings are transcribed before the style
+    pipeline starts, and one the pre-check finds clearly off topic gets its
+    feedback without the style pipeline (e.g. a video upload) ever starting.
+    """
+    if not (settings.lesson_precheck_enabled and supports_local_matching(language)):
+        return await run_pipelines(
+            style_pipeline(),
+            run_text_pipeline(
+                audio_source,
+                script_details,
+                session_id,
+                language,
+                timing_logs,
+                decode_profile,
+            ),
+            style_name,
+            timing_logs,
+        )
+
+    transcript = await transcribe_recording(
+        audio_source, language, timing_logs, decode_profile
+    )
+    if await is_clearly_off_topic(transcript, script_details, language, timing_logs):
+        metrics.increment(f"style_pipeline_{style_name}_skipped")
+        return None, await process_text_feedback_off_topic(
+            transcript, script_details, session_id, language, timing_logs
+        )
+    return await run_pipelines(
+        style_pipeline(),
+        process_text_feedback(
+            transcript, script_details, session_id, language, timing_logs
+        ),
+        style_name,
+        timing_logs,
     )
 
 
 async def get_feedback(
     *,
-    audio_filename: str,
+    audio: bytes,
     script_details: ScriptDetails,
     user_id: str | None,
     tags: list[str] | None,
     language: str = SupportedLanguage.ENGLISH.value,
+    decode_profile: str | None = None,
 ) -> dict[str, Any]:
     start_time = time.time()
     timing_logs = []
     session_id = generate_session_id()
     logger.info(f"Lesson details: {script_details}")
 
-    audio = read_audio(audio_filename)
+    t0_prep = time.time()
+    prepared_audio = await prepare_audio(audio)
+    timing_logs.append(f"prepare_audio: {time.time() - t0_prep:.2f}s")
+    log_trim_stats(prepared_audio, timing_logs)
 
     t0_gather = time.time()
-    audio_analysis, text_res = await asyncio.gather(
-        run_audio_pipeline(audio, session_id, language, timing_logs),
-        run_text_pipeline(audio, script_details, session_id, language, timing_logs),
+    audio_analysis, text_res = await run_feedback_pipelines(
+        lambda: run_audio_pipeline(prepared_audio, session_id, language, timing_logs),
+        prepared_audio.samples,
+        script_details,
+        session_id,
+        language,
+        timing_logs,
+        decode_profile,
+        "audio",
     )
     timing_logs.append(
         f"full_parallel_pipelines_gather: {time.time() - t0_gather:.2f}s"
@@ -592,23 +1246,35 @@ async def get_feedback(
 
 async def get_feedback_legacy(
     *,
-    audio_filename: str,
+    audio: bytes,
     script_details: ScriptDetails,
     user_id: str | None,
     tags: list[str] | None,
     language: str = SupportedLanguage.ENGLISH.value,
+    decode_profile: str | None = None,
 ) -> dict[str, Any]:
     start_time = time.time()
     timing_logs = []
     session_id = generate_session_id()
     logger.info(f"Lesson details: {script_details}")
 
-    audio = read_audio(audio_filename)
+    t0_prep = time.time()
+    prepared_audio = await prepare_audio(audio)
+    timing_logs.append(f"prepare_audio: {time.time() - t0_prep:.2f}s")
+    log_trim_stats(prepared_audio, timing_logs)
 
     t0_gather = time.time()
-    audio_analysis, text_res = await asyncio.gather(
-        run_audio_pipeline_legacy(audio, session_id, language, timing_logs),
-        run_text_pipeline(audio, script_details, session_id, language, timing_logs),
+    audio_analysis, text_res = await run_feedback_pipelines(
+        lambda: run_audio_pipeline_legacy(
+            prepared_audio, session_id, language, timing_logs
+        ),
+        prepared_audio.samples,
+        script_details,
+        session_id,
+        language,
+        timing_logs,
+        decode_profile,
+        "audio_legacy",
     )
     timing_logs.append(
         f"full_parallel_pipelines_gather: {time.time() - t0_gather:.2f}s"
@@ -688,6 +1354,7 @@ async def get_feedback_from_video(
     user_id: str | None,
     tags: list[str] | None,
     language: str = SupportedLanguage.ENGLISH.value,
+    decode_profile: str | None = None,
 ) -> dict[str, Any]:
     """
     Generate feedback from video using Gemini's multimodal capabilities.
@@ -700,21 +1367,22 @@ async def get_feedback_from_video(
     logger.info(f"Processing video file: {video_filename}")
 
     t0_gather = time.time()
-    video_res, text_res = await asyncio.gather(
-        run_video_pipeline(video_filename, session_id, language, timing_logs),
-        run_text_pipeline(
-            video_filename, script_details, session_id, language, timing_logs
-        ),
+    video_analysis, text_res = await run_feedback_pipelines(
+        lambda: run_video_pipeline(video_filename, session_id, language, timing_logs),
+        video_filename,
+        script_details,
+        session_id,
+        language,
+        timing_logs,
+        decode_profile,
+        "video",
     )
     timing_logs.append(
         f"full_parallel_pipelines_gather: {time.time() - t0_gather:.2f}s"
     )
 
-    myfile, video_analysis = video_res
     keyword_equivalents, text_analysis, average_score, timing_logs = text_res
 
-    asyncio.create_task(delete_gemini_file(myfile.name))
-
     titles = STYLE_CATEGORY_TITLES.get(
         language, STYLE_CATEGORY_TITLES[SupportedLanguage.ENGLISH.value]
     )
@@ -0,0 +1,166 @@
+import asyncio
+import io
+import time
+from dataclasses import dataclass, field
+
+import av
+import numpy as np
+from faster_whisper.audio import decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+from loguru import logger
+
+from ai_feedback.config import settings
+
+WHISPER_SAMPLE_RATE = 16000
+# Silence kept around detected speech so word onsets and endings survive trimming
+VAD_SPEECH_PAD_MS = 300
+
+
+@dataclass
+class CompressedPause:
+    at_seconds: float  # position in the original recording
+    original_seconds: float
+
+
+@dataclass
+class TrimStats:
+    """What the VAD stage removed, in terms of the original recording."""
+
+    original_seconds: float
+    trimmed_seconds: float
+    leading_silence_seconds: float = 0.0
+    trailing_silence_seconds: float = 0.0
+    max_pause_seconds: float = 0.0
+    compressed_pauses: list[CompressedPause] = field(default_factory=list)
+
+    @property
+    def seconds_removed(self) -> float:
+        return self.original_seconds - self.trimmed_seconds
+
+    def describe(self) -> str:
+        """Note for the audio analysis so pacing is judged on the original recording."""
+        parts = [
+            f"The recording was shortened from {self.original_seconds:.1f}s to "
+            f"{self.trimmed_seconds:.1f}s before analysis: "
+            f"{self.leading_silence_seconds:.1f}s of leading and "
+            f"{self.trailing_silence_seconds:.1f}s of trailing silence were removed"
+        ]
+        if self.compressed_pauses:
+            pauses = ", ".join(
+                f"{pause.original_seconds:.1f}s at {pause.at_seconds:.1f}s"
+                for pause in self.compressed_pauses
+            )
+            parts.append(
+                f"these pauses were shortened to {self.max_pause_seconds:.1f}s "
+                f"(original length at original position): {pauses}"
+            )
+        return (
+            "; ".join(parts)
+            + ". Judge rhythm and timing on the original pause lengths."
+        )
+
+
+@dataclass
+class PreparedAudio:
+    """
+    A recording decoded once into the representations the pipelines need:
+    `samples` is what Whisper consumes, `encoded` is what the LLM receives.
+    Both are trimmed when VAD trimming is enabled, see `trim_stats`.
+    """
+
+    samples: np.ndarray  # 16 kHz mono float32
+    encoded: bytes
+    encoded_format: str
+    trim_stats: TrimStats | None = None
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.samples) / WHISPER_SAMPLE_RATE
+
+
+def encode_samples_to_mp3(samples: np.ndarray, bit_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with av.open(buffer, "w", format="mp3") as container:
+        stream = container.add_stream(
+            "libmp3lame", rate=WHISPER_SAMPLE_RATE, layout="mono"
+        )
+        stream.bit_rate = bit_rate  # pyright: ignore
+        frame = av.AudioFrame.from_ndarray(
+            samples.reshape(1, -1), format="flt", layout="mono"
+        )
+        frame.sample_rate = WHISPER_SAMPLE_RATE
+        for packet in stream.encode(frame):  # pyright: ignore
+            container.mux(packet)
+        for packet in stream.encode(None):  # pyright: ignore
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+def trim_silence(
+    samples: np.ndarray, max_pause_seconds: float
+) -> tuple[np.ndarray, TrimStats]:
+    """
+    Drops leading and trailing silence and shortens internal pauses longer
+    than `max_pause_seconds`. Recordings without detected speech are kept
+    as they are.
+    """
+    original_seconds = len(samples) / WHISPER_SAMPLE_RATE
+    speech = get_speech_timestamps(samples, VadOptions(speech_pad_ms=VAD_SPEECH_PAD_MS))
+    if not speech:
+        return samples, TrimStats(
+            original_seconds=original_seconds, trimmed_seconds=original_seconds
+        )
+
+    max_pause = int(max_pause_seconds * WHISPER_SAMPLE_RATE)
+    pieces = []
+    compressed_pauses = []
+    for previous, current in zip([None, *speech], speech):
+        if previous is not None:
+            gap_start, gap_end = previous["end"], current["start"]
+            if gap_end - gap_start > max_pause:
+                # Keep the edges of the pause, where breaths and trailing sounds are
+                pieces.append(samples[gap_start : gap_start + max_pause // 2])
+                pieces.append(samples[gap_end - (max_pause - max_pause // 2) : gap_end])
+                compressed_pauses.append(
+                    CompressedPause(
+                        at_seconds=gap_start / WHISPER_SAMPLE_RATE,
+                        original_seconds=(gap_end - gap_start) / WHISPER_SAMPLE_RATE,
+                    )
+                )
+            else:
+                pieces.append(samples[gap_start:gap_end])
+        pieces.append(samples[current["start"] : current["end"]])
+
+    trimmed = np.concatenate(pieces)
+    return trimmed, TrimStats(
+        original_seconds=original_seconds,
+        trimmed_seconds=len(trimmed) / WHISPER_SAMPLE_RATE,
+        leading_silence_seconds=speech[0]["start"] / WHISPER_SAMPLE_RATE,
+        trailing_silence_seconds=(len(samples) - speech[-1]["end"])
+        / WHISPER_SAMPLE_RATE,
+        max_pause_seconds=max_pause_seconds,
+        compressed_pauses=compressed_pauses,
+    )
+
+
+def prepare_audio_sync(audio: bytes) -> PreparedAudio:
+    t0 = time.time()
+    samples = decode_audio(io.BytesIO(audio), sampling_rate=WHISPER_SAMPLE_RATE)
+    trim_stats = None
+    if settings.vad_trim_enabled:
+        samples, trim_stats = trim_silence(samples, settings.vad_max_pause_seconds)
+    encoded = encode_samples_to_mp3(samples, settings.llm_audio_bit_rate)
+    logger.info(
+        f"Prepared {len(samples) / WHISPER_SAMPLE_RATE:.1f}s of audio in "
+        f"{time.time() - t0:.2f}s ({len(audio)} -> {len(encoded)} bytes for the LLM)"
+    )
+    return PreparedAudio(
+        samples=samples,
+        encoded=encoded,
+        encoded_format="mp3",
+        trim_stats=trim_stats,
+    )
+
+
+async def prepare_audio(audio: bytes) -> PreparedAudio:
+    return await asyncio.to_thread(prepare_audio_sync, audio)
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from loguru import logger
+
+from ai_feedback.metrics import metrics
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Stable content hash of JSON-serialisable key parts."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    JSON-file cache in a directory, one file per key. Entries older than
+    the TTL are ignored, and the least recently written files are evicted
+    once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float, max_bytes: int):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def set(self, key: str, value: Any):
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total_bytes = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_bytes += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+            except FileNotFoundError:
+                pass
+
+
+class SQLiteCache:
+    """
+    JSON values in a single SQLite table, safe to share between processes
+    (e.g. the API and evaluation runs). Rows beyond `max_entries` are evicted
+    least recently used first.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_used_at "
+                "ON entries (last_used_at)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> Any | None:
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT value FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                with connection:
+                    connection.execute(
+                        "UPDATE entries SET last_used_at = ? WHERE key = ?",
+                        (time.time(), key),
+                    )
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry in {self.path}: {e}")
+            return None
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, last_used_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), time.time()),
+                )
+                connection.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM entries ORDER BY last_used_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+
+class TieredCache:
+    """
+    In-process LRU in front of an optional disk tier. Values must be
+    JSON-serialisable when a disk tier is configured. Hits and misses are
+    counted as `<name>_cache_hits` / `<name>_cache_misses`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        memory: LRUCache,
+        disk: DiskCache | SQLiteCache | None = None,
+    ):
+        self.name = name
+        self.memory = memory
+        self.disk = disk
+
+    async def get(self, key: str) -> Any | None:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not None:
+                self.memory.set(key, value)
+
+        metrics.increment(
+            f"{self.name}_cache_hits"
+            if value is not None
+            else f"{self.name}_cache_misses"
+        )
+        return value
+
+    async def set(self, key: str, value: Any):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, key, value)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Failed to write {self.name} cache entry: {e}")
@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+
+from loguru import logger
+
+from ai_feedback.cache import LRUCache, SQLiteCache, TieredCache, make_cache_key
+from ai_feedback.config import settings
+from ai_feedback.constants.prompts import (
+    EXTRACT_KEYWORDS_PROMPT,
+    EXTRACT_KEYWORDS_TRANSLATION_INSTRUCTION,
+)
+from ai_feedback.keyword_matching import KeywordIndex, content_words, ngrams
+from ai_feedback.keyword_translations import keyword_translations, normalize_language
+from ai_feedback.metrics import metrics
+from ai_feedback.models import ScriptDetails
+
+CHALLENGE_HASH_LENGTH = 16
+LESSON_NGRAM_SIZE = 2
+
+
+class UnknownChallengeError(Exception):
+    pass
+
+
+def get_challenge_hash(script_details: ScriptDetails) -> str:
+    """Content hash of a lesson, independent of the challenge id."""
+    return make_cache_key(script_details.model_dump(mode="json"))[
+        :CHALLENGE_HASH_LENGTH
+    ]
+
+
+@dataclass(frozen=True)
+class CompiledChallenge:
+    """Everything derived from a lesson that does not depend on the recording."""
+
+    challenge_hash: str
+    language: str
+    script_details: ScriptDetails
+    # The lesson as the prompts embed it
+    lesson_text: str
+    keywords: tuple[str, ...]
+    keyword_index: KeywordIndex
+    translated_keywords: dict[str, str]
+    # Word bigrams of the key element scripts and the question
+    lesson_ngrams: frozenset[tuple[str, ...]]
+    # Content words of the whole lesson, briefing included
+    lesson_vocabulary: frozenset[str]
+    keyword_prompt: str
+    keyword_lesson_segment: str
+    text_analysis_lesson_segment: str
+
+    @property
+    def has_all_translations(self) -> bool:
+        return all(keyword in self.translated_keywords for keyword in self.keywords)
+
+
+def compile_challenge(
+    script_details: ScriptDetails,
+    language: str,
+    challenge_hash: str,
+    translated_keywords: dict[str, str],
+    keyword_index: KeywordIndex | None = None,
+) -> CompiledChallenge:
+    keywords = tuple(
+        keyword
+        for key_element in script_details.keyElements
+        for keyword in key_element.keywords
+    )
+    lesson_text = str(script_details)
+    script_text = " ".join(
+        [script_details.question]
+        + [key_element.script for key_element in script_details.keyElements]
+    )
+    has_all_translations = all(keyword in translated_keywords for keyword in keywords)
+    return CompiledChallenge(
+        challenge_hash=challenge_hash,
+        language=language,
+        script_details=script_details,
+        lesson_text=lesson_text,
+        keywords=keywords,
+        keyword_index=keyword_index or KeywordIndex(keywords),
+        translated_keywords=translated_keywords,
+        lesson_ngrams=frozenset(ngrams(script_text, LESSON_NGRAM_SIZE)),
+        lesson_vocabulary=frozenset(
+            content_words(f"{script_text} {script_details.briefing}")
+        ),
+        # With known translations the LLM only has to match keywords
+        keyword_prompt=EXTRACT_KEYWORDS_PROMPT.format(
+            language=language,
+            translation_instruction=(
+                ""
+                if has_all_translations
+                else EXTRACT_KEYWORDS_TRANSLATION_INSTRUCTION.format(language=language)
+            ),
+        ),
+        keyword_lesson_segment=f"<lesson_details>{lesson_text}</lesson_details>",
+        text_analysis_lesson_segment=f"<script_details>{lesson_text}</script_details>",
+    )
+
+
+class ChallengeRegistry:
+    """
+    Lessons by challenge id and content hash, so clients can send a
+    reference instead of the full lesson, plus the compiled artifacts per
+    lesson and language. Lessons are registered on first sight or through
+    the admin endpoint and persisted when a path is configured; compiled
+    artifacts are rebuilt on demand.
+    """
+
+    def __init__(self, lessons: TieredCache, max_compiled: int):
+        self._lessons = lessons
+        self._compiled = LRUCache(max_entries=max_compiled, ttl_seconds=float("inf"))
+
+    @staticmethod
+    def _lesson_key(challenge_id: int | str, challenge_hash: str) -> str:
+        return f"{challenge_id}:{challenge_hash}"
+
+    async def register(
+        self, challenge_id: int | str, script_details: ScriptDetails
+    ) -> str:
+        challenge_hash = get_challenge_hash(script_details)
+        key = self._lesson_key(challenge_id, challenge_hash)
+        if self._lessons.memory.get(key) is None:
+            await self._lessons.set(key, script_details.model_dump(mode="json"))
+            metrics.increment("challenges_registered")
+            logger.info(f"Registered challenge {challenge_id} ({challenge_hash})")
+        return challenge_hash
+
+    async def resolve(
+        self, challenge_id: int | str, challenge_hash: str
+    ) -> ScriptDetails:
+        lesson = await self._lessons.get(self._lesson_key(challenge_id, challenge_hash))
+        if lesson is None:
+            raise UnknownChallengeError(
+                f"Unknown challenge {challenge_id} with hash {challenge_hash}; "
+                "send the full lesson details"
+            )
+        return ScriptDetails.model_validate(lesson)
+
+    async def compile(
+        self, script_details: ScriptDetails, language: str
+    ) -> CompiledChallenge:
+        language = normalize_language(language)
+        challenge_hash = get_challenge_hash(script_details)
+        key = f"{challenge_hash}:{language}"
+        compiled = self._compiled.get(key)
+        if compiled is not None and compiled.has_all_translations:
+            return compiled
+
+        # Translations may have been added since the last compilation
+        translated_keywords = await keyword_translations.lookup(
+            [
+                keyword
+                for key_element in script_details.keyElements
+                for keyword in key_element.keywords
+            ],
+            language,
+        )
+        if compiled is None or len(translated_keywords) > len(
+            compiled.translated_keywords
+        ):
+            compiled = compile_challenge(
+                script_details,
+                language,
+                challenge_hash,
+                translated_keywords,
+                compiled.keyword_index if compiled is not None else None,
+            )
+            self._compiled.set(key, compiled)
+            metrics.increment("challenge_compilations")
+        return compiled
+
+
+challenge_registry = ChallengeRegistry(
+    TieredCache(
+        "challenge",
+        memory=LRUCache(
+            max_entries=settings.challenge_registry_max_entries,
+            ttl_seconds=float("inf"),
+        ),
+        disk=(
+            SQLiteCache(
+                settings.challenge_registry_path,
+                max_entries=settings.challenge_registry_max_entries,
+            )
+            if settings.challenge_registry_path
+            else None
+        ),
+    ),
+    max_compiled=settings.challenge_registry_max_entries,
+)
@@ -1,24 +1,113 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
+# Credentials default to empty so the package can be imported without them
+# (tests, scripts); the app refuses to start while any of these is unset
+REQUIRED_SECRETS = (
+    "ai_api_key",
+    "langfuse_secret_key",
+    "langfuse_public_key",
+    "langfuse_host",
+    "login_username",
+    "login_password",
+    "jwt_secret_key",
+)
+
 
 class Settings(BaseSettings):
-    ai_api_key: str
+    ai_api_key: str = ""
     ai_base_url: str = "https://generativelanguage.googleapis.com/v1beta/openai/"
     # ai_model_name: str = "gemini-2.5-flash-lite"
     ai_model_name: str = "gemini-3.1-flash-lite-preview"
 
-    langfuse_secret_key: str
-    langfuse_public_key: str
-    langfuse_host: str
+    langfuse_secret_key: str = ""
+    langfuse_public_key: str = ""
+    langfuse_host: str = ""
 
-    login_username: str
-    login_password: str
-    jwt_secret_key: str
+    login_username: str = ""
+    login_password: str = ""
+    jwt_secret_key: str = ""
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    upload_scratch_dir: str = "/tmp"
+    upload_chunk_size_bytes: int = 1024 * 1024
+    max_upload_size_bytes: int = 500 * 1024 * 1024
+
+    # Defaults to the number of CPU cores when unset
+    ffmpeg_max_workers: int | None = None
+    ffmpeg_timeout_seconds: float = 120
+    audio_extraction_mode: Literal["pipe", "disk"] = "pipe"
+    llm_audio_bit_rate: int = 32000
+    vad_trim_enabled: bool = False
+    vad_max_pause_seconds: float = 2.0
+    # Videos up to this size are sent inline with the analysis request instead
+    # of through the Files API; Gemini caps inline requests at 20 MB after
+    # base64 encoding
+    video_inline_max_bytes: int = 10 * 1024 * 1024
+
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 256
+    response_cache_ttl_seconds: float = 24 * 60 * 60
+    # Set to enable the on-disk tier of the response cache
+    response_cache_dir: str | None = None
+    response_cache_max_disk_bytes: int = 512 * 1024 * 1024
+
+    transcript_cache_enabled: bool = True
+    transcript_cache_path: str = "/tmp/ai_feedback/transcripts.sqlite3"
+    transcript_cache_max_entries: int = 10000
+
+    keyword_cache_enabled: bool = True
+    keyword_cache_max_entries: int = 1024
+    keyword_cache_ttl_seconds: float = 24 * 60 * 60
+    local_keyword_matching_enabled: bool = True
+    # Skip the LLM, and with it the check that the transcript is a coherent
+    # answer to the lesson, when every keyword was found locally
+    local_keyword_matching_skip_llm: bool = False
+    text_pipeline_mode: Literal["two_pass", "single_pass"] = "two_pass"
+    lesson_precheck_enabled: bool = True
+    # Transcripts scoring below this are treated as not matching the lesson
+    # without asking the LLM. Lesson scripts read in full or in part score
+    # 0.86 and up, clearly unrelated speech 0.2 at most (tests/
+    # test_lesson_match.py); scripts/calibrate_lesson_precheck.py checks it
+    # on Whisper transcripts of the labelled recordings
+    lesson_precheck_off_topic_threshold: float = 0.25
+    keyword_translation_cache_path: str | None = (
+        "/tmp/ai_feedback/keyword_translations.sqlite3"
+    )
+    keyword_translation_cache_max_entries: int = 100000
+
+    challenge_registry_path: str | None = "/tmp/ai_feedback/challenges.sqlite3"
+    challenge_registry_max_entries: int = 1024
+
+    prompt_refresh_seconds: float = 60
+
+    whisper_model_size: str = "base"
+    whisper_compute_type: str = "int8"
+    whisper_decode_profile: str = "accurate"
+    # Per-language overrides of the three settings above, e.g.
+    # {"english": {"model_size": "base.en"}, "malay": {"model_size": "small"}}
+    whisper_language_models: dict[str, dict[str, str]] = {}
+    whisper_memory_ceiling_mb: int = 2048
+    whisper_executor: Literal["thread", "process"] = "thread"
+    whisper_replicas: int = 1
+    # CTranslate2 threads per replica; defaults to CPU cores / replicas
+    whisper_cpu_threads: int | None = None
+    whisper_max_queue: int = 8
+    # Recordings longer than this are split into `whisper_chunk_count` chunks
+    # and transcribed in parallel; None disables chunking
+    whisper_chunking_threshold_seconds: float | None = 120
+    whisper_chunk_count: int = 4
+    whisper_batching_enabled: bool = False
+    whisper_batch_window_ms: float = 50
+    whisper_max_batch_size: int = 8
+
     class Config:
         env_file = ".env"
 
+    def missing_secrets(self) -> list[str]:
+        return [name for name in REQUIRED_SECRETS if not getattr(self, name)]
+
 
-settings = Settings()  # pyright: ignore
+settings = Settings()
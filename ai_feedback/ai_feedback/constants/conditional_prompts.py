@@ -1,16 +1,6 @@
-COACHING_RECOMMENDATIONS_PROMPTS = {
-    True: {
-        "coaching_column_mention": "- Coaching Recommendations",
-        "table_example": """
-| **Key Elements**                                     | **Recording matches** |   **Score** | **Coaching Recommendations** |
-|-----------------------------------------------------|--------------|-----------|-------------------|
-| - **understand**, the prospect, needs              | ⚠️ Partially       | 33% | Only the concept of understanding is mentioned, but there is no mention of needs or of the prospect | 
-| - confidently, **differentiate**, **Bank A**, **Bank B**  | ⚠️ Partially | 75% | There is an error in the sentence: “confidentially differentiate Bank A from Bank B & emphasizing...”. The word “confidentially” should be “confidently.” Also, the structure of the sentence is unclear. |
-| - **showcase**, **Bank B**, **premium customer experience** | ✅ Yes       | 100% | Mention of relationship management and 24/7 support is present. However, wording is awkward: “showcase premium experience including relationship management and 24-7.” It should be “showcase Bank A’s premium customer experience, including relationship managers and 24/7 support.” |
-| - **guide the prospect**, **toward**, **making an informed decison**    | ✅ Yes       | 100% | The final section about onboarding and making a decision is included, but the sentence is awkward: “making an informed decision to open a brand new account with Bank A.” A smoother transition would improve clarity. |
----
-""",
-        "coaching_column_instructions": """
+# Instructions for the per-key-element coaching recommendations, which are
+# shown in the last column of the content assessment table
+COACHING_RECOMMENDATIONS_INSTRUCTIONS = """
 - NEVER mention brand names or commercial entities other than the ones provided as part of this conversation
 - Each recommendation you make should be SPECIFIC and ACTIONABLE. Don't make any generic recommendations
 - Do not refer to the audio or the student, just to the quality and assesment of the recording.
@@ -19,7 +9,7 @@ a specific example like "X proves useful when you are at the gas station and you
 - Regarding word choice, use clear and professional terms, try to avoid artistic or overly
 abstract words (e.g. instead of "palpable" use terms like "clear", "noticeable", "real" or "strong")
 - In your answer, whenever you are quoting from the audio, use italics
-- In the "Coaching Recommendations" column:
+- In each coaching recommendation:
     - Analyze how closely the spoken content in the audio aligns with the script, 
     specifically assessing whether it covers the key elements effectively and the
     language used is completely correct
@@ -30,19 +20,4 @@ abstract words (e.g. instead of "palpable" use terms like "clear", "noticeable",
     - Make sure to pay special attention, mention and emphasize mispronounced words
     - In your answer, whenever you are referring to the keywords, bold them
     - Don't only mention the missing keywords, EXPLAIN for each of them why that specific wording is essential,
-    based on the information from the briefing and the best industry practices""",
-    },
-    False: {
-        "coaching_column_mention": "",
-        "table_example": """
-| **Key Elements**                                    | **Recording matches** |   **Score** |
-|-----------------------------------------------------|-----------------------|-------------|
-| Understand the prospect's needs and tailor the conversation accordingly.        | ⚠️ Partially       | 33% |
-| Confidently differentiate Bank B from Bank A, emphasizing global banking digital services, and customer benefits. | 75% |
-| Showcase Bank B's premium customer experience, including relationship managers and 24/7 support. | ✅ Yes       | 100% |
-| Guide the prospect toward making an informed decision to open an Bank B account.  | ✅ Yes       | 100% |
----
-""",
-        "coaching_column_instructions": "- Only output the table and nothing else",
-    },
-}
+    based on the information from the briefing and the best industry practices"""
@@ -208,10 +208,10 @@ The student's answer should be concise, clear, confident, direct and use the app
 
 IMPORTANT LANGUAGE INSTRUCTION:
 - Provide all feedback and analysis in {language}
-- ALL text, including table headers, column names, options (like Yes/Partially/No), and content MUST be translated to {language}.
-- EXCEPTION: Keep the texts in the `{key_elements_col}` column EXACTLY as they appear in the `lesson_details` JSON (do NOT translate them). This is required for post-processing.
+- EXCEPTION: Return each `script` EXACTLY as it appears in the `lesson_details` JSON (do NOT translate it).
 
-I have provided some lesson details a transcript and key elements scores.
+I have provided some lesson details, a transcript, key elements scores and the keywords of each key element,
+where the keywords mentioned in the transcript are in bold.
 
 The lesson details json contains the following fields:
 - "question" - The question that should be answered in the audio answer
@@ -224,64 +224,10 @@ Each "keyElement" has:
 - a list of "keywords", which need to be mentioned exactly or as close synonyms as part of the audio answer, when talking
 about this specific keyElement
 
-In a section called "{assessment_heading}", create a markdown table with the following columns:
-- {key_elements_col}
-- {recording_matches_col} (with options {yes}/{partially}/{no})
-- {score_col}
-{coaching_column_mention}
-
-
-<example_input>
-<transcript>
-<<The transcript section should contain the transcript of the student's audio recording.>>
-</transcript>
-
-<lesson_details>
-{{
-    "briefing": "A prospect, Chris, has recently moved from Glasgow to London and is looking for a new 
-bank. He has just met with Bank A and liked their offerings but wants to see if Bank B
-would be a better option. The Bank B banker, Emma, must effectively highlight Bank B's 
-unique benefits and differentiators while ensuring a smooth and personalized experience",
-    "keyElements": {{
-        "script": "Understand the prospect's needs and tailor the conversation accordingly.",
-        "keywords": ["understand", "the prospect", "needs"]
-
-        "script": "Confidently differentiate Bank B from Bank A, emphasizing global banking digital services, and customer benefits."
-        "keywords": ["confidently", "differentiate", "Bank A", "Bank B"]
-
-        "script": "Showcase Bank B's premium customer experience, including relationship managers and 24/7 support."
-        "keywords": ["showcase", "Bank B", "premium customer experience"]
-
-        "script": "Guide the prospect toward making an informed decision to open an Bank B account."
-        "keywords": ["guide the prospect", "toward", "making an informed decison"]
-    }}
-}}
-</lesson_details>
-
-<key_elements_scores>
-{{
-  "Understand the prospect's needs and tailor the conversation accordingly.": 100,
-  "Confidently differentiate Bank B from Bank A, emphasizing global banking digital services, and customer benefits.": 75,
-  "Showcase Bank B's premium customer experience, including relationship managers and 24/7 support.": 100,
-  "Guide the prospect toward making an informed decision to open an Bank B account.": 100,
-}}
-</key_elements_scores>
-</example_input>
-
-<example_output>
-## {assessment_heading}
-{table_example}
-</example_output>
-
-Important notes:
-- You answer needs to be in markdown format
-- For each key element, the score should be taken from the key elements scores input and should be formatted as a percentage.
-- Make sure the table is properly formatted and doesn't have any missing or extra columns or rows.
-- In the "{recording_matches_col}" column of the table MUST use these exact options:
-    - The "{yes}" option should be preceded by ✅ ; this option is selected if the score is exactly 100
-    - The "{partially}" option should be preceded by ⚠️ ; this option is selected if the score is between 1 and 99 (both inclusive)
-    - The "{no}" option should be preceded by ❌ ; this options is selected if the score is exactly 0
-{coaching_column_instructions}
+For each key element, in the order of the lesson details, write a coaching recommendation.
+The recommendations are shown next to the key element, its keywords and its score
+in a content assessment table, so do not repeat the score or format a table yourself.
+{coaching_instructions}
 """
 
 
@@ -298,8 +244,7 @@ coherent sentences that fit the realistic scenario, you MUST set `transcript_mat
 IMPORTANT LANGUAGE INSTRUCTION:
 - The transcript may be in any language
 - The target language for feedback is {language}
-- You MUST translate each lesson details keyword into {language} and supply it in the `translated_keyword` field.
-- Find semantic equivalents even if the transcript is in a different language than the keywords
+{translation_instruction}- Find semantic equivalents even if the transcript is in a different language than the keywords
 - For example, if keyword is "understand" in English and transcript says "comprender" in Spanish, that's a match
 - CRITICAL RULE FOR NUMBERS: If a keyword contains a specific number, time, or quantitative amount (e.g. "20 Minutes", "50 dollars", "$100"),
 you MUST NOT accept a different number as a synonym. "35 Minutes" is NOT a semantic equivalent to "20 Minutes". Only accept the exact or mathematically equivalent amount.
@@ -330,6 +275,77 @@ e.g.: "Do you have (Amount of Time) to talk?" should match with "Could we discus
     - is just a recitation of the requested keywords without coherent context and sentence structure
 """
 
+# Only needed when the keyword translations are not known yet
+EXTRACT_KEYWORDS_TRANSLATION_INSTRUCTION = """- You MUST translate each lesson details keyword into {language} and supply it in the `translated_keyword` field.
+"""
+
+
+TRANSLATE_KEYWORDS_PROMPT = """
+You are a professional translator for customer service training material.
+Translate each of the keywords below into {language}.
+The keywords come from scripts that bank employees say to their clients, so translate them
+as they would naturally be said in that context, keeping placeholders such as "(Member Name)"
+as placeholders and keeping numbers, times and amounts unchanged.
+Return every keyword exactly as given in `keyword`, with its translation in `translated_keyword`.
+"""
+
+
+SINGLE_PASS_TEXT_ANALYSIS_PROMPT = """
+You are a communication and client interaction expert with over 20 years of experience.
+You have an excellent command of multiple languages and are extremely good at identifying semantic equivalents.
+You are coaching a student who will either present some information to a client,
+answer questions or handle complaints.
+In this situation, what the student says is as important as how he says it and why.
+The student's answer should be concise, clear, confident, direct and use the appropriate terms.
+
+I have provided some lesson details and a transcript.
+
+The lesson details json contains the following fields:
+- "question" - The question that should be answered in the audio answer
+- "briefing" - The description of the educational module the student is taking part in.
+It outlines what the scenario will be about, core concepts, and what skills the student
+should have developed the end.
+- "keyElements" - a list of important aspects that have to be covered in the audio answer
+Each "keyElement" has:
+- a "script", which is a sentence whose meaning has to be part of the audio answer, in one way or another
+- a list of "keywords", which need to be mentioned exactly or as close synonyms as part of the audio answer, when talking
+about this specific keyElement
+
+For each key element, in the order of the lesson details, return its script exactly as given and:
+1. For each keyword, the equivalent words or phrases used in the transcript.
+There might be no equivalent in the transcript for some keywords.
+2. {coaching_task}
+
+Additionally, you will also have to decide if the transcript follows the lesson details or not.
+CRUCIAL COHERENCE CHECK: You must evaluate if what the user is saying pertains to the context of the challenge,
+makes sense, and has coherence. If the speaker is merely reading a list of keywords or key elements without forming natural,
+coherent sentences that fit the realistic scenario, you MUST set `transcript_matches_lesson` to `false`.
+
+IMPORTANT LANGUAGE INSTRUCTION:
+- The transcript may be in any language
+- The target language for feedback is {language}; write all coaching recommendations in {language}
+{translation_instruction}- Find semantic equivalents even if the transcript is in a different language than the keywords
+- For example, if keyword is "understand" in English and transcript says "comprender" in Spanish, that's a match
+- CRITICAL RULE FOR NUMBERS: If a keyword contains a specific number, time, or quantitative amount (e.g. "20 Minutes", "50 dollars", "$100"),
+you MUST NOT accept a different number as a synonym. "35 Minutes" is NOT a semantic equivalent to "20 Minutes". Only accept the exact or mathematically equivalent amount.
+
+Important notes:
+- Key elements might contain placeholders, for example "(Member Name)", "(Amount of Time)" and others;
+make sure to match them in your extraction to the appropriate values in the transcription
+e.g.: "Do you have (Amount of Time) to talk?" should match with "Could we discuss for 3 minutes?"
+- examples of ways in which the transcript can differ from the lesson details:
+    - is empty or almost empty
+    - is about a completely different subject
+    - doesn't even try to cover the lesson at all
+    - starts on the right track, but then diverges to other subjects not present in the lesson
+    - is just a recitation of the requested keywords without coherent context and sentence structure
+{coaching_instructions}
+"""
+
+SINGLE_PASS_COACHING_TASK = """A `coaching_recommendation`, shown next to the key element, its keywords and its score in a content assessment table."""
+
+SINGLE_PASS_NO_COACHING_TASK = """Leave `coaching_recommendation` empty."""
+
 
 JUDGE_FEEDBACK_PROMPT = """
 You are evaluating an AI-generated feedback given to a user's spoken response.
@@ -12,6 +12,7 @@ STYLE_CATEGORY_TITLES = {
         "key_elements_col": "Key Elements",
         "recording_matches_col": "Recording Matches",
         "score_col": "Score",
+        "coaching_col": "Coaching Recommendations",
         "yes": "Yes",
         "partially": "Partially",
         "no": "No",
@@ -28,6 +29,7 @@ STYLE_CATEGORY_TITLES = {
         "key_elements_col": "Schlüsselelemente",
         "recording_matches_col": "Aufnahme stimmt überein",
         "score_col": "Ergebnis",
+        "coaching_col": "Coaching-Empfehlungen",
         "yes": "Ja",
         "partially": "Teilweise",
         "no": "Nein",
@@ -44,6 +46,7 @@ STYLE_CATEGORY_TITLES = {
         "key_elements_col": "Kernelementen",
         "recording_matches_col": "Opname komt overeen",
         "score_col": "Score",
+        "coaching_col": "Coaching Aanbevelingen",
         "yes": "Ja",
         "partially": "Gedeeltelijk",
         "no": "Nee",
@@ -60,6 +63,7 @@ STYLE_CATEGORY_TITLES = {
         "key_elements_col": "Éléments Clés",
         "recording_matches_col": "Correspondance de l'enregistrement",
         "score_col": "Score",
+        "coaching_col": "Recommandations de Coaching",
         "yes": "Oui",
         "partially": "Partiellement",
         "no": "Non",
@@ -76,6 +80,7 @@ STYLE_CATEGORY_TITLES = {
         "key_elements_col": "Elemen Utama",
         "recording_matches_col": "Rakaman SePadan",
         "score_col": "Markah",
+        "coaching_col": "Cadangan Bimbingan",
         "yes": "Ya",
         "partially": "Sebahagian",
         "no": "Tidak",
@@ -92,6 +97,7 @@ STYLE_CATEGORY_TITLES = {
         "key_elements_col": "Elementos Clave",
         "recording_matches_col": "Coincidencias en la grabación",
         "score_col": "Puntuación",
+        "coaching_col": "Recomendaciones de Coaching",
         "yes": "Sí",
         "partially": "Parcialmente",
         "no": "No",
@@ -108,6 +114,7 @@ STYLE_CATEGORY_TITLES = {
         "key_elements_col": "Kluczowe Elementy",
         "recording_matches_col": "Zgodność nagrania",
         "score_col": "Wynik",
+        "coaching_col": "Rekomendacje Coachingowe",
         "yes": "Tak",
         "partially": "Częściowo",
         "no": "Nie",
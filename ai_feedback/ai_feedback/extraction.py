@@ -0,0 +1,303 @@
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO
+
+import av
+from fastapi import UploadFile
+from loguru import logger
+
+from ai_feedback.config import settings
+from ai_feedback.metrics import metrics
+from ai_feedback.uploads import (
+    UploadTooLargeError,
+    remove_if_exists,
+    spool_upload_to_disk,
+)
+from ai_feedback.utils import read_audio
+
+# Audio codecs that can be stream-copied as-is, with the container used for them
+REMUX_FORMATS = {
+    "opus": ("ogg", "ogg"),
+    "vorbis": ("ogg", "ogg"),
+    "aac": ("adts", "aac"),
+    "mp3": ("mp3", "mp3"),
+}
+
+
+class FFmpegError(RuntimeError):
+    pass
+
+
+class FFmpegTimeoutError(FFmpegError):
+    pass
+
+
+class FFmpegPool:
+    """
+    Runs ffmpeg jobs as asyncio subprocesses, never blocking the event loop.
+    At most `max_workers` jobs run at once, the rest wait in line (reported
+    as the `ffmpeg_queue_depth` gauge). A job that times out or whose caller
+    is cancelled has its ffmpeg child killed.
+    """
+
+    def __init__(self, max_workers: int, timeout_seconds: float):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._queued = 0
+        self._running = 0
+
+    def _update_gauges(self):
+        metrics.set_gauge("ffmpeg_queue_depth", self._queued)
+        metrics.set_gauge("ffmpeg_running_jobs", self._running)
+
+    async def run(
+        self, args: list[str], stdin_chunks: AsyncIterator[bytes] | None = None
+    ) -> bytes:
+        """
+        Run `ffmpeg <args>` and return its stdout. When `stdin_chunks` is
+        given, the chunks are streamed into ffmpeg's stdin as they arrive.
+        """
+        t0 = time.time()
+        self._queued += 1
+        self._update_gauges()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+            self._update_gauges()
+        metrics.observe("ffmpeg_queue_wait", time.time() - t0)
+
+        self._running += 1
+        self._update_gauges()
+        try:
+            return await self._run_process(args, stdin_chunks)
+        finally:
+            self._running -= 1
+            self._update_gauges()
+            self._semaphore.release()
+
+    async def _run_process(
+        self, args: list[str], stdin_chunks: AsyncIterator[bytes] | None
+    ) -> bytes:
+        t0 = time.time()
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            *(["-nostdin"] if stdin_chunks is None else []),
+            *args,
+            stdin=(
+                asyncio.subprocess.DEVNULL
+                if stdin_chunks is None
+                else asyncio.subprocess.PIPE
+            ),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stdout, stderr = await asyncio.wait_for(
+                asyncio.gather(
+                    _feed_stdin(process, stdin_chunks),
+                    process.stdout.read(),  # pyright: ignore
+                    process.stderr.read(),  # pyright: ignore
+                ),
+                timeout=self.timeout_seconds,
+            )
+            await process.wait()
+        except asyncio.TimeoutError:
+            await _kill(process)
+            metrics.increment("ffmpeg_timeouts")
+            raise FFmpegTimeoutError(
+                f"ffmpeg did not finish within {self.timeout_seconds}s"
+            )
+        except BaseException as e:
+            await _kill(process)
+            if isinstance(e, asyncio.CancelledError):
+                metrics.increment("ffmpeg_cancelled")
+                logger.info("ffmpeg job cancelled, child process killed")
+            raise
+        metrics.observe("ffmpeg_run", time.time() - t0)
+
+        if process.returncode != 0:
+            metrics.increment("ffmpeg_failures")
+            raise FFmpegError(
+                f"ffmpeg exited with code {process.returncode}: "
+                f"{stderr.decode(errors='replace')[-2000:]}"
+            )
+        return stdout
+
+
+async def _feed_stdin(
+    process: asyncio.subprocess.Process, stdin_chunks: AsyncIterator[bytes] | None
+):
+    if stdin_chunks is None:
+        return
+    stdin = process.stdin
+    assert stdin is not None
+    try:
+        async for chunk in stdin_chunks:
+            stdin.write(chunk)
+            await stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # ffmpeg stopped reading (e.g. unsupported input); its exit code and
+        # stderr explain why
+        pass
+    finally:
+        if not stdin.is_closing():
+            stdin.close()
+
+
+async def _kill(process: asyncio.subprocess.Process):
+    if process.returncode is None:
+        process.kill()
+    await process.wait()
+
+
+ffmpeg_pool = FFmpegPool(
+    max_workers=settings.ffmpeg_max_workers or os.cpu_count() or 1,
+    timeout_seconds=settings.ffmpeg_timeout_seconds,
+)
+
+
+@dataclass(frozen=True)
+class AudioExtractionPlan:
+    """How ffmpeg should turn the input's audio track into the output."""
+
+    name: str
+    output_args: tuple[str, ...]
+    output_format: str
+    extension: str
+
+
+def plan_audio_extraction(codec: str | None) -> AudioExtractionPlan:
+    """
+    Stream-copy the audio track when its codec can be decoded downstream
+    (see `ai_feedback.audio.prepare_audio`), otherwise re-encode it with a
+    speech-optimised low bit rate.
+    """
+    if codec in REMUX_FORMATS:
+        output_format, extension = REMUX_FORMATS[codec]
+        return AudioExtractionPlan(
+            name=f"remux:{codec}",
+            output_args=("-c:a", "copy"),
+            output_format=output_format,
+            extension=extension,
+        )
+    return AudioExtractionPlan(
+        name=f"reencode:{codec or 'unknown'}",
+        output_args=("-ac", "1", "-ar", "16000", "-c:a", "libmp3lame", "-b:a", "32k"),
+        output_format="mp3",
+        extension="mp3",
+    )
+
+
+def _probe_audio_codec_sync(file: BinaryIO) -> str | None:
+    try:
+        with av.open(file, mode="r") as container:
+            if not container.streams.audio:
+                return None
+            return container.streams.audio[0].codec_context.codec.canonical_name
+    except (av.FFmpegError, ValueError) as e:
+        logger.warning(f"Could not probe the audio codec: {e}")
+        return None
+    finally:
+        file.seek(0)
+
+
+async def probe_audio_codec(upload: UploadFile) -> str | None:
+    return await asyncio.to_thread(_probe_audio_codec_sync, upload.file)
+
+
+async def convert_video_to_audio(video_filename: str, plan: AudioExtractionPlan) -> str:
+    audio_filename = (
+        video_filename.rsplit(".", 1)[0] + str(uuid.uuid4()) + "." + plan.extension
+    )
+    try:
+        await ffmpeg_pool.run(
+            ["-i", video_filename, "-map", "a:0", *plan.output_args]
+            + ["-f", plan.output_format, audio_filename]
+        )
+    except BaseException:
+        if os.path.exists(audio_filename):
+            os.remove(audio_filename)
+        raise
+    return audio_filename
+
+
+async def _iter_upload_chunks(upload: UploadFile) -> AsyncIterator[bytes]:
+    size_bytes = 0
+    while chunk := await upload.read(settings.upload_chunk_size_bytes):
+        size_bytes += len(chunk)
+        if size_bytes > settings.max_upload_size_bytes:
+            raise UploadTooLargeError(settings.max_upload_size_bytes)
+        yield chunk
+
+
+async def extract_audio_via_pipe(
+    upload: UploadFile, plan: AudioExtractionPlan
+) -> bytes:
+    """
+    Stream the upload into ffmpeg's stdin and collect the encoded audio from
+    its stdout, without touching the disk. Containers that need seeking
+    (e.g. MP4 with the index at the end) cannot be demuxed this way.
+    """
+    audio = await ffmpeg_pool.run(
+        # A non-seekable MP4 demuxes to nothing without failing unless told to
+        ["-abort_on", "empty_output", "-i", "pipe:0", "-map", "a:0"]
+        + [*plan.output_args, "-f", plan.output_format, "pipe:1"],
+        stdin_chunks=_iter_upload_chunks(upload),
+    )
+    if not audio:
+        raise FFmpegError("ffmpeg produced no audio from the piped input")
+    return audio
+
+
+async def extract_audio_via_disk(
+    upload: UploadFile, plan: AudioExtractionPlan, timing_logs: list[str]
+) -> bytes:
+    spooled_video = await spool_upload_to_disk(upload)
+    timing_logs.append(spooled_video.timing_log())
+    try:
+        audio_filename = await convert_video_to_audio(spooled_video.path, plan)
+        try:
+            return await asyncio.to_thread(read_audio, audio_filename)
+        finally:
+            await asyncio.to_thread(remove_if_exists, audio_filename)
+    finally:
+        await asyncio.to_thread(remove_if_exists, spooled_video.path)
+
+
+async def extract_audio_from_upload(
+    upload: UploadFile, timing_logs: list[str]
+) -> bytes:
+    """
+    Extract the audio track of an uploaded video according to
+    `settings.audio_extraction_mode`. Pipe mode falls back to the disk-backed
+    path when ffmpeg cannot demux the input from a pipe.
+    """
+    t0 = time.time()
+    plan = plan_audio_extraction(await probe_audio_codec(upload))
+    metrics.increment(f"audio_extraction_{plan.name.split(':')[0]}")
+
+    if settings.audio_extraction_mode == "pipe":
+        try:
+            audio = await extract_audio_via_pipe(upload, plan)
+            timing_logs.append(
+                f"extract_audio[pipe/{plan.name}]: {time.time() - t0:.2f}s"
+            )
+            return audio
+        except FFmpegTimeoutError:
+            raise
+        except FFmpegError as e:
+            logger.warning(f"Pipe extraction failed, falling back to disk: {e}")
+            metrics.increment("audio_extraction_pipe_fallbacks")
+            await upload.seek(0)
+
+    audio = await extract_audio_via_disk(upload, plan, timing_logs)
+    timing_logs.append(f"extract_audio[disk/{plan.name}]: {time.time() - t0:.2f}s")
+    return audio
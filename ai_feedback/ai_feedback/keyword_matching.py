@@ -0,0 +1,358 @@
+import difflib
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+
+from ai_feedback.keyword_translations import KEYWORD_LANGUAGE, normalize_language
+from ai_feedback.models import (
+    KeyElement,
+    KeywordMapping,
+    LessonDetailsExtractedKeywords,
+    ScriptDetails,
+    ScriptWithExtractedKeywords,
+)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# Keywords in parentheses, e.g. "Mr. Jackson ( Member Name )", stand for a
+# value the LLM has to find
+PLACEHOLDER_PATTERN = re.compile(r"\(.*?\)")
+MIN_STEM_LENGTH = 3
+# Plurals that drop "es" rather than "s", e.g. "classes", "matches", "boxes"
+SIBILANT_ENDINGS = ("ss", "x", "z", "ch", "sh")
+FUZZY_MIN_RATIO = 0.85
+FUZZY_MIN_LENGTH = 5
+# Common English function words, ignored when comparing vocabularies
+STOP_WORDS = frozenset("""
+    a about after all also am an and any are as at be because been before
+    being but by can could did do does doing for from had has have having he
+    her here hers him his how i if in into is it its just me more most my no
+    not now of off on once only or other our ours out over own same she so
+    some such than that the their theirs them then there these they this
+    those through to too under until up very was we were what when where
+    which while who whom why will with would you your yours yeah okay um uh
+    """.split())
+# Words ending in "s" that are not plurals, e.g. "news" is not "new"
+UNSTEMMED_WORDS = STOP_WORDS | frozenset("""
+    always bus gas lens news perhaps plus series species thus yes
+    """.split())
+# Above this share of keyword tokens in the transcript, the speaker may just
+# be reciting keywords, which only the LLM can judge
+MAX_KEYWORD_TOKEN_SHARE = 0.5
+
+
+def normalize_token(token: str) -> str:
+    """Case-folded, accent-stripped form of a token."""
+    decomposed = unicodedata.normalize("NFKD", token)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _joined_tokens(text: str) -> str:
+    return f" {' '.join(token for token, _, _ in tokenize(text))} "
+
+
+def is_placeholder(keyword: str, script: str) -> bool:
+    joined_keyword = _joined_tokens(keyword)
+    return joined_keyword.strip() != "" and any(
+        joined_keyword in _joined_tokens(match.group())
+        for match in PLACEHOLDER_PATTERN.finditer(f"{script} {keyword}")
+    )
+
+
+def supports_local_matching(language: str) -> bool:
+    """
+    The suffix rules and stop words are English, so only English transcripts
+    are matched locally; other languages are left to the LLM.
+    """
+    return normalize_language(language) == KEYWORD_LANGUAGE
+
+
+def stem(token: str) -> str:
+    """
+    Conservative English stem of a normalised token: only plural and past
+    tense endings are stripped. "-ing" and "-ly" also derive new words
+    ("banking" is not "bank"), which the LLM does not accept as equivalents.
+    """
+    if token.isdigit() or token in UNSTEMMED_WORDS or len(token) <= MIN_STEM_LENGTH:
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if (
+        token.endswith("es")
+        and len(token) - 2 >= MIN_STEM_LENGTH
+        and token[:-2].endswith(SIBILANT_ENDINGS)
+    ):
+        return token[:-2]
+    if token.endswith("s"):
+        # "class", "status" and "analysis" are not plurals
+        return token if token.endswith(("ss", "us", "is")) else token[:-1]
+    # "speed" and "need" do not end in the past tense suffix
+    if token.endswith("ed") and not token.endswith("eed"):
+        return token[:-2] if len(token) - 2 >= MIN_STEM_LENGTH else token
+    return token
+
+
+def tokenize(text: str) -> list[tuple[str, int, int]]:
+    """Normalised tokens with their character span in `text`."""
+    return [
+        (normalize_token(match.group()), match.start(), match.end())
+        for match in TOKEN_PATTERN.finditer(text)
+    ]
+
+
+def ngrams(text: str, n: int) -> set[tuple[str, ...]]:
+    """Distinct sequences of `n` stemmed tokens in `text`."""
+    tokens = [stem(token) for token, _, _ in tokenize(text)]
+    return {tuple(tokens[i : i + n]) for i in range(len(tokens) - n + 1)}
+
+
+def content_words(text: str) -> list[str]:
+    """Stemmed tokens of `text` without stop words."""
+    return [stem(token) for token, _, _ in tokenize(text) if token not in STOP_WORDS]
+
+
+class KeywordIndex:
+    """
+    Aho-Corasick automaton over stemmed token sequences, so every keyword is
+    found in a single pass over the transcript tokens.
+    """
+
+    def __init__(self, keywords: tuple[str, ...]):
+        self.keywords = keywords
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+        self.keyword_tokens: list[list[str]] = []
+
+        for keyword_id, keyword in enumerate(keywords):
+            tokens = [stem(token) for token, _, _ in tokenize(keyword)]
+            self.keyword_tokens.append(tokens)
+            if not tokens:
+                continue
+            node = 0
+            for token in tokens:
+                if token not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                    self._goto[node][token] = len(self._goto) - 1
+                node = self._goto[node][token]
+            self._outputs[node].append(keyword_id)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._outputs[child].extend(self._outputs[self._fail[child]])
+
+    def find(self, tokens: list[str]) -> dict[int, list[tuple[int, int]]]:
+        """Occurrences of each keyword in order, as (start, end) token ranges."""
+        found: dict[int, list[tuple[int, int]]] = {}
+        node = 0
+        for position, token in enumerate(tokens):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for keyword_id in self._outputs[node]:
+                length = len(self.keyword_tokens[keyword_id])
+                found.setdefault(keyword_id, []).append(
+                    (position - length + 1, position + 1)
+                )
+        return found
+
+
+def _is_free(token_range: tuple[int, int], claimed: set[int]) -> bool:
+    return claimed.isdisjoint(range(*token_range))
+
+
+def _find_fuzzy(
+    keyword_tokens: list[str], transcript_tokens: list[str], claimed: set[int]
+) -> tuple[int, int] | None:
+    # Numbers have to match exactly
+    if any(char.isdigit() for token in keyword_tokens for char in token):
+        return None
+    target = " ".join(keyword_tokens)
+    if len(target) < FUZZY_MIN_LENGTH:
+        return None
+
+    n = len(keyword_tokens)
+    matcher = difflib.SequenceMatcher(b=target, autojunk=False)
+    for start in range(len(transcript_tokens) - n + 1):
+        if not _is_free((start, start + n), claimed):
+            continue
+        matcher.set_seq1(" ".join(transcript_tokens[start : start + n]))
+        if (
+            matcher.real_quick_ratio() >= FUZZY_MIN_RATIO
+            and matcher.quick_ratio() >= FUZZY_MIN_RATIO
+            and matcher.ratio() >= FUZZY_MIN_RATIO
+        ):
+            return (start, start + n)
+    return None
+
+
+@dataclass
+class LocalKeywordMatches:
+    """
+    Keyword mappings resolved without the LLM, per key element; None marks
+    keywords left for the LLM.
+    """
+
+    script_details: ScriptDetails
+    mappings: list[list[KeywordMapping | None]]
+    keyword_token_share: float = 0.0
+    fuzzy_matches: int = 0
+
+    @property
+    def resolved_count(self) -> int:
+        return sum(m is not None for mappings in self.mappings for m in mappings)
+
+    @property
+    def unresolved_count(self) -> int:
+        return sum(m is None for mappings in self.mappings for m in mappings)
+
+    @property
+    def looks_like_keyword_recitation(self) -> bool:
+        return self.keyword_token_share > MAX_KEYWORD_TOKEN_SHARE
+
+    def unresolved_script_details(self) -> ScriptDetails:
+        """The lesson with only the keywords the LLM still has to match."""
+        return self.script_details.model_copy(
+            update={
+                "keyElements": [
+                    KeyElement(
+                        script=key_element.script,
+                        keywords=[
+                            keyword
+                            for keyword, mapping in zip(key_element.keywords, mappings)
+                            if mapping is None
+                        ],
+                    )
+                    for key_element, mappings in zip(
+                        self.script_details.keyElements, self.mappings
+                    )
+                ]
+            }
+        )
+
+    def merge(
+        self, llm_result: LessonDetailsExtractedKeywords | None = None
+    ) -> LessonDetailsExtractedKeywords:
+        """
+        Combines the local mappings with the LLM's mappings for the
+        unresolved keywords; without an LLM result, everything must have
+        been resolved locally.
+        """
+        llm_scripts = llm_result.scripts if llm_result is not None else []
+        by_script = {script.script: script for script in llm_scripts}
+
+        scripts = []
+        for position, (key_element, mappings) in enumerate(
+            zip(self.script_details.keyElements, self.mappings)
+        ):
+            llm_script = by_script.get(key_element.script) or (
+                llm_scripts[position] if position < len(llm_scripts) else None
+            )
+            llm_mappings = {
+                normalize_token(mapping.keyword): mapping
+                for mapping in (
+                    llm_script.keywords_with_equivalents if llm_script else []
+                )
+            }
+            keywords_with_equivalents = []
+            for keyword, mapping in zip(key_element.keywords, mappings):
+                if mapping is None:
+                    mapping = llm_mappings.get(
+                        normalize_token(keyword),
+                        KeywordMapping(keyword=keyword, transcript_equivalent="None"),
+                    )
+                keywords_with_equivalents.append(mapping)
+            scripts.append(
+                ScriptWithExtractedKeywords(
+                    script=key_element.script,
+                    keywords_with_equivalents=keywords_with_equivalents,
+                )
+            )
+
+        return LessonDetailsExtractedKeywords(
+            scripts=scripts,
+            transcript_matches_lesson=(
+                llm_result.transcript_matches_lesson if llm_result is not None else True
+            ),
+        )
+
+
+def match_keywords_locally(
+    script_details: ScriptDetails,
+    transcript: str,
+    index: KeywordIndex,
+    translated_keywords: dict[str, str],
+) -> LocalKeywordMatches:
+    """
+    Finds keywords in the transcript verbatim (after case folding, accent
+    stripping and light stemming) or as close spelling variants. `index` must
+    be built from the lesson's keywords in order; keywords without a known
+    translation are left untranslated. Like the LLM, a key element's keywords
+    are matched to different words of the transcript, so "way to" and "ways"
+    are not both found in a single "a way to".
+    """
+    transcript_tokens = tokenize(transcript)
+    stemmed = [stem(token) for token, _, _ in transcript_tokens]
+    found = index.find(stemmed)
+
+    mappings: list[list[KeywordMapping | None]] = []
+    matched_tokens: set[int] = set()
+    fuzzy_matches = 0
+    keyword_id = 0
+    for key_element in script_details.keyElements:
+        element_mappings: list[KeywordMapping | None] = []
+        element_tokens: set[int] = set()
+        for keyword in key_element.keywords:
+            token_range = None
+            if not is_placeholder(keyword, key_element.script):
+                token_range = next(
+                    (
+                        occurrence
+                        for occurrence in found.get(keyword_id, [])
+                        if _is_free(occurrence, element_tokens)
+                    ),
+                    None,
+                )
+                if token_range is None:
+                    token_range = _find_fuzzy(
+                        index.keyword_tokens[keyword_id], stemmed, element_tokens
+                    )
+                    fuzzy_matches += token_range is not None
+
+            if token_range is None:
+                element_mappings.append(None)
+            else:
+                start, end = token_range
+                element_tokens.update(range(start, end))
+                matched_tokens.update(range(start, end))
+                element_mappings.append(
+                    KeywordMapping(
+                        keyword=keyword,
+                        translated_keyword=translated_keywords.get(keyword, ""),
+                        transcript_equivalent=transcript[
+                            transcript_tokens[start][1] : transcript_tokens[end - 1][2]
+                        ],
+                    )
+                )
+            keyword_id += 1
+        mappings.append(element_mappings)
+
+    return LocalKeywordMatches(
+        script_details=script_details,
+        mappings=mappings,
+        keyword_token_share=(
+            len(matched_tokens) / len(transcript_tokens) if transcript_tokens else 1.0
+        ),
+        fuzzy_matches=fuzzy_matches,
+    )
@@ -0,0 +1,79 @@
+import asyncio
+
+from ai_feedback.cache import LRUCache, SQLiteCache, TieredCache
+from ai_feedback.config import settings
+from ai_feedback.metrics import metrics
+from ai_feedback.models import SupportedLanguage
+
+# Lesson keywords are written in English
+KEYWORD_LANGUAGE = SupportedLanguage.ENGLISH.value
+
+
+def normalize_language(language: str) -> str:
+    """The `SupportedLanguage` value of a language name, e.g. "English"."""
+    return language.strip().lower()
+
+
+class KeywordTranslationStore:
+    """
+    Translations of lesson keywords per target language. Keyword lists do
+    not change, so a translation is generated once (by the warm-up script,
+    on registration or by the first keyword extraction) and then reused,
+    which keeps keywords translated the same way across requests.
+    """
+
+    def __init__(self, cache: TieredCache):
+        self._cache = cache
+
+    @staticmethod
+    def _key(keyword: str, language: str) -> str:
+        return f"{language}:{' '.join(keyword.split())}"
+
+    async def lookup(self, keywords: list[str], language: str) -> dict[str, str]:
+        """The known translations of `keywords`; unknown ones are left out."""
+        keywords = list(dict.fromkeys(keywords))
+        language = normalize_language(language)
+        if language == KEYWORD_LANGUAGE:
+            return {keyword: keyword for keyword in keywords}
+        translations = await asyncio.gather(
+            *[self._cache.get(self._key(keyword, language)) for keyword in keywords]
+        )
+        return {
+            keyword: translation
+            for keyword, translation in zip(keywords, translations)
+            if translation
+        }
+
+    async def store(self, translations: dict[str, str], language: str):
+        """Adds translations for keywords that have none yet."""
+        language = normalize_language(language)
+        if language == KEYWORD_LANGUAGE:
+            return
+        known = await self.lookup(list(translations), language)
+        new = {
+            keyword: translation
+            for keyword, translation in translations.items()
+            if translation and keyword not in known
+        }
+        for keyword, translation in new.items():
+            await self._cache.set(self._key(keyword, language), translation)
+        metrics.increment("keyword_translations_stored", len(new))
+
+
+keyword_translations = KeywordTranslationStore(
+    TieredCache(
+        "keyword_translation",
+        memory=LRUCache(
+            max_entries=settings.keyword_translation_cache_max_entries,
+            ttl_seconds=float("inf"),
+        ),
+        disk=(
+            SQLiteCache(
+                settings.keyword_translation_cache_path,
+                max_entries=settings.keyword_translation_cache_max_entries,
+            )
+            if settings.keyword_translation_cache_path
+            else None
+        ),
+    )
+)
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+
+from ai_feedback.challenge_registry import LESSON_NGRAM_SIZE, CompiledChallenge
+from ai_feedback.keyword_matching import (
+    content_words,
+    is_placeholder,
+    match_keywords_locally,
+    ngrams,
+)
+from ai_feedback.keyword_translations import KEYWORD_LANGUAGE
+
+
+@dataclass(frozen=True)
+class LessonMatchScore:
+    """How much of the lesson a transcript covers, from local signals only."""
+
+    # Share of the lesson keywords (placeholders excluded) found in the transcript
+    keyword_coverage: float
+    # Share of the lesson's word bigrams found in the transcript
+    ngram_overlap: float
+    # Share of the transcript's content words that occur in the lesson, which
+    # keeps paraphrased readings from looking off-topic
+    vocabulary_overlap: float
+
+    @property
+    def score(self) -> float:
+        # A recording is only clearly off-topic when every signal is low
+        return max(self.keyword_coverage, self.ngram_overlap, self.vocabulary_overlap)
+
+
+def score_lesson_match(
+    challenge: CompiledChallenge, transcript: str
+) -> LessonMatchScore | None:
+    """
+    Scores a transcript against the lesson's key elements and question
+    without calling an LLM. Lessons are written in English, so transcripts in
+    other languages cannot be compared locally and get None, as do lessons
+    with nothing to compare.
+    """
+    matchable_keywords = sum(
+        not is_placeholder(keyword, key_element.script)
+        for key_element in challenge.script_details.keyElements
+        for keyword in key_element.keywords
+    )
+    if challenge.language != KEYWORD_LANGUAGE or not (
+        matchable_keywords or challenge.lesson_ngrams
+    ):
+        return None
+
+    local_matches = match_keywords_locally(
+        challenge.script_details,
+        transcript,
+        challenge.keyword_index,
+        challenge.translated_keywords,
+    )
+    transcript_ngrams = ngrams(transcript, LESSON_NGRAM_SIZE)
+    transcript_words = content_words(transcript)
+    return LessonMatchScore(
+        keyword_coverage=(
+            local_matches.resolved_count / matchable_keywords
+            if matchable_keywords
+            else 0.0
+        ),
+        ngram_overlap=(
+            len(challenge.lesson_ngrams & transcript_ngrams)
+            / len(challenge.lesson_ngrams)
+            if challenge.lesson_ngrams
+            else 0.0
+        ),
+        vocabulary_overlap=(
+            sum(word in challenge.lesson_vocabulary for word in transcript_words)
+            / len(transcript_words)
+            if transcript_words
+            else 0.0
+        ),
+    )
@@ -1,10 +1,11 @@
 import asyncio
-import base64
-import subprocess
 import time
 import traceback
-import uuid
 import os
+from contextlib import asynccontextmanager
+from typing import Awaitable, TypeVar
+
+from pydantic import BaseModel
 
 from fastapi import (
     FastAPI,
@@ -16,6 +17,7 @@ from fastapi import (
     Depends,
 )
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from loguru import logger
 
 from ai_feedback.ai import (
@@ -23,10 +25,21 @@ from ai_feedback.ai import (
     judge_feedback,
     get_feedback_from_video,
     get_feedback_legacy,
+    get_pipeline_fingerprint,
+    init_clients,
+    translate_keywords,
 )
 from ai_feedback.authentication import verify_token, create_access_token
+from ai_feedback.cache import DiskCache, LRUCache, TieredCache, make_cache_key
+from ai_feedback.challenge_registry import UnknownChallengeError, challenge_registry
 from ai_feedback.config import settings
+from ai_feedback.extraction import FFmpegError, extract_audio_from_upload
+from ai_feedback.keyword_translations import KEYWORD_LANGUAGE
+from ai_feedback.metrics import metrics
 from ai_feedback.models import (
+    ChallengeRegistration,
+    ChallengeRegistrationResponse,
+    DecodeProfile,
     FeedbackInput,
     FeedbackResponse,
     ScriptDetails,
@@ -36,13 +49,66 @@ from ai_feedback.models import (
     StructuredFeedbackResponse,
     FeedbackResponseLegacy,
 )
+from ai_feedback.prompt_registry import prompt_registry
+from ai_feedback.transcription import TranscriptionQueueFullError, whisper_pool
+from ai_feedback.uploads import UploadTooLargeError, hash_upload, spool_upload_to_disk
+from ai_feedback.warmup import warm_up
 from ai_feedback.utils import (
-    convert_video_to_audio,
+    UnknownSessionError,
     langfuse_user_like,
     fetch_feedback_input_output,
 )
 
-app = FastAPI()
+DISCONNECT_POLL_SECONDS = 0.5
+TRANSCRIPTION_RETRY_AFTER_SECONDS = 5
+
+T = TypeVar("T")
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    missing_secrets = settings.missing_secrets()
+    if missing_secrets:
+        raise RuntimeError(
+            f"Missing required settings: {', '.join(missing_secrets).upper()}"
+        )
+
+    # Heavy resources are created here, concurrently, instead of at import time
+    t0 = time.time()
+    await asyncio.gather(
+        prompt_registry.start(),
+        whisper_pool.start(),
+        asyncio.to_thread(init_clients),
+    )
+    metrics.observe("startup", time.time() - t0)
+    logger.info(f"Startup complete in {time.time() - t0:.2f}s")
+    # Runs in the background; /ready reports when it is done
+    warm_up.start()
+    yield
+    await warm_up.stop()
+    await prompt_registry.stop()
+    whisper_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+response_cache = TieredCache(
+    "response",
+    memory=LRUCache(
+        max_entries=settings.response_cache_max_entries,
+        ttl_seconds=settings.response_cache_ttl_seconds,
+    ),
+    disk=(
+        DiskCache(
+            settings.response_cache_dir,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+            max_bytes=settings.response_cache_max_disk_bytes,
+        )
+        if settings.response_cache_dir
+        else None
+    ),
+)
 
 
 origins = ["*"]
@@ -65,6 +131,82 @@ async def delete_local_file(filepath: str):
         logger.warning(f"Failed to delete local temporary file: {e}")
 
 
+class ClientDisconnectedError(Exception):
+    pass
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await `awaitable`, cancelling it as soon as the client goes away so that
+    expensive work (e.g. an ffmpeg child process) does not outlive the request.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                metrics.increment("client_disconnects")
+                raise ClientDisconnectedError("Client disconnected")
+    finally:
+        task.cancel()
+
+
+async def resolve_script_details(feedback_input: FeedbackInput) -> ScriptDetails:
+    """
+    The lesson sent with the request, registered on first sight, or the
+    registered lesson the request refers to.
+    """
+    script_details = feedback_input.script_details
+    if script_details is not None:
+        await challenge_registry.register(feedback_input.challenge, script_details)
+        return script_details
+    return await challenge_registry.resolve(
+        feedback_input.challenge, feedback_input.challenge_hash
+    )
+
+
+async def get_response_cache_key(
+    endpoint: str,
+    video: UploadFile,
+    script_details: ScriptDetails,
+    language: SupportedLanguage,
+    decode_profile: DecodeProfile | None,
+) -> str | None:
+    if not settings.response_cache_enabled:
+        return None
+    media_hash = await hash_upload(video)
+    return make_cache_key(
+        endpoint,
+        media_hash,
+        script_details.model_dump(mode="json"),
+        language.value,
+        decode_profile.value if decode_profile else None,
+        get_pipeline_fingerprint(),
+    )
+
+
+async def get_cached_response(
+    cache_key: str | None, response_model: type[ResponseT]
+) -> ResponseT | None:
+    """
+    Return a cached response, if there is one. It keeps the session_id of the
+    run that produced it, whose traces /like and /judge look up.
+    """
+    if cache_key is None:
+        return None
+    cached = await response_cache.get(cache_key)
+    if cached is None:
+        return None
+    return response_model(**cached)
+
+
+async def cache_response(cache_key: str | None, response: BaseModel):
+    if cache_key is not None:
+        await response_cache.set(cache_key, response.model_dump(mode="json"))
+
+
 @app.post("/login")
 async def login(request: Request):
     body = await request.json()
@@ -84,59 +226,65 @@ async def login(request: Request):
     dependencies=[Depends(verify_token)],
 )
 async def generate_feedback(
+    request: Request,
     video: UploadFile = File(...),
     feedback_input_str: str = Form(...),
     language: SupportedLanguage = Form(SupportedLanguage.ENGLISH),
+    decode_profile: DecodeProfile | None = Form(None),
 ):
     endpoint_start_time = time.time()
     timing_logs = []
     try:
         logger.info(f"Feedback request input {feedback_input_str}")
         feedback_input = FeedbackInput.model_validate_json(feedback_input_str)
-        script_details = ScriptDetails(
-            question=feedback_input.question,
-            keyElements=feedback_input.keyElements,
-            briefing=feedback_input.briefing,
-        )
-
-        t0 = time.time()
-        video_content = await video.read()
-        timing_logs.append(f"video_read: {time.time() - t0:.2f}s")
+        script_details = await resolve_script_details(feedback_input)
 
-        base64_content_bytes = base64.b64encode(video_content)
-        base64_content_str = base64_content_bytes.decode("utf-8")
-        logger.info(f"base64Video {base64_content_str}")
-
-        # Save video file
-        t0 = time.time()
-        video_filename = f"/tmp/{uuid.uuid4()}_{video.filename}"
-        with open(video_filename, "wb") as f:
-            f.write(video_content)
-        timing_logs.append(f"video_write: {time.time() - t0:.2f}s")
+        cache_key = await get_response_cache_key(
+            "/feedback", video, script_details, language, decode_profile
+        )
+        cached_response = await get_cached_response(cache_key, FeedbackResponseLegacy)
+        if cached_response is not None:
+            timing_logs.append(
+                f"response_cache_hit: {time.time() - endpoint_start_time:.3f}s"
+            )
+            logger.info(f"Performance [Endpoint /feedback]: {' | '.join(timing_logs)}")
+            return cached_response
 
-        t0 = time.time()
-        audio_filename = convert_video_to_audio(video_filename)
-        timing_logs.append(f"convert_video_to_audio: {time.time() - t0:.2f}s")
+        audio = await cancel_on_disconnect(
+            request, extract_audio_from_upload(video, timing_logs)
+        )
 
         t0 = time.time()
         result = await get_feedback_legacy(
-            audio_filename=audio_filename,
+            audio=audio,
             script_details=script_details,
             user_id=feedback_input.user_id,
             tags=feedback_input.tags,
             language=language.value,
+            decode_profile=decode_profile.value if decode_profile else None,
         )
         timing_logs.append(f"get_feedback_legacy: {time.time() - t0:.2f}s")
 
-        asyncio.create_task(delete_local_file(video_filename))
-        asyncio.create_task(delete_local_file(audio_filename))
-
         timing_logs.append(f"Total time: {time.time() - endpoint_start_time:.2f}s")
         logger.info(f"Performance [Endpoint /feedback]: {' | '.join(timing_logs)}")
-        return FeedbackResponseLegacy(**result)
-
-    except subprocess.CalledProcessError as e:
+        response = FeedbackResponseLegacy(**result)
+        await cache_response(cache_key, response)
+        return response
+
+    except UnknownChallengeError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except TranscriptionQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(TRANSCRIPTION_RETRY_AFTER_SECONDS)},
+        )
+    except FFmpegError as e:
         raise HTTPException(status_code=500, detail=f"FFmpeg error: {e}")
+    except ClientDisconnectedError as e:
+        raise HTTPException(status_code=499, detail=str(e))
     except Exception as e:
         logger.error(str(e))
         logger.error(traceback.format_exc())
@@ -151,9 +299,11 @@ async def generate_feedback(
     dependencies=[Depends(verify_token)],
 )
 async def generate_feedback_video(
+    request: Request,
     video: UploadFile = File(...),
     feedback_input_str: str = Form(...),
     language: SupportedLanguage = Form(SupportedLanguage.ENGLISH),
+    decode_profile: DecodeProfile | None = Form(None),
 ):
     """
     Generate feedback from video using Gemini's multimodal capabilities.
@@ -164,42 +314,64 @@ async def generate_feedback_video(
     try:
         logger.info(f"Video feedback request input {feedback_input_str}")
         feedback_input = FeedbackInput.model_validate_json(feedback_input_str)
-        script_details = ScriptDetails(
-            question=feedback_input.question,
-            keyElements=feedback_input.keyElements,
-            briefing=feedback_input.briefing,
-        )
-
-        t0 = time.time()
-        video_content = await video.read()
-        timing_logs.append(f"video_read: {time.time() - t0:.2f}s")
-
-        # Save video file
-        t0 = time.time()
-        video_filename = f"/tmp/{uuid.uuid4()}_{video.filename}"
-        with open(video_filename, "wb") as f:
-            f.write(video_content)
-        timing_logs.append(f"video_write: {time.time() - t0:.2f}s")
+        script_details = await resolve_script_details(feedback_input)
 
-        # Process video directly using multimodal analysis
-        t0 = time.time()
-        result = await get_feedback_from_video(
-            video_filename=video_filename,
-            script_details=script_details,
-            user_id=feedback_input.user_id,
-            tags=feedback_input.tags,
-            language=language.value,
+        cache_key = await get_response_cache_key(
+            "/feedback_video", video, script_details, language, decode_profile
         )
-        timing_logs.append(f"get_feedback_from_video: {time.time() - t0:.2f}s")
-
-        asyncio.create_task(delete_local_file(video_filename))
+        cached_response = await get_cached_response(cache_key, FeedbackResponse)
+        if cached_response is not None:
+            timing_logs.append(
+                f"response_cache_hit: {time.time() - endpoint_start_time:.3f}s"
+            )
+            logger.info(
+                f"Performance [Endpoint /feedback_video]: {' | '.join(timing_logs)}"
+            )
+            return cached_response
+
+        spooled_video = await spool_upload_to_disk(video)
+        video_filename = spooled_video.path
+        timing_logs.append(spooled_video.timing_log())
+
+        try:
+            # Process video directly using multimodal analysis
+            t0 = time.time()
+            result = await cancel_on_disconnect(
+                request,
+                get_feedback_from_video(
+                    video_filename=video_filename,
+                    script_details=script_details,
+                    user_id=feedback_input.user_id,
+                    tags=feedback_input.tags,
+                    language=language.value,
+                    decode_profile=decode_profile.value if decode_profile else None,
+                ),
+            )
+            timing_logs.append(f"get_feedback_from_video: {time.time() - t0:.2f}s")
+        finally:
+            # Also on errors and cancellation, e.g. when the client disconnects
+            asyncio.create_task(delete_local_file(video_filename))
 
         timing_logs.append(f"Total time: {time.time() - endpoint_start_time:.2f}s")
         logger.info(
             f"Performance [Endpoint /feedback_video]: {' | '.join(timing_logs)}"
         )
-        return FeedbackResponse(**result)
-
+        response = FeedbackResponse(**result)
+        await cache_response(cache_key, response)
+        return response
+
+    except UnknownChallengeError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except TranscriptionQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(TRANSCRIPTION_RETRY_AFTER_SECONDS)},
+        )
+    except ClientDisconnectedError as e:
+        raise HTTPException(status_code=499, detail=str(e))
     except Exception as e:
         logger.error(str(e))
         logger.error(traceback.format_exc())
@@ -214,9 +386,11 @@ async def generate_feedback_video(
     dependencies=[Depends(verify_token)],
 )
 async def generate_feedback_audio(
+    request: Request,
     video: UploadFile = File(...),
     feedback_input_str: str = Form(...),
     language: SupportedLanguage = Form(SupportedLanguage.ENGLISH),
+    decode_profile: DecodeProfile | None = Form(None),
 ):
     """
     Generate fully structured feedback.
@@ -226,44 +400,60 @@ async def generate_feedback_audio(
     timing_logs = []
     try:
         feedback_input = FeedbackInput.model_validate_json(feedback_input_str)
-        script_details = ScriptDetails(
-            question=feedback_input.question,
-            keyElements=feedback_input.keyElements,
-            briefing=feedback_input.briefing,
-        )
-
-        t0 = time.time()
-        video_content = await video.read()
-        timing_logs.append(f"video_read: {time.time() - t0:.2f}s")
+        script_details = await resolve_script_details(feedback_input)
 
-        t0 = time.time()
-        video_filename = f"/tmp/{uuid.uuid4()}_{video.filename}"
-        with open(video_filename, "wb") as f:
-            f.write(video_content)
-        timing_logs.append(f"video_write: {time.time() - t0:.2f}s")
+        cache_key = await get_response_cache_key(
+            "/feedback_audio", video, script_details, language, decode_profile
+        )
+        cached_response = await get_cached_response(
+            cache_key, StructuredFeedbackResponse
+        )
+        if cached_response is not None:
+            timing_logs.append(
+                f"response_cache_hit: {time.time() - endpoint_start_time:.3f}s"
+            )
+            logger.info(
+                f"Performance [Endpoint /feedback_structured]: {' | '.join(timing_logs)}"
+            )
+            return cached_response
 
-        t0 = time.time()
-        audio_filename = convert_video_to_audio(video_filename)
-        timing_logs.append(f"convert_video_to_audio: {time.time() - t0:.2f}s")
+        audio = await cancel_on_disconnect(
+            request, extract_audio_from_upload(video, timing_logs)
+        )
 
         t0 = time.time()
         result = await get_feedback(
-            audio_filename=audio_filename,
+            audio=audio,
             script_details=script_details,
             user_id=feedback_input.user_id,
             tags=feedback_input.tags,
             language=language.value,
+            decode_profile=decode_profile.value if decode_profile else None,
         )
         timing_logs.append(f"get_feedback: {time.time() - t0:.2f}s")
-        asyncio.create_task(delete_local_file(video_filename))
-        asyncio.create_task(delete_local_file(audio_filename))
 
         timing_logs.append(f"Total time: {time.time() - endpoint_start_time:.2f}s")
         logger.info(
             f"Performance [Endpoint /feedback_structured]: {' | '.join(timing_logs)}"
         )
-        return StructuredFeedbackResponse(**result)
-
+        response = StructuredFeedbackResponse(**result)
+        await cache_response(cache_key, response)
+        return response
+
+    except UnknownChallengeError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except TranscriptionQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(TRANSCRIPTION_RETRY_AFTER_SECONDS)},
+        )
+    except FFmpegError as e:
+        raise HTTPException(status_code=500, detail=f"FFmpeg error: {e}")
+    except ClientDisconnectedError as e:
+        raise HTTPException(status_code=499, detail=str(e))
     except Exception as e:
         logger.error(str(e))
         logger.error(traceback.format_exc())
@@ -280,6 +470,8 @@ async def user_like(req: UserLikeRequest):
             asyncio.create_task(
                 judge_session(LangfuseTracesRequest(session_id=req.session_id))
             )
+    except UnknownSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(str(e))
         logger.error(traceback.format_exc())
@@ -295,9 +487,63 @@ async def judge_session(req: LangfuseTracesRequest):
         await judge_feedback(
             ai_input=ai_input, ai_feedback=ai_feedback, session_id=req.session_id
         )
+    except UnknownSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(str(e))
         logger.error(traceback.format_exc())
         raise HTTPException(
             status_code=500, detail=f"{str(e)}\n\n{traceback.format_exc()}"
         )
+
+
+async def warm_keyword_translations(keywords: list[str]):
+    for language in SupportedLanguage:
+        if language.value == KEYWORD_LANGUAGE:
+            continue
+        try:
+            await translate_keywords(keywords, language.value)
+        except Exception as e:
+            logger.warning(f"Failed to translate keywords into {language.value}: {e}")
+
+
+@app.post(
+    "/challenges",
+    response_model=ChallengeRegistrationResponse,
+    dependencies=[Depends(verify_token)],
+)
+async def register_challenge(req: ChallengeRegistration):
+    """
+    Register a lesson so feedback requests can refer to it by `challenge`
+    and `challenge_hash` instead of sending it in full.
+    """
+    script_details = ScriptDetails(
+        question=req.question, briefing=req.briefing, keyElements=req.keyElements
+    )
+    challenge_hash = await challenge_registry.register(req.challenge, script_details)
+    for language in SupportedLanguage:
+        await challenge_registry.compile(script_details, language.value)
+    asyncio.create_task(
+        warm_keyword_translations(
+            [keyword for element in req.keyElements for keyword in element.keywords]
+        )
+    )
+    return ChallengeRegistrationResponse(
+        challenge=req.challenge, challenge_hash=challenge_hash
+    )
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    status = warm_up.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+@app.get("/metrics", dependencies=[Depends(verify_token)])
+async def get_metrics():
+    return {**metrics.snapshot(), "prompt_versions": prompt_registry.versions()}
@@ -0,0 +1,52 @@
+import threading
+from collections import defaultdict
+from typing import Any
+
+
+class Metrics:
+    """
+    Minimal in-process metrics registry: counters, gauges and timing
+    summaries (count / total / max seconds), exposed through /metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            timing = self._timings.setdefault(
+                name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            timing["count"] += 1
+            timing["total_seconds"] += seconds
+            timing["max_seconds"] = max(timing["max_seconds"], seconds)
+
+    def mean(self, name: str) -> float | None:
+        """Mean seconds of a timing summary, None before the first observation."""
+        with self._lock:
+            timing = self._timings.get(name)
+            if not timing or not timing["count"]:
+                return None
+            return timing["total_seconds"] / timing["count"]
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": {name: dict(t) for name, t in self._timings.items()},
+            }
+
+
+metrics = Metrics()
@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from enum import Enum
 
 
@@ -14,6 +14,13 @@ class SupportedLanguage(str, Enum):
     POLISH = "polish"
 
 
+class DecodeProfile(str, Enum):
+    """Whisper decode profiles, trading transcription accuracy for speed"""
+    FAST = "fast"
+    BALANCED = "balanced"
+    ACCURATE = "accurate"
+
+
 class KeyElement(BaseModel):
     script: str
     keywords: list[str]
@@ -25,11 +32,47 @@ class ScriptDetails(BaseModel):
     keyElements: list[KeyElement]
 
 
-class FeedbackInput(ScriptDetails):
+class FeedbackInput(BaseModel):
+    """
+    Either the full lesson, or a reference to a registered one by
+    `challenge` and `challenge_hash`.
+    """
+
     challenge: int | str
+    challenge_hash: str | None = None
+    question: str | None = None
+    briefing: str | None = None
+    keyElements: list[KeyElement] | None = None
     tags: list[str] | None = None
     user_id: str | None = None
 
+    @model_validator(mode="after")
+    def check_lesson_or_reference(self) -> "FeedbackInput":
+        if self.script_details is None and self.challenge_hash is None:
+            raise ValueError(
+                "Either question, briefing and keyElements or challenge_hash is required"
+            )
+        return self
+
+    @property
+    def script_details(self) -> ScriptDetails | None:
+        if self.question is None or self.briefing is None or self.keyElements is None:
+            return None
+        return ScriptDetails(
+            question=self.question,
+            briefing=self.briefing,
+            keyElements=self.keyElements,
+        )
+
+
+class ChallengeRegistration(ScriptDetails):
+    challenge: int | str
+
+
+class ChallengeRegistrationResponse(BaseModel):
+    challenge: int | str
+    challenge_hash: str
+
 
 class StyleCategory(BaseModel):
     assessment: str = Field(description="Actionable coaching feedback for this category")
@@ -136,6 +179,17 @@ class AudioAnalysisLegacy(BaseModel):
     confidence_score: int = Field(description="Score (0-100) for confidence and authority")
 
 
+class TranscriptSegment(BaseModel):
+    start: float
+    end: float
+    text: str
+
+
+class Transcript(BaseModel):
+    text: str
+    segments: list[TranscriptSegment]
+
+
 class KeywordMapping(BaseModel):
     keyword: str = Field(description="The required keyword")
     translated_keyword: str = Field(
@@ -166,3 +220,69 @@ class LessonDetailsExtractedKeywords(BaseModel):
 
     scripts: list[ScriptWithExtractedKeywords]
     transcript_matches_lesson: bool
+
+
+class KeywordMatch(BaseModel):
+    keyword: str = Field(description="The required keyword")
+    transcript_equivalent: str = Field(
+        default="None",
+        description="Exact match or equivalent formulation, if found in the transcript. If not found the 'None' string should be used",
+    )
+
+
+class ScriptWithKeywordMatches(BaseModel):
+    script: str
+    keywords_with_equivalents: list[KeywordMatch]
+
+
+class LessonDetailsKeywordMatches(BaseModel):
+    """
+    Same as LessonDetailsExtractedKeywords, for when the keyword
+    translations are already known and need not be generated.
+    """
+
+    scripts: list[ScriptWithKeywordMatches]
+    transcript_matches_lesson: bool
+
+
+class KeyElementCoaching(BaseModel):
+    script: str
+    coaching_recommendation: str = Field(
+        description="Specific, actionable coaching on how the recording covers this key element",
+    )
+
+
+class TextAnalysis(BaseModel):
+    """Coaching for every key element, in the order of the lesson details."""
+
+    key_elements: list[KeyElementCoaching]
+
+
+class KeyElementAssessment(BaseModel):
+    script: str
+    keywords_with_equivalents: list[KeywordMapping]
+    coaching_recommendation: str = Field(
+        default="",
+        description="Specific, actionable coaching on how the recording covers this key element",
+    )
+
+
+class SinglePassTextAnalysis(BaseModel):
+    """
+    Keyword equivalents and coaching for every key element, plus whether
+    the transcript matches the lesson, from a single call.
+    """
+
+    scripts: list[KeyElementAssessment]
+    transcript_matches_lesson: bool
+
+
+class TranslatedKeyword(BaseModel):
+    keyword: str = Field(description="The keyword exactly as given")
+    translated_keyword: str = Field(
+        description="The keyword translated into the requested language"
+    )
+
+
+class TranslatedKeywords(BaseModel):
+    translations: list[TranslatedKeyword]
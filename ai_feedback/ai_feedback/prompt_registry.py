@@ -0,0 +1,101 @@
+import asyncio
+import random
+from dataclasses import dataclass
+
+from loguru import logger
+
+from ai_feedback.config import settings
+from ai_feedback.constants.fallback_prompts import (
+    FALLBACK_INCLUDE_COACHING_RECOMMENDATIONS,
+    FALLBACK_MAX_WORDS_PER_SPEECH_DIMENSION,
+)
+from ai_feedback.metrics import metrics
+from ai_feedback.utils import get_langfuse
+
+
+@dataclass(frozen=True)
+class RegisteredPrompt:
+    value: str
+    version: int | str
+
+
+class PromptRegistry:
+    """
+    In-memory copy of the Langfuse prompts used on the request path.
+    Prompts are loaded at startup and refreshed by a background task, so
+    reads never do I/O. Until a prompt has been loaded successfully, its
+    local fallback is served.
+    """
+
+    def __init__(
+        self,
+        fallbacks: dict[str, str],
+        label: str,
+        refresh_seconds: float,
+        jitter_ratio: float = 0.1,
+    ):
+        self.fallbacks = fallbacks
+        self.label = label
+        self.refresh_seconds = refresh_seconds
+        self.jitter_ratio = jitter_ratio
+        self._prompts: dict[str, RegisteredPrompt] = {}
+        self._refresh_task: asyncio.Task | None = None
+
+    def get(self, name: str) -> str:
+        prompt = self._prompts.get(name)
+        if prompt is None:
+            return self.fallbacks[name]
+        return prompt.value
+
+    def versions(self) -> dict[str, int | str]:
+        return {
+            name: (self._prompts[name].version if name in self._prompts else "fallback")
+            for name in self.fallbacks
+        }
+
+    @property
+    def is_populated(self) -> bool:
+        return all(name in self._prompts for name in self.fallbacks)
+
+    def _refresh_sync(self):
+        for name in self.fallbacks:
+            try:
+                # cache_ttl_seconds=0 bypasses the SDK cache; this registry is the cache
+                prompt = get_langfuse().get_prompt(
+                    name, label=self.label, cache_ttl_seconds=0
+                )
+                self._prompts[name] = RegisteredPrompt(
+                    value=prompt.prompt, version=prompt.version
+                )
+            except Exception as e:
+                metrics.increment("prompt_refresh_failures")
+                logger.warning(f"Failed to refresh prompt '{name}': {e}")
+
+    async def refresh(self):
+        await asyncio.to_thread(self._refresh_sync)
+        logger.info(f"Prompt registry refreshed: {self.versions()}")
+
+    async def _refresh_loop(self):
+        while True:
+            jitter = random.uniform(-self.jitter_ratio, self.jitter_ratio)
+            await asyncio.sleep(self.refresh_seconds * (1 + jitter))
+            await self.refresh()
+
+    async def start(self):
+        await self.refresh()
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+
+prompt_registry = PromptRegistry(
+    fallbacks={
+        "max-words-per-speech-dimension": FALLBACK_MAX_WORDS_PER_SPEECH_DIMENSION,
+        "include-coaching-recommendations": FALLBACK_INCLUDE_COACHING_RECOMMENDATIONS,
+    },
+    label="production",
+    refresh_seconds=settings.prompt_refresh_seconds,
+)
@@ -0,0 +1,47 @@
+def get_recording_match_label(score: int, titles: dict[str, str]) -> str:
+    if score >= 100:
+        return f"✅ {titles['yes']}"
+    if score > 0:
+        return f"⚠️ {titles['partially']}"
+    return f"❌ {titles['no']}"
+
+
+def _table_cell(text: str) -> str:
+    # Keeps free text on one table row
+    return " ".join(text.replace("|", "\\|").split())
+
+
+def render_key_element_table(
+    scores: dict[str, int],
+    matching_keywords: dict[str, list[str]],
+    titles: dict[str, str],
+    coaching_recommendations: dict[str, str] | None = None,
+) -> str:
+    """
+    The content assessment section of the feedback: one row per key element
+    with its keywords (matched ones in bold), whether the recording covers
+    it and its score, plus a coaching column when recommendations are given.
+    """
+    columns = [
+        titles["key_elements_col"],
+        titles["recording_matches_col"],
+        titles["score_col"],
+    ]
+    if coaching_recommendations is not None:
+        columns.append(titles["coaching_col"])
+
+    rows = [
+        "| " + " | ".join(f"**{column}**" for column in columns) + " |",
+        "|" + "|".join("---" for _ in columns) + "|",
+    ]
+    for script, score in scores.items():
+        cells = [
+            "- " + " \\| ".join(matching_keywords.get(script, [])),
+            get_recording_match_label(score, titles),
+            f"{score}%",
+        ]
+        if coaching_recommendations is not None:
+            cells.append(_table_cell(coaching_recommendations.get(script, "")))
+        rows.append("| " + " | ".join(cells) + " |")
+
+    return f"## {titles['assessment_heading']}\n\n" + "\n".join(rows) + "\n"
@@ -0,0 +1,865 @@
+import asyncio
+import bisect
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, TypeVar
+
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.audio import decode_audio
+from faster_whisper.utils import download_model
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+from loguru import logger
+
+from ai_feedback.audio import WHISPER_SAMPLE_RATE
+from ai_feedback.cache import LRUCache, SQLiteCache, TieredCache, make_cache_key
+from ai_feedback.config import settings
+from ai_feedback.metrics import metrics
+from ai_feedback.models import SupportedLanguage, Transcript, TranscriptSegment
+
+# Options passed to WhisperModel.transcribe, by profile name (see
+# DecodeProfile); part of the transcript cache key. Keyword matching only
+# needs the text, so the faster profiles drop timestamps and beam search.
+DECODE_PROFILES: dict[str, dict[str, Any]] = {
+    "fast": {
+        "beam_size": 1,
+        "without_timestamps": True,
+        "condition_on_previous_text": False,
+        "temperature": 0.0,
+        "vad_filter": True,
+    },
+    "balanced": {
+        "beam_size": 2,
+        "without_timestamps": True,
+        "condition_on_previous_text": False,
+        "temperature": [0.0, 0.4, 0.8],
+        "vad_filter": True,
+    },
+    # faster-whisper defaults
+    "accurate": {
+        "beam_size": 5,
+        "without_timestamps": False,
+        "condition_on_previous_text": True,
+        "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+        "vad_filter": False,
+    },
+}
+# Longest clip Whisper decodes in one window
+WHISPER_CHUNK_SECONDS = 30
+# Audio shared by neighbouring chunks when long recordings are split
+CHUNK_OVERLAP_SECONDS = 1.0
+
+LANGUAGE_TO_WHISPER_CODE = {
+    "english": "en",
+    "german": "de",
+    "dutch": "nl",
+    "french": "fr",
+    "malay": "ms",
+    "spanish": "es",
+    "polish": "pl",
+}
+
+
+T = TypeVar("T")
+
+
+class TranscriptionQueueFullError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class WhisperModelSpec:
+    model_size: str  # faster-whisper model name or local model directory
+    compute_type: str
+    decode_profile: str
+
+    @property
+    def model_key(self) -> tuple[str, str]:
+        return (self.model_size, self.compute_type)
+
+    def __str__(self) -> str:
+        return f"{self.model_size}/{self.compute_type}/{self.decode_profile}"
+
+
+def build_model_specs() -> tuple[WhisperModelSpec, dict[str, WhisperModelSpec]]:
+    """The default spec and the spec for every supported language, from settings."""
+    default = WhisperModelSpec(
+        model_size=settings.whisper_model_size,
+        compute_type=settings.whisper_compute_type,
+        decode_profile=settings.whisper_decode_profile,
+    )
+    specs = {}
+    for language in LANGUAGE_TO_WHISPER_CODE:
+        overrides = settings.whisper_language_models.get(language, {})
+        specs[language] = WhisperModelSpec(
+            model_size=overrides.get("model_size", default.model_size),
+            compute_type=overrides.get("compute_type", default.compute_type),
+            decode_profile=overrides.get("decode_profile", default.decode_profile),
+        )
+
+    for spec in [default, *specs.values()]:
+        if spec.decode_profile not in DECODE_PROFILES:
+            raise ValueError(
+                f"Unknown Whisper decode profile '{spec.decode_profile}', "
+                f"expected one of {list(DECODE_PROFILES)}"
+            )
+    return default, specs
+
+
+DEFAULT_MODEL_SPEC, MODEL_SPECS = build_model_specs()
+
+
+def get_model_spec(language: str) -> WhisperModelSpec:
+    return MODEL_SPECS.get(language.lower(), DEFAULT_MODEL_SPEC)
+
+
+def resolve_decode_profile(language: str, decode_profile: str | None) -> str:
+    """The requested profile, or the one configured for the language."""
+    return decode_profile or get_model_spec(language).decode_profile
+
+
+def _model_size_on_disk(model_path: str) -> int:
+    return sum(
+        entry.stat().st_size for entry in os.scandir(model_path) if entry.is_file()
+    )
+
+
+def _resident_memory_bytes() -> int | None:
+    """Resident set size of this process, None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+@dataclass
+class _LoadedModel:
+    model: WhisperModel
+    memory_bytes: int
+    in_use: int = 0
+
+
+class WhisperModelRegistry:
+    """
+    Whisper models loaded on demand, keyed by (model size, compute type).
+    Each model's memory is accounted as the growth of the process's resident
+    memory while it was loaded, which covers the compute type conversion
+    and the copies for all `num_workers` replicas. A model that has not been
+    loaded yet is estimated by its last measurement, or the size of its
+    weights on disk, as is every model where resident memory cannot be read.
+    Before loading another model, the least recently used idle models are
+    evicted until it fits under `memory_ceiling_bytes`. Models in use are
+    never evicted, so the ceiling can be exceeded while they are busy.
+    """
+
+    def __init__(self, cpu_threads: int, num_workers: int, memory_ceiling_bytes: int):
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.memory_ceiling_bytes = memory_ceiling_bytes
+        self._models: OrderedDict[tuple[str, str], _LoadedModel] = OrderedDict()
+        # Measured memory of models loaded before, kept across evictions
+        self._measured_bytes: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        # Serialises loads so a model is never loaded twice concurrently
+        self._load_lock = threading.Lock()
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(loaded.memory_bytes for loaded in self._models.values())
+
+    def _acquire_loaded(self, key: tuple[str, str]) -> WhisperModel | None:
+        with self._lock:
+            loaded = self._models.get(key)
+            if loaded is None:
+                return None
+            loaded.in_use += 1
+            self._models.move_to_end(key)
+            return loaded.model
+
+    def _evict_for(self, memory_bytes: int):
+        with self._lock:
+            for key, loaded in list(self._models.items()):
+                if self.memory_bytes + memory_bytes <= self.memory_ceiling_bytes:
+                    break
+                if loaded.in_use == 0:
+                    del self._models[key]
+                    metrics.increment("whisper_model_evictions")
+                    logger.info(f"Evicted Whisper model {key}")
+
+            if self.memory_bytes + memory_bytes > self.memory_ceiling_bytes:
+                logger.warning(
+                    f"Whisper models exceed the memory ceiling: "
+                    f"{(self.memory_bytes + memory_bytes) / 1e6:.0f} MB > "
+                    f"{self.memory_ceiling_bytes / 1e6:.0f} MB"
+                )
+
+    def acquire(self, spec: WhisperModelSpec) -> WhisperModel:
+        model = self._acquire_loaded(spec.model_key)
+        if model is not None:
+            return model
+
+        with self._load_lock:
+            model = self._acquire_loaded(spec.model_key)
+            if model is not None:
+                return model
+
+            t0 = time.time()
+            model_path = (
+                spec.model_size
+                if os.path.isdir(spec.model_size)
+                else download_model(spec.model_size)
+            )
+            disk_bytes = _model_size_on_disk(model_path)
+            self._evict_for(self._measured_bytes.get(spec.model_key, disk_bytes))
+            logger.info(f"Loading Whisper model {spec.model_key}...")
+            rss_before = _resident_memory_bytes()
+            model = WhisperModel(
+                model_path,
+                device="cpu",
+                compute_type=spec.compute_type,
+                cpu_threads=self.cpu_threads,
+                num_workers=self.num_workers,
+            )
+            rss_after = _resident_memory_bytes()
+            if rss_before is None or rss_after is None or rss_after <= rss_before:
+                memory_bytes = disk_bytes
+            else:
+                memory_bytes = rss_after - rss_before
+                self._measured_bytes[spec.model_key] = memory_bytes
+            with self._lock:
+                self._models[spec.model_key] = _LoadedModel(
+                    model=model, memory_bytes=memory_bytes, in_use=1
+                )
+                metrics.set_gauge("whisper_models_loaded", len(self._models))
+                metrics.set_gauge("whisper_model_memory_bytes", self.memory_bytes)
+            metrics.increment("whisper_model_loads")
+            logger.info(
+                f"Loaded Whisper model {spec.model_key} "
+                f"({memory_bytes / 1e6:.0f} MB resident, {disk_bytes / 1e6:.0f} MB "
+                f"on disk) in {time.time() - t0:.2f}s"
+            )
+            return model
+
+    def release(self, spec: WhisperModelSpec):
+        with self._lock:
+            loaded = self._models.get(spec.model_key)
+            if loaded is not None:
+                loaded.in_use -= 1
+            metrics.set_gauge("whisper_models_loaded", len(self._models))
+            metrics.set_gauge("whisper_model_memory_bytes", self.memory_bytes)
+
+    @contextmanager
+    def use(self, spec: WhisperModelSpec) -> Iterator[WhisperModel]:
+        model = self.acquire(spec)
+        try:
+            yield model
+        finally:
+            self.release(spec)
+
+
+def transcribe_with_model(
+    model: WhisperModel,
+    audio_source: np.ndarray | str,
+    language: str,
+    decode_options: dict[str, Any],
+) -> Transcript:
+    # audio_source is either 16 kHz mono samples (from get_feedback/legacy)
+    # or a file path (from get_feedback_from_video), decoded by faster-whisper
+    whisper_lang = LANGUAGE_TO_WHISPER_CODE.get(language.lower(), "en")
+    segments, _ = model.transcribe(
+        audio_source, language=whisper_lang, **decode_options
+    )
+    transcript_segments = [
+        TranscriptSegment(start=segment.start, end=segment.end, text=segment.text)
+        for segment in segments
+    ]
+    return Transcript(
+        text=" ".join([segment.text for segment in transcript_segments]),
+        segments=transcript_segments,
+    )
+
+
+def _merge_speech_ranges(
+    speech_timestamps: list[dict[str, int]], max_samples: int
+) -> list[tuple[int, int]]:
+    """Join consecutive VAD speech ranges into contiguous clips of at most `max_samples`."""
+    ranges: list[tuple[int, int]] = []
+    for timestamp in speech_timestamps:
+        if ranges and timestamp["end"] - ranges[-1][0] <= max_samples:
+            ranges[-1] = (ranges[-1][0], timestamp["end"])
+        else:
+            ranges.append((timestamp["start"], timestamp["end"]))
+    return ranges
+
+
+def transcribe_batch_with_model(
+    model: WhisperModel,
+    audio_sources: list[np.ndarray | str],
+    language: str,
+    decode_options: dict[str, Any],
+    batch_size: int,
+) -> list[Transcript]:
+    """
+    Transcribes several recordings with one batched inference call. The
+    recordings are laid end to end, split into speech clips of at most 30s
+    and decoded `batch_size` clips at a time; segments are then mapped back
+    to the recording they came from.
+    """
+    audios = [
+        (
+            decode_audio(source, sampling_rate=WHISPER_SAMPLE_RATE)
+            if isinstance(source, str)
+            else source
+        )
+        for source in audio_sources
+    ]
+    vad_options = VadOptions(
+        max_speech_duration_s=WHISPER_CHUNK_SECONDS, min_silence_duration_ms=160
+    )
+
+    clips = []
+    offsets = []
+    offset = 0
+    for audio in audios:
+        offsets.append(offset)
+        for start, end in _merge_speech_ranges(
+            get_speech_timestamps(audio, vad_options),
+            max_samples=WHISPER_CHUNK_SECONDS * WHISPER_SAMPLE_RATE,
+        ):
+            clips.append(
+                {
+                    "start": (offset + start) / WHISPER_SAMPLE_RATE,
+                    "end": (offset + end) / WHISPER_SAMPLE_RATE,
+                }
+            )
+        offset += len(audio)
+
+    transcript_segments: list[list[TranscriptSegment]] = [[] for _ in audios]
+    if clips:
+        whisper_lang = LANGUAGE_TO_WHISPER_CODE.get(language.lower(), "en")
+        segments, _ = BatchedInferencePipeline(model).transcribe(
+            np.concatenate(audios),
+            language=whisper_lang,
+            clip_timestamps=clips,
+            batch_size=batch_size,
+            **decode_options,
+        )
+        for segment in segments:
+            index = (
+                bisect.bisect_right(offsets, segment.start * WHISPER_SAMPLE_RATE) - 1
+            )
+            audio_offset = offsets[index] / WHISPER_SAMPLE_RATE
+            transcript_segments[index].append(
+                TranscriptSegment(
+                    start=segment.start - audio_offset,
+                    end=segment.end - audio_offset,
+                    text=segment.text,
+                )
+            )
+
+    return [
+        Transcript(
+            text=" ".join([segment.text for segment in segments]),
+            segments=segments,
+        )
+        for segments in transcript_segments
+    ]
+
+
+def _run_with_model(
+    registry: WhisperModelRegistry,
+    spec: WhisperModelSpec,
+    func: Callable[..., T],
+    *args: Any,
+) -> T:
+    with registry.use(spec) as model:
+        return func(model, *args)
+
+
+# Models owned by a worker process when the pool runs in "process" mode
+_process_registry: WhisperModelRegistry | None = None
+
+
+def _init_process_worker(cpu_threads: int, memory_ceiling_bytes: int):
+    global _process_registry
+    _process_registry = WhisperModelRegistry(
+        cpu_threads=cpu_threads,
+        num_workers=1,
+        memory_ceiling_bytes=memory_ceiling_bytes,
+    )
+
+
+def _load_model(model: WhisperModel) -> bool:
+    return True
+
+
+def _call_in_process(spec: WhisperModelSpec, func: Callable[..., T], *args: Any) -> T:
+    assert _process_registry is not None
+    return _run_with_model(_process_registry, spec, func, *args)
+
+
+class WhisperPool:
+    """
+    Runs Whisper transcriptions on a fixed number of model replicas, each
+    with an explicit CTranslate2 thread budget, so concurrent requests queue
+    for a replica instead of oversubscribing the cores.
+
+    In "thread" mode every model (see WhisperModelRegistry) has `replicas`
+    CTranslate2 workers and is shared by as many threads; in "process" mode
+    every worker process keeps its own registry, and the memory ceiling
+    applies per process. At most `max_queue` jobs may wait for a replica,
+    further jobs fail fast with TranscriptionQueueFullError.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        replicas: int,
+        cpu_threads: int,
+        max_queue: int,
+        memory_ceiling_bytes: int,
+    ):
+        self.mode = mode
+        self.replicas = replicas
+        self.cpu_threads = cpu_threads
+        self.max_queue = max_queue
+        self.memory_ceiling_bytes = memory_ceiling_bytes
+        self._semaphore = asyncio.Semaphore(replicas)
+        self._waiting = 0
+        self.registry = WhisperModelRegistry(
+            cpu_threads=cpu_threads,
+            num_workers=replicas,
+            memory_ceiling_bytes=memory_ceiling_bytes,
+        )
+        self._executor: Executor | None = None
+        self._start_lock = threading.Lock()
+
+    def _start_sync(self) -> Executor:
+        with self._start_lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.replicas,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_process_worker,
+                        initargs=(self.cpu_threads, self.memory_ceiling_bytes),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.replicas, thread_name_prefix="whisper"
+                    )
+            return self._executor
+
+    async def start(self):
+        """
+        Loads the default model ahead of the first transcription; otherwise
+        models are loaded on first use.
+        """
+        executor = await asyncio.to_thread(self._start_sync)
+        loop = asyncio.get_running_loop()
+        if self.mode == "process":
+            # Worker processes are spawned, and load their model, on demand
+            await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        executor, _call_in_process, DEFAULT_MODEL_SPEC, _load_model
+                    )
+                    for _ in range(self.replicas)
+                ]
+            )
+        else:
+            await loop.run_in_executor(
+                executor, self.registry.acquire, DEFAULT_MODEL_SPEC
+            )
+            self.registry.release(DEFAULT_MODEL_SPEC)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(
+        self, spec: WhisperModelSpec, func: Callable[..., T], *args: Any
+    ) -> T:
+        """Runs `func(model, *args)` with the model for `spec` on a free replica."""
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            metrics.increment("transcription_rejected")
+            raise TranscriptionQueueFullError(
+                f"Transcription queue is full ({self.max_queue} waiting)"
+            )
+
+        t0 = time.time()
+        self._waiting += 1
+        metrics.set_gauge("transcription_queue_depth", self._waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+            metrics.set_gauge("transcription_queue_depth", self._waiting)
+        metrics.observe("transcription_queue_wait", time.time() - t0)
+
+        t0 = time.time()
+        try:
+            executor = self._executor or await asyncio.to_thread(self._start_sync)
+            loop = asyncio.get_running_loop()
+            if self.mode == "process":
+                return await loop.run_in_executor(
+                    executor, _call_in_process, spec, func, *args
+                )
+            return await loop.run_in_executor(
+                executor, _run_with_model, self.registry, spec, func, *args
+            )
+        finally:
+            metrics.observe("transcription_compute", time.time() - t0)
+            self._semaphore.release()
+
+    async def transcribe(
+        self,
+        audio_source: np.ndarray | str,
+        language: str,
+        decode_profile: str | None = None,
+    ) -> Transcript:
+        return await self.run(
+            get_model_spec(language),
+            transcribe_with_model,
+            audio_source,
+            language,
+            DECODE_PROFILES[resolve_decode_profile(language, decode_profile)],
+        )
+
+    async def transcribe_batch(
+        self,
+        audio_sources: list[np.ndarray | str],
+        language: str,
+        batch_size: int,
+        decode_profile: str | None = None,
+    ) -> list[Transcript]:
+        return await self.run(
+            get_model_spec(language),
+            transcribe_batch_with_model,
+            audio_sources,
+            language,
+            DECODE_PROFILES[resolve_decode_profile(language, decode_profile)],
+            batch_size,
+        )
+
+
+@dataclass
+class _PendingTranscription:
+    audio_source: np.ndarray | str
+    future: asyncio.Future
+
+
+class WhisperBatcher:
+    """
+    Micro-batching front-end to a WhisperPool. Requests for the same
+    language and decode profile that arrive within `window_seconds` of the first one (or until
+    `max_batch_size` are waiting) are transcribed together in one batched
+    inference call, and each caller gets its own transcript back.
+    """
+
+    def __init__(self, pool: WhisperPool, window_seconds: float, max_batch_size: int):
+        self.pool = pool
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: dict[tuple[str, str], list[_PendingTranscription]] = {}
+        self._flush_handles: dict[tuple[str, str], asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def transcribe(
+        self,
+        audio_source: np.ndarray | str,
+        language: str,
+        decode_profile: str | None = None,
+    ) -> Transcript:
+        loop = asyncio.get_running_loop()
+        pending = _PendingTranscription(audio_source, loop.create_future())
+        batch_key = (language, resolve_decode_profile(language, decode_profile))
+        batch = self._pending.setdefault(batch_key, [])
+        batch.append(pending)
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(batch_key)
+        elif batch_key not in self._flush_handles:
+            self._flush_handles[batch_key] = loop.call_later(
+                self.window_seconds, self._flush, batch_key
+            )
+        return await pending.future
+
+    def _flush(self, batch_key: tuple[str, str]):
+        handle = self._flush_handles.pop(batch_key, None)
+        if handle is not None:
+            handle.cancel()
+        batch = [
+            pending
+            for pending in self._pending.pop(batch_key, [])
+            if not pending.future.done()
+        ]
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run_batch(batch, *batch_key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(
+        self, batch: list[_PendingTranscription], language: str, decode_profile: str
+    ):
+        metrics.increment("transcription_batches")
+        metrics.increment("transcription_batched_requests", len(batch))
+        try:
+            transcripts = await self.pool.transcribe_batch(
+                [pending.audio_source for pending in batch],
+                language,
+                batch_size=self.max_batch_size,
+                decode_profile=decode_profile,
+            )
+        except Exception as e:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        for pending, transcript in zip(batch, transcripts):
+            if not pending.future.done():
+                pending.future.set_result(transcript)
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    """Sample range to transcribe, and the core range whose segments are kept."""
+
+    start: int
+    end: int
+    core_start: int
+    core_end: int
+
+
+def plan_chunks(samples: np.ndarray, n_chunks: int) -> list[AudioChunk]:
+    """
+    Splits a recording into `n_chunks` of similar length, cutting in the
+    middle of the silence gap closest to each even split point. Chunks
+    overlap by CHUNK_OVERLAP_SECONDS so speech cut at a boundary (when no
+    gap is near) is transcribed in full by at least one chunk.
+    """
+    speech = get_speech_timestamps(samples, VadOptions(min_silence_duration_ms=300))
+    gap_midpoints = [
+        (previous["end"] + current["start"]) // 2
+        for previous, current in zip(speech, speech[1:])
+    ]
+
+    chunk_length = len(samples) / n_chunks
+    boundaries = [0]
+    for i in range(1, n_chunks):
+        target = int(i * chunk_length)
+        # Only consider gaps within a quarter chunk of the even split point
+        nearby = [
+            midpoint
+            for midpoint in gap_midpoints
+            if abs(midpoint - target) <= chunk_length / 4 and midpoint > boundaries[-1]
+        ]
+        boundaries.append(
+            min(nearby, key=lambda midpoint: abs(midpoint - target))
+            if nearby
+            else target
+        )
+    boundaries.append(len(samples))
+
+    overlap = int(CHUNK_OVERLAP_SECONDS * WHISPER_SAMPLE_RATE)
+    return [
+        AudioChunk(
+            start=max(0, core_start - overlap),
+            end=min(len(samples), core_end + overlap),
+            core_start=core_start,
+            core_end=core_end,
+        )
+        for core_start, core_end in zip(boundaries, boundaries[1:])
+    ]
+
+
+def _words(text: str) -> list[str]:
+    return [word.strip(".,!?;:\"'").lower() for word in text.split()]
+
+
+def _drop_repeated_prefix(previous_text: str, text: str, max_words: int = 8) -> str:
+    """Removes words at the start of `text` that repeat the end of `previous_text`."""
+    previous_words = _words(previous_text)
+    words = text.split()
+    normalized = _words(text)
+    for n in range(min(max_words, len(previous_words), len(words)), 0, -1):
+        if previous_words[-n:] == normalized[:n]:
+            return " " + " ".join(words[n:]) if n < len(words) else ""
+    return text
+
+
+def stitch_transcripts(
+    chunks: list[AudioChunk], transcripts: list[Transcript]
+) -> Transcript:
+    """
+    Joins chunk transcripts in order. Segments lying entirely in a chunk's
+    overlap belong to its neighbour and are dropped; words repeated across
+    a boundary are removed from the start of the later chunk.
+    """
+    segments: list[TranscriptSegment] = []
+    for chunk, transcript in zip(chunks, transcripts):
+        chunk_offset = chunk.start / WHISPER_SAMPLE_RATE
+        core_start = chunk.core_start / WHISPER_SAMPLE_RATE
+        core_end = chunk.core_end / WHISPER_SAMPLE_RATE
+        first_in_chunk = True
+        for segment in transcript.segments:
+            start = segment.start + chunk_offset
+            end = segment.end + chunk_offset
+            if end <= core_start or start >= core_end:
+                continue
+            text = segment.text
+            if first_in_chunk and segments:
+                text = _drop_repeated_prefix(segments[-1].text, text)
+            first_in_chunk = False
+            if text.strip():
+                segments.append(TranscriptSegment(start=start, end=end, text=text))
+
+    return Transcript(
+        text=" ".join([segment.text for segment in segments]), segments=segments
+    )
+
+
+async def transcribe_long_recording(
+    pool: WhisperPool,
+    samples: np.ndarray,
+    language: str,
+    decode_profile: str | None,
+    n_chunks: int,
+) -> Transcript:
+    """
+    Transcribes a long recording with `n_chunks`-way parallelism. A pool
+    with several replicas gets one overlapping chunk per job, stitched back
+    in order. With a single replica the whole recording goes to one batched
+    inference call, which already splits it into speech clips of at most 30s
+    and decodes `n_chunks` of them at a time; chunking it first would only
+    transcribe the overlaps twice.
+    """
+    if pool.replicas == 1:
+        (transcript,) = await pool.transcribe_batch(
+            [samples], language, batch_size=n_chunks, decode_profile=decode_profile
+        )
+        metrics.increment("transcription_batched_long")
+        return transcript
+
+    chunks = await asyncio.to_thread(plan_chunks, samples, n_chunks)
+    transcripts = await asyncio.gather(
+        *[
+            pool.transcribe(samples[chunk.start : chunk.end], language, decode_profile)
+            for chunk in chunks
+        ]
+    )
+    metrics.increment("transcription_chunked")
+    return stitch_transcripts(chunks, transcripts)
+
+
+whisper_pool = WhisperPool(
+    mode=settings.whisper_executor,
+    replicas=settings.whisper_replicas,
+    cpu_threads=(
+        settings.whisper_cpu_threads
+        or max(1, (os.cpu_count() or 1) // settings.whisper_replicas)
+    ),
+    max_queue=settings.whisper_max_queue,
+    memory_ceiling_bytes=settings.whisper_memory_ceiling_mb * 1024 * 1024,
+)
+
+whisper_batcher = (
+    WhisperBatcher(
+        whisper_pool,
+        window_seconds=settings.whisper_batch_window_ms / 1000,
+        max_batch_size=settings.whisper_max_batch_size,
+    )
+    if settings.whisper_batching_enabled
+    else None
+)
+
+transcript_cache = TieredCache(
+    "transcript",
+    memory=LRUCache(max_entries=256, ttl_seconds=float("inf")),
+    disk=SQLiteCache(
+        settings.transcript_cache_path,
+        max_entries=settings.transcript_cache_max_entries,
+    ),
+)
+
+
+def _fingerprint_audio_source(audio_source: np.ndarray | str) -> str:
+    digest = hashlib.blake2b(digest_size=32)
+    if isinstance(audio_source, np.ndarray):
+        digest.update(np.ascontiguousarray(audio_source).tobytes())
+    else:
+        with open(audio_source, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_chunk_count(audio_source: np.ndarray | str) -> int:
+    """
+    How many ways to parallelise the transcription of a recording; 1 means
+    not at all. Only decoded audio is split: recordings passed as a path,
+    such as the video of /feedback_video, are transcribed as a single job.
+    """
+    if (
+        not isinstance(audio_source, np.ndarray)
+        or settings.whisper_chunking_threshold_seconds is None
+        or len(audio_source) / WHISPER_SAMPLE_RATE
+        <= settings.whisper_chunking_threshold_seconds
+    ):
+        return 1
+    return max(1, settings.whisper_chunk_count)
+
+
+async def get_fast_transcription(
+    audio_source: np.ndarray | str,
+    language: str = SupportedLanguage.ENGLISH.value,
+    decode_profile: str | None = None,
+) -> Transcript:
+    n_chunks = get_chunk_count(audio_source)
+    cache_key = None
+    if settings.transcript_cache_enabled:
+        audio_hash = await asyncio.to_thread(_fingerprint_audio_source, audio_source)
+        spec = get_model_spec(language)
+        cache_key = make_cache_key(
+            audio_hash,
+            spec.model_size,
+            spec.compute_type,
+            LANGUAGE_TO_WHISPER_CODE.get(language.lower(), "en"),
+            DECODE_PROFILES[resolve_decode_profile(language, decode_profile)],
+            # Batched decoding splits audio on VAD clips and yields different text
+            whisper_batcher is not None,
+            n_chunks,
+        )
+        cached = await transcript_cache.get(cache_key)
+        if cached is not None:
+            return Transcript.model_validate(cached)
+
+    if n_chunks > 1:
+        assert isinstance(audio_source, np.ndarray)
+        transcript = await transcribe_long_recording(
+            whisper_pool, audio_source, language, decode_profile, n_chunks
+        )
+    elif whisper_batcher is not None:
+        transcript = await whisper_batcher.transcribe(
+            audio_source, language, decode_profile
+        )
+    else:
+        transcript = await whisper_pool.transcribe(
+            audio_source, language, decode_profile
+        )
+    if cache_key is not None:
+        await transcript_cache.set(cache_key, transcript.model_dump())
+    return transcript
@@ -0,0 +1,91 @@
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from fastapi import UploadFile
+from loguru import logger
+
+from ai_feedback.config import settings
+
+
+class UploadTooLargeError(Exception):
+    def __init__(self, max_size_bytes: int):
+        super().__init__(f"Upload exceeds the maximum size of {max_size_bytes} bytes")
+        self.max_size_bytes = max_size_bytes
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    size_bytes: int
+    elapsed_seconds: float
+
+    @property
+    def megabytes_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.size_bytes / 1_000_000 / self.elapsed_seconds
+
+    def timing_log(self) -> str:
+        return (
+            f"video_ingest: {self.elapsed_seconds:.2f}s "
+            f"({self.size_bytes / 1_000_000:.1f} MB @ {self.megabytes_per_second:.1f} MB/s)"
+        )
+
+
+def _hash_file_sync(file: BinaryIO, chunk_size: int) -> str:
+    digest = hashlib.blake2b(digest_size=32)
+    file.seek(0)
+    try:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    finally:
+        file.seek(0)
+    return digest.hexdigest()
+
+
+async def hash_upload(upload: UploadFile) -> str:
+    """Content hash of an upload; the upload is rewound afterwards."""
+    return await asyncio.to_thread(
+        _hash_file_sync, upload.file, settings.upload_chunk_size_bytes
+    )
+
+
+def remove_if_exists(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+async def spool_upload_to_disk(upload: UploadFile) -> SpooledUpload:
+    """
+    Stream an uploaded file to a per-request scratch file chunk by chunk.
+    Blocking file I/O is offloaded to a worker thread so the event loop keeps
+    serving other requests, and at most one chunk is held in memory.
+    """
+    t0 = time.time()
+    filename = os.path.basename(upload.filename or "upload")
+    path = os.path.join(settings.upload_scratch_dir, f"{uuid.uuid4()}_{filename}")
+
+    size_bytes = 0
+    f = await asyncio.to_thread(open, path, "wb")
+    try:
+        while chunk := await upload.read(settings.upload_chunk_size_bytes):
+            size_bytes += len(chunk)
+            if size_bytes > settings.max_upload_size_bytes:
+                raise UploadTooLargeError(settings.max_upload_size_bytes)
+            await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(remove_if_exists, path)
+        raise
+    await asyncio.to_thread(f.close)
+
+    spooled = SpooledUpload(
+        path=path, size_bytes=size_bytes, elapsed_seconds=time.time() - t0
+    )
+    logger.info(f"Spooled upload to {path}: {spooled.timing_log()}")
+    return spooled
@@ -1,9 +1,26 @@
-import uuid
-import subprocess
+from functools import cache
+from typing import TYPE_CHECKING
 from uuid import uuid4
-from langfuse import Langfuse
 
-lf = Langfuse()
+if TYPE_CHECKING:
+    from langfuse import Langfuse
+
+
+@cache
+def get_langfuse() -> "Langfuse":
+    # Imported on first use to keep the SDK out of the import path of the app
+    from langfuse import Langfuse
+
+    return Langfuse()
+
+
+# A feedback session logs its traces in this order
+FEEDBACK_INPUT_TRACE = 1
+FEEDBACK_OUTPUT_TRACE = 3
+
+
+class UnknownSessionError(Exception):
+    pass
 
 
 def read_audio(audio_filename: str) -> bytes:
@@ -11,15 +28,6 @@ def read_audio(audio_filename: str) -> bytes:
         return f.read()
 
 
-def convert_video_to_audio(video_filename: str) -> str:
-    audio_filename = video_filename.rsplit(".", 1)[0] + str(uuid.uuid4()) + ".mp3"
-    subprocess.run(
-        ["ffmpeg", "-i", video_filename, "-q:a", "0", "-map", "a", audio_filename],
-        check=True,
-    )
-    return audio_filename
-
-
 def generate_session_id() -> str:
     return str(uuid4())
 
@@ -32,7 +40,7 @@ def langfuse_log(
     user_id: str | None,
     tags: list[str] | None,
 ) -> str:
-    trace = lf.trace(
+    trace = get_langfuse().trace(
         session_id=session_id,
         name=trace_name,
         output=message,
@@ -42,11 +50,20 @@ def langfuse_log(
     return trace.trace_id
 
 
+def fetch_session_traces(session_id: str) -> list:
+    traces = get_langfuse().fetch_traces(
+        session_id=session_id, order_by="timestamp.asc"
+    )
+    if len(traces.data) <= FEEDBACK_OUTPUT_TRACE:
+        raise UnknownSessionError(f"No feedback traces for session '{session_id}'")
+    return traces.data
+
+
 def langfuse_user_like(session_id: str, positive_feedback: bool):
-    traces = lf.fetch_traces(session_id=session_id, order_by="timestamp.asc")
-    output_trace_id = str(traces.data[3].id)
+    traces = fetch_session_traces(session_id)
+    output_trace_id = str(traces[FEEDBACK_OUTPUT_TRACE].id)
 
-    lf.score(
+    get_langfuse().score(
         trace_id=output_trace_id,
         name="User Opinion",
         data_type="CATEGORICAL",
@@ -55,8 +72,10 @@ def langfuse_user_like(session_id: str, positive_feedback: bool):
 
 
 def fetch_feedback_input_output(session_id: str) -> tuple[str, str]:
-    traces = lf.fetch_traces(session_id=session_id, order_by="timestamp.asc")
-    ai_input = str(traces.data[1].input["messages"][1]["content"])  # pyright: ignore
-    ai_feedback = str(traces.data[3].output)
+    traces = fetch_session_traces(session_id)
+    ai_input = str(
+        traces[FEEDBACK_INPUT_TRACE].input["messages"][1]["content"]  # pyright: ignore
+    )
+    ai_feedback = str(traces[FEEDBACK_OUTPUT_TRACE].output)
 
     return ai_input, ai_feedback
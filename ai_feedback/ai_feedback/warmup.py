@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import numpy as np
+from loguru import logger
+
+from ai_feedback.ai import VIDEO_ANALYSIS_MODEL, get_genai_client, get_openai_client
+from ai_feedback.audio import WHISPER_SAMPLE_RATE
+from ai_feedback.metrics import metrics
+from ai_feedback.prompt_registry import prompt_registry
+from ai_feedback.transcription import whisper_pool
+
+WARM_UP_AUDIO_SECONDS = 1
+# Retries of a failed Whisper warm-up, with exponential backoff
+WHISPER_RETRY_INITIAL_SECONDS = 1
+WHISPER_RETRY_BACKOFF_FACTOR = 2
+WHISPER_RETRY_MAX_SECONDS = 60
+
+
+class WarmUp:
+    """
+    Pays the first-request costs once, before the pod receives traffic:
+    a dummy transcription on every Whisper replica and TLS connections to
+    the LLM endpoints. The app is ready once Whisper is warm, which is
+    retried until it succeeds; pre-connecting is best effort. Prompts do not
+    gate readiness since the registry serves local fallbacks until Langfuse
+    answers, but the status reports which ones are in use.
+    """
+
+    def __init__(self):
+        self.checks = {"whisper": False, "llm_connections": False}
+        self.duration_seconds: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.checks["whisper"]
+
+    def status(self) -> dict:
+        return {
+            "ready": self.is_ready,
+            "checks": self.checks,
+            # Langfuse version of each prompt, or "fallback"
+            "prompts": prompt_registry.versions(),
+            "warm_up_seconds": self.duration_seconds,
+        }
+
+    async def _warm_up_whisper(self):
+        silence = np.zeros(WARM_UP_AUDIO_SECONDS * WHISPER_SAMPLE_RATE, np.float32)
+        await asyncio.gather(
+            *[
+                whisper_pool.transcribe(silence, "english")
+                for _ in range(whisper_pool.replicas)
+            ]
+        )
+        self.checks["whisper"] = True
+
+    async def _warm_up_whisper_with_retries(self):
+        delay = WHISPER_RETRY_INITIAL_SECONDS
+        while True:
+            try:
+                await self._warm_up_whisper()
+                return
+            except Exception as e:
+                metrics.increment("warm_up_failures")
+                logger.warning(
+                    f"Warm-up of whisper failed, retrying in {delay:.0f}s: {e}"
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * WHISPER_RETRY_BACKOFF_FACTOR, WHISPER_RETRY_MAX_SECONDS)
+
+    async def _warm_up_llm_connections(self):
+        await asyncio.gather(
+            get_openai_client().models.list(),
+            get_genai_client().aio.models.get(model=VIDEO_ANALYSIS_MODEL),
+        )
+        self.checks["llm_connections"] = True
+
+    async def run(self):
+        t0 = time.time()
+        _, llm_result = await asyncio.gather(
+            self._warm_up_whisper_with_retries(),
+            self._warm_up_llm_connections(),
+            return_exceptions=True,
+        )
+        if isinstance(llm_result, Exception):
+            metrics.increment("warm_up_failures")
+            logger.warning(f"Warm-up of llm_connections failed: {llm_result}")
+
+        self.duration_seconds = time.time() - t0
+        metrics.observe("warm_up", self.duration_seconds)
+        logger.info(f"Warm-up finished in {self.duration_seconds:.2f}s: {self.checks}")
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+warm_up = WarmUp()
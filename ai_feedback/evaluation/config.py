@@ -2,6 +2,7 @@
 Configuration for the evaluation pipeline.
 """
 
+import os
 from pathlib import Path
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -10,6 +11,13 @@ from pydantic_settings import BaseSettings
 _ENV_FILE = Path(__file__).parent.parent / ".env"
 load_dotenv(_ENV_FILE, override=False)
 
+# Keep Whisper transcripts between evaluation runs so unchanged videos are
+# not transcribed again (read by ai_feedback.config.Settings)
+os.environ.setdefault(
+    "TRANSCRIPT_CACHE_PATH",
+    str(Path(__file__).parent / ".cache" / "transcripts.sqlite3"),
+)
+
 
 class Settings(BaseSettings):
     # Shared credentials (same vars as main app)
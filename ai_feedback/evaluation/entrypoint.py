@@ -40,8 +40,8 @@ from evaluation.evaluator import FeedbackEvaluator
 @click.option(
     "--language",
     type=str,
-    default="English",
-    help="Language for feedback generation (default: English)",
+    default="english",
+    help="Language for feedback generation (default: english)",
 )
 @click.option(
     "--api-url",
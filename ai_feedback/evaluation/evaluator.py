@@ -17,11 +17,13 @@ from typing import Dict, Any, List, Optional
 from langfuse import Langfuse
 from loguru import logger
 
-from ai_feedback.ai import get_feedback_from_video
-from ai_feedback.constants.prompts import VIDEO_ANALYSIS_PROMPT, SPEECH_ANALYSIS_SKIPPED
-from ai_feedback.models import ScriptDetails
+# Sets the evaluation defaults of ai_feedback settings, so it has to be
+# imported before any ai_feedback module
 from evaluation import config
 from evaluation.config import SIMILARITY_THRESHOLD
+from ai_feedback.ai import get_feedback_from_video
+from ai_feedback.constants.prompts import VIDEO_ANALYSIS_PROMPT, SPEECH_ANALYSIS_SKIPPED
+from ai_feedback.models import ScriptDetails, SupportedLanguage
 from evaluation.extractor import (
     extract_style_coaching,
     extract_style_coaching_by_category,
@@ -192,7 +194,7 @@ class FeedbackEvaluator:
             video_path: str,
             payload: Dict[str, Any],
             reference_answer: Dict[str, str],
-            language: str = "English",
+            language: str = SupportedLanguage.ENGLISH.value,
     ) -> EvaluationResult:
         """Evaluate a single test case and return the result.
 
@@ -303,7 +305,7 @@ class FeedbackEvaluator:
             video_path: str,
             payload: Dict[str, Any],
             reference_answer: Dict[str, str],
-            language: str = "English",
+            language: str = SupportedLanguage.ENGLISH.value,
     ) -> EvaluationResult:
         """Evaluate one test case, linking the trace to the Langfuse dataset run.
 
@@ -405,7 +407,7 @@ class FeedbackEvaluator:
         return result
 
     async def evaluate_set(
-            self, test_set: str, language: str = "English"
+            self, test_set: str, language: str = SupportedLanguage.ENGLISH.value
     ) -> List[EvaluationResult]:
         """Evaluate all test cases in a test set."""
         results = []
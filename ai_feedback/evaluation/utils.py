@@ -3,7 +3,10 @@ from pathlib import Path
 
 from loguru import logger
 
+# Sets the evaluation defaults of ai_feedback settings, so it has to be
+# imported before any ai_feedback module
 from evaluation import config
+from ai_feedback.prompt_registry import prompt_registry
 from evaluation.evaluator import FeedbackEvaluator, EvaluationResult
 
 
@@ -27,6 +30,9 @@ async def run_evaluations(
 ) -> list[EvaluationResult]:
     all_results = []
 
+    # The API loads Langfuse prompts at startup; do the same before evaluating
+    await prompt_registry.refresh()
+
     for ts in test_sets:
         logger.info(f"\n{'=' * 80}")
         logger.info(f"Evaluating test set: {ts}")
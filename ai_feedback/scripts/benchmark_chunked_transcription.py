@@ -0,0 +1,102 @@
+"""
+Benchmark parallel chunked transcription of long recordings against
+transcribing them as a single job. The audio of the videos in data/sets
+is concatenated until it is at least --min-seconds long.
+
+With several Whisper replicas the recording is split into
+WHISPER_CHUNK_COUNT chunks spread over the replicas; with a single replica
+it is decoded in one batched call, WHISPER_CHUNK_COUNT clips at a time. The
+gain depends on WHISPER_REPLICAS (and WHISPER_CPU_THREADS, which defaults
+to CPU cores / replicas).
+
+Usage:
+    WHISPER_REPLICAS=4 poetry run python ./scripts/benchmark_chunked_transcription.py \
+        [--min-seconds 300] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import difflib
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+from faster_whisper.audio import decode_audio
+
+load_dotenv(override=True)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_feedback.audio import WHISPER_SAMPLE_RATE
+from ai_feedback.config import settings
+from ai_feedback.transcription import transcribe_long_recording, whisper_pool
+
+SETS_DIR = Path(__file__).parent.parent / "data" / "sets"
+
+
+def build_long_recording(min_seconds: float) -> np.ndarray:
+    videos = sorted(p for p in SETS_DIR.glob("*/*.*") if p.is_file())
+    audios = [
+        decode_audio(str(path), sampling_rate=WHISPER_SAMPLE_RATE) for path in videos
+    ]
+    recording = []
+    duration = 0.0
+    while audios and duration < min_seconds:
+        for audio in audios:
+            recording.append(audio)
+            duration += len(audio) / WHISPER_SAMPLE_RATE
+    return np.concatenate(recording) if recording else np.zeros(0, np.float32)
+
+
+async def main(min_seconds: float, runs: int, language: str):
+    samples = build_long_recording(min_seconds)
+    if not len(samples):
+        print(f"No videos found in {SETS_DIR}")
+        return
+    duration = len(samples) / WHISPER_SAMPLE_RATE
+    print(
+        f"{duration:.0f}s recording, {whisper_pool.replicas} replica(s) x "
+        f"{whisper_pool.cpu_threads} threads"
+    )
+
+    # Load and warm up the model so neither mode is penalised
+    await whisper_pool.transcribe(samples[: 5 * WHISPER_SAMPLE_RATE], language)
+
+    modes = {
+        "single": lambda: whisper_pool.transcribe(samples, language),
+        f"chunked x{settings.whisper_chunk_count}": lambda: transcribe_long_recording(
+            whisper_pool, samples, language, None, settings.whisper_chunk_count
+        ),
+    }
+
+    results = {}
+    print(f"{'Mode':<12} {'Median s':>9} {'RTF':>6} {'Words':>6}")
+    for name, transcribe in modes.items():
+        durations = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            transcript = await transcribe()
+            durations.append(time.perf_counter() - t0)
+        results[name] = (statistics.median(durations), transcript.text.split())
+        print(
+            f"{name:<12} {results[name][0]:>9.2f} {results[name][0] / duration:>6.3f} "
+            f"{len(results[name][1]):>6}"
+        )
+
+    (single_time, single_words), (chunked_time, chunked_words) = results.values()
+    similarity = difflib.SequenceMatcher(None, single_words, chunked_words).ratio()
+    print(
+        f"\nSpeed-up: {single_time / chunked_time:.2f}x, "
+        f"word-level similarity to the single-job transcript: {similarity:.3f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-seconds", type=float, default=300)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--language", default="english")
+    args = parser.parse_args()
+    asyncio.run(main(args.min_seconds, args.runs, args.language))
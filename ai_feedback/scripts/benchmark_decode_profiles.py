@@ -0,0 +1,121 @@
+"""
+Compare the Whisper decode profiles on the videos in data/sets: real-time
+factor (transcription time / audio duration) and the keyword `accuracy`
+each profile's transcript gets, relative to the "accurate" profile.
+
+The accuracy comparison calls the keyword extraction LLM, so it needs the
+usual credentials; pass --skip-accuracy to only measure speed.
+
+Usage:
+    poetry run python ./scripts/benchmark_decode_profiles.py [--language english] [--skip-accuracy]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from faster_whisper.audio import decode_audio
+
+load_dotenv(override=True)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_feedback.ai import get_keyword_equivalents, get_scores_and_matching_keywords
+from ai_feedback.audio import WHISPER_SAMPLE_RATE
+from ai_feedback.models import DecodeProfile, ScriptDetails
+from ai_feedback.transcription import whisper_pool
+from ai_feedback.utils import generate_session_id
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+SETS_DIR = DATA_DIR / "sets"
+CHALLENGES_DIR = DATA_DIR / "challenges"
+REFERENCE_PROFILE = DecodeProfile.ACCURATE.value
+
+
+def load_script_details(video_path: Path) -> ScriptDetails | None:
+    # Videos are named after their challenge, as in the evaluation pipeline
+    payload_path = CHALLENGES_DIR / f"payload_{video_path.stem}.json"
+    if not payload_path.exists():
+        return None
+    with open(payload_path) as f:
+        payload = json.load(f)
+    return ScriptDetails(
+        question=payload.get("question", ""),
+        keyElements=payload.get("keyElements", []),
+        briefing=payload.get("briefing", ""),
+    )
+
+
+async def keyword_accuracy(
+    transcript: str, script_details: ScriptDetails, language: str
+) -> int:
+    keyword_equivalents = await get_keyword_equivalents(
+        transcript=transcript,
+        script_details=script_details,
+        session_id=generate_session_id(),
+        language=language,
+    )
+    scores, _ = get_scores_and_matching_keywords(keyword_equivalents)
+    return int(sum(scores.values()) / len(scores)) if scores else 0
+
+
+async def main(language: str, skip_accuracy: bool):
+    videos = sorted(p for p in SETS_DIR.glob("*/*.*") if p.is_file())
+    if not videos:
+        print(f"No videos found in {SETS_DIR}")
+        return
+
+    profiles = [profile.value for profile in DecodeProfile]
+    # Load and warm up the model so the first profile is not penalised
+    warm_up_audio = decode_audio(str(videos[0]), sampling_rate=WHISPER_SAMPLE_RATE)
+    await whisper_pool.transcribe(warm_up_audio, language, REFERENCE_PROFILE)
+
+    rtfs: dict[str, list[float]] = {profile: [] for profile in profiles}
+    deltas: dict[str, list[int]] = {profile: [] for profile in profiles}
+
+    print(f"{'Video':<20} {'Profile':<9} {'RTF':>6} {'Accuracy':>9} {'Delta':>6}")
+    for video_path in videos:
+        name = f"{video_path.parent.name}/{video_path.name}"
+        audio = decode_audio(str(video_path), sampling_rate=WHISPER_SAMPLE_RATE)
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        script_details = None if skip_accuracy else load_script_details(video_path)
+
+        accuracies = {}
+        for profile in [REFERENCE_PROFILE, *profiles]:
+            if profile in accuracies:
+                continue
+            t0 = time.perf_counter()
+            transcript = await whisper_pool.transcribe(audio, language, profile)
+            rtf = (time.perf_counter() - t0) / duration
+            rtfs[profile].append(rtf)
+
+            accuracy_column = f"{'-':>9} {'-':>6}"
+            if script_details is not None:
+                accuracies[profile] = await keyword_accuracy(
+                    transcript.text, script_details, language
+                )
+                delta = accuracies[profile] - accuracies[REFERENCE_PROFILE]
+                deltas[profile].append(delta)
+                accuracy_column = f"{accuracies[profile]:>9} {delta:>+6}"
+            else:
+                accuracies[profile] = None
+            print(f"{name:<20} {profile:<9} {rtf:>6.3f} {accuracy_column}")
+
+    print(f"\n{'Profile':<9} {'Median RTF':>11} {'Mean delta':>11}")
+    for profile in profiles:
+        mean_delta = (
+            f"{statistics.mean(deltas[profile]):>+11.1f}" if deltas[profile] else "-"
+        )
+        print(f"{profile:<9} {statistics.median(rtfs[profile]):>11.3f} {mean_delta:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--language", default="english")
+    parser.add_argument("--skip-accuracy", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.language, args.skip_accuracy))
@@ -0,0 +1,74 @@
+"""
+Benchmark the pipe-based and disk-backed audio extraction paths on the
+videos in data/sets.
+
+Usage:
+    poetry run python ./scripts/benchmark_extraction.py [--runs 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from fastapi import UploadFile
+
+load_dotenv(override=True)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_feedback.extraction import (
+    extract_audio_via_disk,
+    extract_audio_via_pipe,
+    plan_audio_extraction,
+    probe_audio_codec,
+)
+
+SETS_DIR = Path(__file__).parent.parent / "data" / "sets"
+
+
+async def time_extraction(video_path: Path, mode: str) -> tuple[float, int]:
+    with open(video_path, "rb") as f:
+        upload = UploadFile(f, filename=video_path.name)
+        t0 = time.perf_counter()
+        plan = plan_audio_extraction(await probe_audio_codec(upload))
+        if mode == "pipe":
+            audio = await extract_audio_via_pipe(upload, plan)
+        else:
+            audio = await extract_audio_via_disk(upload, plan, timing_logs=[])
+        return time.perf_counter() - t0, len(audio)
+
+
+async def main(runs: int):
+    videos = sorted(p for p in SETS_DIR.glob("*/*.*") if p.is_file())
+    if not videos:
+        print(f"No videos found in {SETS_DIR}")
+        return
+
+    print(f"{'Video':<20} {'Size MB':>8} {'Mode':<5} {'Median s':>9} {'Min s':>7} {'Audio KB':>9}")
+    for video_path in videos:
+        size_mb = video_path.stat().st_size / 1_000_000
+        for mode in ("disk", "pipe"):
+            durations = []
+            audio_size = 0
+            try:
+                for _ in range(runs):
+                    duration, audio_size = await time_extraction(video_path, mode)
+                    durations.append(duration)
+            except Exception as e:
+                print(f"{video_path.parent.name}/{video_path.name:<12} {mode:<5} failed: {e}")
+                continue
+            print(
+                f"{video_path.parent.name + '/' + video_path.name:<20} {size_mb:>8.1f} "
+                f"{mode:<5} {statistics.median(durations):>9.3f} "
+                f"{min(durations):>7.3f} {audio_size / 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
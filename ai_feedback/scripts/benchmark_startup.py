@@ -0,0 +1,104 @@
+"""
+Measure how long the API takes to import and to start (import plus the
+FastAPI lifespan: Whisper model, LLM clients and prompt registry), each
+in fresh interpreters, and list the slowest modules on the import path.
+
+Exits with status 1 when the median import time exceeds the budget, so
+it can guard against heavy work creeping back into import time.
+
+Usage:
+    poetry run python ./scripts/benchmark_startup.py [--runs 5] [--import-budget-seconds 1.5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+IMPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import ai_feedback.main
+print(time.perf_counter() - t0)
+"""
+
+STARTUP_SNIPPET = """
+import asyncio
+import time
+t0 = time.perf_counter()
+from ai_feedback.main import app
+
+async def main():
+    async with app.router.lifespan_context(app):
+        print(time.perf_counter() - t0)
+
+asyncio.run(main())
+"""
+
+# Loads .env the same way the app does under uvicorn
+PRELUDE = "from dotenv import load_dotenv; load_dotenv(override=True)\n"
+
+
+def time_snippet(snippet: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", PRELUDE + snippet],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> list[tuple[int, int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PRELUDE + "import ai_feedback.main"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        imports.append((int(self_us), int(cumulative_us), name.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main(runs: int, import_budget_seconds: float, top: int) -> int:
+    import_times = [time_snippet(IMPORT_SNIPPET) for _ in range(runs)]
+    startup_times = [time_snippet(STARTUP_SNIPPET) for _ in range(runs)]
+
+    print(f"{'Phase':<10} {'Median s':>9} {'Min s':>7} {'Max s':>7}")
+    for phase, durations in (("import", import_times), ("startup", startup_times)):
+        print(
+            f"{phase:<10} {statistics.median(durations):>9.3f} "
+            f"{min(durations):>7.3f} {max(durations):>7.3f}"
+        )
+
+    print("\nSlowest modules by self time on the import path:")
+    for self_us, cumulative_us, name in slowest_imports(top):
+        print(f"{self_us / 1000:>8.1f} ms  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    median_import = statistics.median(import_times)
+    if median_import > import_budget_seconds:
+        print(
+            f"\nImport time {median_import:.3f}s exceeds the "
+            f"{import_budget_seconds:.3f}s budget"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-seconds", type=float, default=1.5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.import_budget_seconds, args.top))
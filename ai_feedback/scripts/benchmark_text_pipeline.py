@@ -0,0 +1,92 @@
+"""
+Compare the text pipeline modes (TEXT_PIPELINE_MODE): the two-pass mode
+(keyword extraction, then text analysis) against the single-pass mode (one
+structured call). Reports the median latency and the mean LLM input and
+output tokens per request for each mode, on the transcripts of the videos
+in data/sets that have a challenge payload.
+
+Calls the LLMs, so it needs the usual credentials. The keyword cache is
+disabled so every run pays for its calls.
+
+Usage:
+    poetry run python ./scripts/benchmark_text_pipeline.py [--runs 3] [--language english]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from faster_whisper.audio import decode_audio
+
+load_dotenv(override=True)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_feedback.ai import process_text_feedback
+from ai_feedback.audio import WHISPER_SAMPLE_RATE
+from ai_feedback.config import settings
+from ai_feedback.metrics import metrics
+from ai_feedback.prompt_registry import prompt_registry
+from ai_feedback.transcription import whisper_pool
+from ai_feedback.utils import generate_session_id
+
+from benchmark_decode_profiles import SETS_DIR, load_script_details
+
+MODES = ["two_pass", "single_pass"]
+
+
+def token_counts() -> tuple[float, float]:
+    counters = metrics.snapshot()["counters"]
+    return (
+        sum(v for k, v in counters.items() if k.startswith("llm_input_tokens_")),
+        sum(v for k, v in counters.items() if k.startswith("llm_output_tokens_")),
+    )
+
+
+async def main(runs: int, language: str):
+    settings.keyword_cache_enabled = False
+    await prompt_registry.refresh()
+
+    samples = []
+    for video_path in sorted(p for p in SETS_DIR.glob("*/*.*") if p.is_file()):
+        script_details = load_script_details(video_path)
+        if script_details is None:
+            continue
+        audio = decode_audio(str(video_path), sampling_rate=WHISPER_SAMPLE_RATE)
+        transcript = await whisper_pool.transcribe(audio, language)
+        samples.append((video_path, transcript.text, script_details))
+    if not samples:
+        print(f"No videos with a challenge payload found in {SETS_DIR}")
+        return
+
+    print(f"{'Mode':<12} {'Median s':>9} {'Input tok':>10} {'Output tok':>11}")
+    for mode in MODES:
+        settings.text_pipeline_mode = mode
+        durations = []
+        input_tokens, output_tokens = [], []
+        for _ in range(runs):
+            for _, transcript, script_details in samples:
+                tokens_before = token_counts()
+                t0 = time.perf_counter()
+                await process_text_feedback(
+                    transcript, script_details, generate_session_id(), language, []
+                )
+                durations.append(time.perf_counter() - t0)
+                tokens_after = token_counts()
+                input_tokens.append(tokens_after[0] - tokens_before[0])
+                output_tokens.append(tokens_after[1] - tokens_before[1])
+        print(
+            f"{mode:<12} {statistics.median(durations):>9.2f} "
+            f"{statistics.mean(input_tokens):>10.0f} {statistics.mean(output_tokens):>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--language", default="english")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.language))
@@ -0,0 +1,103 @@
+"""
+Benchmark Whisper throughput and latency with and without cross-request
+micro-batching, using the audio of the videos in data/sets as requests.
+
+Every configuration gets `--requests` transcriptions submitted in waves
+of `--concurrency` simultaneous requests. The pool is configured through
+the usual WHISPER_* settings (replicas, threads, executor).
+
+Usage:
+    poetry run python ./scripts/benchmark_transcription.py \
+        [--requests 16] [--concurrency 8] [--windows 25,50,100] [--batch-sizes 4,8]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from faster_whisper.audio import decode_audio
+
+load_dotenv(override=True)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_feedback.audio import WHISPER_SAMPLE_RATE
+from ai_feedback.transcription import WhisperBatcher, whisper_pool
+
+SETS_DIR = Path(__file__).parent.parent / "data" / "sets"
+
+
+async def run_configuration(transcribe, audios, requests: int, concurrency: int):
+    latencies = []
+
+    async def timed(audio):
+        t0 = time.perf_counter()
+        await transcribe(audio, "english")
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for wave_start in range(0, requests, concurrency):
+        wave = range(wave_start, min(wave_start + concurrency, requests))
+        await asyncio.gather(*[timed(audios[i % len(audios)]) for i in wave])
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return requests / elapsed, statistics.median(latencies), p95
+
+
+async def main(args):
+    videos = sorted(p for p in SETS_DIR.glob("*/*.*") if p.is_file())
+    if not videos:
+        print(f"No videos found in {SETS_DIR}")
+        return
+    audios = [
+        decode_audio(str(path), sampling_rate=WHISPER_SAMPLE_RATE) for path in videos
+    ]
+    audio_seconds = sum(len(audio) for audio in audios) / WHISPER_SAMPLE_RATE
+    print(
+        f"{len(audios)} recordings, {audio_seconds:.0f}s of audio, "
+        f"{whisper_pool.replicas} replica(s) x {whisper_pool.cpu_threads} threads"
+    )
+
+    configurations = [("unbatched", whisper_pool.transcribe)]
+    for batch_size in args.batch_sizes:
+        for window_ms in args.windows:
+            batcher = WhisperBatcher(
+                whisper_pool,
+                window_seconds=window_ms / 1000,
+                max_batch_size=batch_size,
+            )
+            configurations.append(
+                (f"batch={batch_size} window={window_ms:g}ms", batcher.transcribe)
+            )
+
+    # Warm up the model so the first configuration is not penalised
+    await whisper_pool.transcribe(audios[0], "english")
+
+    print(f"{'Configuration':<28} {'Req/s':>7} {'p50 s':>7} {'p95 s':>7}")
+    for name, transcribe in configurations:
+        throughput, p50, p95 = await run_configuration(
+            transcribe, audios, args.requests, args.concurrency
+        )
+        print(f"{name:<28} {throughput:>7.2f} {p50:>7.2f} {p95:>7.2f}")
+
+
+def parse_list(value: str) -> list[float]:
+    return [float(item) for item in value.split(",") if item]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--windows", type=parse_list, default=[25, 50, 100])
+    parser.add_argument(
+        "--batch-sizes",
+        type=lambda value: [int(size) for size in parse_list(value)],
+        default=[4, 8],
+    )
+    asyncio.run(main(parser.parse_args()))
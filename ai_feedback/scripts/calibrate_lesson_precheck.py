@@ -0,0 +1,157 @@
+"""
+Calibrate the local lesson-match pre-check (LESSON_PRECHECK_OFF_TOPIC_THRESHOLD)
+on the videos in data/sets and data/demo_example. A recording counts as
+off-topic when its reference answer skipped the style assessment. Each
+on-topic transcript is also scored against the other challenges, which are
+reported separately: lessons of the same module are hard negatives the LLM
+may still accept.
+
+Reports each recording's score and the highest threshold that keeps every
+on-topic recording above it. Only needs Whisper, no LLM calls.
+
+Usage:
+    poetry run python ./scripts/calibrate_lesson_precheck.py [--language english]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from faster_whisper.audio import decode_audio
+
+load_dotenv(override=True)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_feedback.audio import WHISPER_SAMPLE_RATE
+from ai_feedback.challenge_registry import challenge_registry
+from ai_feedback.config import settings
+from ai_feedback.constants.prompts import SPEECH_ANALYSIS_SKIPPED
+from ai_feedback.lesson_match import score_lesson_match
+from ai_feedback.models import ScriptDetails
+from ai_feedback.transcription import whisper_pool
+
+from benchmark_decode_profiles import (
+    CHALLENGES_DIR,
+    DATA_DIR,
+    SETS_DIR,
+    load_script_details,
+)
+
+ANSWERS_DIR = DATA_DIR / "answers"
+DEMO_DIR = DATA_DIR / "demo_example"
+
+
+def is_off_topic(answer_path: Path) -> bool | None:
+    if not answer_path.exists():
+        return None
+    with open(answer_path) as f:
+        return SPEECH_ANALYSIS_SKIPPED in json.load(f).get("feedback", "")
+
+
+def load_samples() -> list[tuple[str, Path, ScriptDetails, bool]]:
+    samples = []
+    for video_path in sorted(p for p in SETS_DIR.glob("*/*.*") if p.is_file()):
+        script_details = load_script_details(video_path)
+        off_topic = is_off_topic(
+            ANSWERS_DIR / video_path.parent.name / f"{video_path.stem}.json"
+        )
+        if script_details is not None and off_topic is not None:
+            name = f"{video_path.parent.name}/{video_path.name}"
+            samples.append((name, video_path, script_details, off_topic))
+
+    demo_challenge = DEMO_DIR / "challenge.json"
+    if demo_challenge.exists():
+        with open(demo_challenge) as f:
+            script_details = ScriptDetails.model_validate(json.load(f))
+        for video_path in sorted((DEMO_DIR / "videos").glob("*.*")):
+            off_topic = is_off_topic(
+                DEMO_DIR / "responses" / f"{video_path.stem}.json"
+            )
+            if off_topic is not None:
+                name = f"demo/{video_path.name}"
+                samples.append((name, video_path, script_details, off_topic))
+    return samples
+
+
+def load_challenges() -> dict[str, ScriptDetails]:
+    challenges = {}
+    for payload_path in sorted(CHALLENGES_DIR.glob("payload_*.json")):
+        with open(payload_path) as f:
+            challenges[payload_path.stem] = ScriptDetails.model_validate(json.load(f))
+    return challenges
+
+
+async def score(transcript: str, script_details: ScriptDetails, language: str):
+    challenge = await challenge_registry.compile(script_details, language)
+    return score_lesson_match(challenge, transcript)
+
+
+async def main(language: str):
+    samples = load_samples()
+    if not samples:
+        print(f"No labelled videos found in {SETS_DIR} or {DEMO_DIR}")
+        return
+    challenges = load_challenges()
+
+    on_topic_scores, off_topic_scores, other_challenge_scores = [], [], []
+    print(
+        f"{'Recording':<52} {'Label':<10} {'Keywords':>9} {'Bigrams':>8} "
+        f"{'Words':>6} {'Score':>6}"
+    )
+    for name, video_path, script_details, off_topic in samples:
+        audio = decode_audio(str(video_path), sampling_rate=WHISPER_SAMPLE_RATE)
+        transcript = (await whisper_pool.transcribe(audio, language)).text
+
+        rows = [(name, "off-topic" if off_topic else "on-topic", script_details)]
+        if not off_topic:
+            rows += [
+                (f"{name} vs {challenge_name}", "other", other_details)
+                for challenge_name, other_details in challenges.items()
+                if other_details.keyElements != script_details.keyElements
+            ]
+        for row_name, label, details in rows:
+            lesson_match = await score(transcript, details, language)
+            if lesson_match is None:
+                print(f"{row_name:<52} {label:<10} cannot be scored locally")
+                continue
+            {
+                "on-topic": on_topic_scores,
+                "off-topic": off_topic_scores,
+                "other": other_challenge_scores,
+            }[label].append(lesson_match.score)
+            print(
+                f"{row_name:<52} {label:<10} {lesson_match.keyword_coverage:>9.2f} "
+                f"{lesson_match.ngram_overlap:>8.2f} "
+                f"{lesson_match.vocabulary_overlap:>6.2f} {lesson_match.score:>6.2f}"
+            )
+
+    threshold = settings.lesson_precheck_off_topic_threshold
+    print(f"\nConfigured threshold: {threshold:.2f}")
+    for label, scores in [
+        ("on-topic", on_topic_scores),
+        ("off-topic", off_topic_scores),
+        ("other challenge", other_challenge_scores),
+    ]:
+        if scores:
+            below = sum(score < threshold for score in scores)
+            print(
+                f"  {label:<16} {below}/{len(scores)} below the threshold "
+                f"(scores {min(scores):.2f}-{max(scores):.2f})"
+            )
+    if on_topic_scores:
+        # Anything below the lowest on-topic score is decided locally without
+        # misclassifying a recording of the set
+        print(
+            f"Highest threshold with no on-topic recording below it: "
+            f"{min(on_topic_scores):.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--language", default="english")
+    args = parser.parse_args()
+    asyncio.run(main(args.language))
@@ -0,0 +1,69 @@
+"""
+Translate the keywords of every lesson in data/challenges into all
+supported languages and store them in the keyword translation cache
+(KEYWORD_TRANSLATION_CACHE_PATH), so keyword extraction does not have to
+generate translations. Keywords that are already translated are skipped.
+
+Usage:
+    poetry run python ./scripts/warm_keyword_translations.py [--language german]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_feedback.ai import translate_keywords
+from ai_feedback.keyword_translations import KEYWORD_LANGUAGE
+from ai_feedback.models import SupportedLanguage
+
+CHALLENGES_DIR = Path(__file__).parent.parent / "data" / "challenges"
+
+
+def load_keywords() -> list[str]:
+    keywords = []
+    for payload_path in sorted(CHALLENGES_DIR.glob("*.json")):
+        with open(payload_path) as f:
+            payload = json.load(f)
+        for key_element in payload.get("keyElements", []):
+            keywords.extend(key_element.get("keywords", []))
+    return list(dict.fromkeys(keywords))
+
+
+async def main(languages: list[str]):
+    keywords = load_keywords()
+    if not keywords:
+        print(f"No keywords found in {CHALLENGES_DIR}")
+        return
+
+    print(f"{len(keywords)} keywords in {CHALLENGES_DIR}")
+    for language in languages:
+        translations = await translate_keywords(keywords, language)
+        print(f"{language:<10} {len(translations):>4}/{len(keywords)} translated")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--language",
+        action="append",
+        choices=[language.value for language in SupportedLanguage],
+        help="Language to translate into; repeatable (default: all but English)",
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.language
+            or [
+                language.value
+                for language in SupportedLanguage
+                if language.value != KEYWORD_LANGUAGE
+            ]
+        )
+    )
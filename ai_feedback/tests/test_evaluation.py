@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+
+def test_evaluation_reuses_its_transcript_cache():
+    env = {name: os.environ[name] for name in ("PATH", "HOME") if name in os.environ}
+    env.update(
+        AI_API_KEY="test",
+        LANGFUSE_SECRET_KEY="test",
+        LANGFUSE_PUBLIC_KEY="test",
+        LANGFUSE_HOST="http://localhost",
+    )
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import evaluation.entrypoint\n"
+            "from ai_feedback.config import settings\n"
+            "print(settings.transcript_cache_path)",
+        ],
+        cwd=PROJECT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert Path(result.stdout.strip()) == (
+        PROJECT_DIR / "evaluation" / ".cache" / "transcripts.sqlite3"
+    )
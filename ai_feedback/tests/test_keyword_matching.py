@@ -0,0 +1,236 @@
+import asyncio
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from ai_feedback.ai import get_scores_and_matching_keywords
+from ai_feedback.cache import LRUCache, TieredCache
+from ai_feedback.keyword_matching import (
+    KeywordIndex,
+    is_placeholder,
+    match_keywords_locally,
+    stem,
+    supports_local_matching,
+)
+from ai_feedback.keyword_translations import KeywordTranslationStore
+from ai_feedback.models import (
+    KeyElement,
+    KeywordMapping,
+    LessonDetailsExtractedKeywords,
+    ScriptDetails,
+    ScriptWithExtractedKeywords,
+)
+
+DEMO_DIR = Path(__file__).parent.parent / "data" / "demo_example"
+# A row of the key element table: keywords (bold when found), result, score
+TABLE_ROW_PATTERN = re.compile(r"^\| - (.*?)\s*\| (?:✅|❌|⚠️).*?\|\s*(\d+)%")
+
+
+def lesson(*key_elements: tuple[str, list[str]]) -> ScriptDetails:
+    return ScriptDetails(
+        question="What should you say?",
+        briefing="",
+        keyElements=[
+            KeyElement(script=script, keywords=keywords)
+            for script, keywords in key_elements
+        ],
+    )
+
+
+def match(script_details: ScriptDetails, transcript: str):
+    keywords = tuple(
+        keyword
+        for key_element in script_details.keyElements
+        for keyword in key_element.keywords
+    )
+    return match_keywords_locally(
+        script_details, transcript, KeywordIndex(keywords), {}
+    )
+
+
+def equivalents(script_details: ScriptDetails, transcript: str) -> list[str | None]:
+    return [
+        mapping.transcript_equivalent if mapping is not None else None
+        for mappings in match(script_details, transcript).mappings
+        for mapping in mappings
+    ]
+
+
+def test_exact_keywords_ignore_case_and_accents():
+    script_details = lesson(("Thank you for your business.", ["Thank you", "café"]))
+    assert equivalents(script_details, "THANK YOU, see you at the Cafe") == [
+        "THANK YOU",
+        "Cafe",
+    ]
+
+
+def test_stemmed_keywords_match_other_inflections():
+    script_details = lesson(
+        ("We helped you with your financial goals.", ["financial goals", "helped"])
+    )
+    assert equivalents(script_details, "I help with your financial goal") == [
+        "financial goal",
+        "help",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("word", "other"),
+    [
+        ("news", "new"),
+        ("this", "thi"),
+        ("banking", "bank"),
+        ("meeting", "meet"),
+        ("status", "statu"),
+    ],
+)
+def test_stemming_keeps_distinct_words_apart(word, other):
+    assert stem(word) != stem(other)
+
+
+@pytest.mark.parametrize(
+    ("word", "expected"),
+    [
+        ("responsibilities", "responsibility"),
+        ("classes", "class"),
+        ("matches", "match"),
+        ("changes", "change"),
+        ("uses", "use"),
+        ("needed", "need"),
+        ("speed", "speed"),
+    ],
+)
+def test_stemming_of_english_inflections(word, expected):
+    assert stem(word) == expected
+
+
+def test_fuzzy_keywords_tolerate_small_misspellings():
+    script_details = lesson(("It is a complimentary service.", ["complimentary"]))
+    result = match(script_details, "it is a complementary service")
+    assert result.mappings == [
+        [KeywordMapping(keyword="complimentary", transcript_equivalent="complementary")]
+    ]
+    assert result.fuzzy_matches == 1
+
+
+def test_keywords_with_digits_have_to_match_exactly():
+    script_details = lesson(
+        ("This takes about 10 to 15 minutes.", ["about 10 to 15 minutes"])
+    )
+    assert equivalents(script_details, "it takes about 10 to 15 minutes") == [
+        "about 10 to 15 minutes"
+    ]
+    assert equivalents(script_details, "it takes about 10 to 16 minutes") == [None]
+
+
+def test_placeholder_keywords_are_left_to_the_llm():
+    script = "Mr. Jackson ( Customer Name ), what else can I assist you with?"
+    assert is_placeholder("Customer Name", script)
+    script_details = lesson((script, ["Customer Name", "assist"]))
+    assert equivalents(script_details, "Customer Name, can I assist you?") == [
+        None,
+        "assist",
+    ]
+
+
+def test_keywords_of_a_key_element_match_different_words():
+    script_details = lesson(("There is a way to help in all ways.", ["way to", "ways"]))
+    assert equivalents(script_details, "there is a way to help") == ["way to", None]
+    assert equivalents(script_details, "a way to help in all ways") == [
+        "way to",
+        "ways",
+    ]
+
+
+def test_only_english_transcripts_are_matched_locally():
+    assert supports_local_matching("english")
+    assert supports_local_matching("English")
+    assert not supports_local_matching("spanish")
+
+
+def test_keyword_translations_ignore_the_case_of_the_language():
+    store = KeywordTranslationStore(
+        TieredCache("test", memory=LRUCache(max_entries=10, ttl_seconds=60))
+    )
+    assert asyncio.run(store.lookup(["Thank you"], "English")) == {
+        "Thank you": "Thank you"
+    }
+    asyncio.run(store.store({"Thank you": "Gracias"}, "Spanish"))
+    assert asyncio.run(store.lookup(["Thank you"], "spanish")) == {
+        "Thank you": "Gracias"
+    }
+
+
+def recorded_keywords(response_name: str) -> list[tuple[list[tuple[str, bool]], int]]:
+    """Keywords the LLM found per key element, and the scores it got."""
+    with open(DEMO_DIR / "responses" / f"{response_name}.json") as f:
+        feedback = json.load(f)["feedback"]
+    rows = []
+    for line in feedback.splitlines():
+        row = TABLE_ROW_PATTERN.match(line)
+        if row is not None:
+            keywords = [cell.strip() for cell in row.group(1).split("\\|")]
+            rows.append(
+                (
+                    [
+                        (keyword.strip("*"), keyword.startswith("**"))
+                        for keyword in keywords
+                    ],
+                    int(row.group(2)),
+                )
+            )
+    return rows
+
+
+def read_up_to_last_found_keyword(script: str, found_keywords: list[str]) -> str:
+    if not found_keywords:
+        return ""
+    last = found_keywords[-1]
+    return script[: script.index(last) + len(last)]
+
+
+@pytest.mark.parametrize(
+    "response_name", ["complete-good-reading", "incomplete-partial-reading"]
+)
+def test_scores_match_the_recorded_llm_output(response_name):
+    with open(DEMO_DIR / "challenge.json") as f:
+        script_details = ScriptDetails.model_validate(json.load(f))
+    recorded = recorded_keywords(response_name)
+    assert len(recorded) == len(script_details.keyElements)
+
+    # The responses do not record transcripts, so each reading is rebuilt
+    # from the lesson: every script up to the last keyword the LLM found
+    transcript = " ".join(
+        read_up_to_last_found_keyword(
+            key_element.script,
+            [keyword for keyword, found in keywords if found],
+        )
+        for key_element, (keywords, _) in zip(script_details.keyElements, recorded)
+    )
+    llm_result = LessonDetailsExtractedKeywords(
+        scripts=[
+            ScriptWithExtractedKeywords(
+                script=key_element.script,
+                keywords_with_equivalents=[
+                    KeywordMapping(
+                        keyword=keyword,
+                        transcript_equivalent=keyword if found else "None",
+                    )
+                    for keyword, found in keywords
+                ],
+            )
+            for key_element, (keywords, _) in zip(script_details.keyElements, recorded)
+        ],
+        transcript_matches_lesson=True,
+    )
+
+    local_matches = match(script_details, transcript)
+    # Nothing the LLM missed is found locally
+    for mappings, (keywords, _) in zip(local_matches.mappings, recorded):
+        for mapping, (keyword, found) in zip(mappings, keywords):
+            assert mapping is None or found, keyword
+
+    scores, _ = get_scores_and_matching_keywords(local_matches.merge(llm_result))
+    assert list(scores.values()) == [score for _, score in recorded]
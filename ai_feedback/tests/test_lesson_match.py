@@ -0,0 +1,64 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from ai_feedback.challenge_registry import challenge_registry
+from ai_feedback.config import settings
+from ai_feedback.lesson_match import score_lesson_match
+from ai_feedback.models import ScriptDetails
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+LESSON_PATHS = sorted((DATA_DIR / "challenges").glob("payload_*.json")) + [
+    DATA_DIR / "demo_example" / "challenge.json"
+]
+OFF_TOPIC_TRANSCRIPTS = [
+    "",
+    "Testing testing one two three",
+    "Testing, testing, one two three. Can you hear me? Is this thing on?",
+    "Okay so this is a test recording to check whether the camera and the "
+    "microphone are working properly.",
+    "Hi, um, I'm not really sure what to say here. I guess I'll just talk about "
+    "my weekend, we went hiking and it was great.",
+    "The weather today is sunny with a chance of rain in the afternoon, so "
+    "bring an umbrella.",
+]
+
+
+def load_lesson(path: Path) -> ScriptDetails:
+    with open(path) as f:
+        return ScriptDetails.model_validate(json.load(f))
+
+
+def score(script_details: ScriptDetails, transcript: str) -> float:
+    challenge = asyncio.run(challenge_registry.compile(script_details, "english"))
+    lesson_match = score_lesson_match(challenge, transcript)
+    assert lesson_match is not None
+    return lesson_match.score
+
+
+@pytest.mark.parametrize("lesson_path", LESSON_PATHS, ids=lambda path: path.name)
+def test_readings_of_the_lesson_pass_the_precheck(lesson_path):
+    script_details = load_lesson(lesson_path)
+    scripts = [key_element.script for key_element in script_details.keyElements]
+    readings = [
+        " ".join(scripts),
+        " ".join(script[: len(script) // 2] for script in scripts),
+        " ".join(scripts[:2]),
+    ]
+    for reading in readings:
+        assert (
+            score(script_details, reading)
+            >= settings.lesson_precheck_off_topic_threshold
+        )
+
+
+@pytest.mark.parametrize("lesson_path", LESSON_PATHS, ids=lambda path: path.name)
+def test_unrelated_speech_is_clearly_off_topic(lesson_path):
+    script_details = load_lesson(lesson_path)
+    for transcript in OFF_TOPIC_TRANSCRIPTS:
+        assert (
+            score(script_details, transcript)
+            < settings.lesson_precheck_off_topic_threshold
+        )
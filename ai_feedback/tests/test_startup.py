@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+# Same budget as scripts/benchmark_startup.py
+IMPORT_BUDGET_SECONDS = 1.5
+
+
+def import_main() -> subprocess.CompletedProcess:
+    # No credentials in the environment: importing must not need them
+    env = {name: os.environ[name] for name in ("PATH", "HOME") if name in os.environ}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import ai_feedback.main"],
+        cwd=PROJECT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def import_seconds(importtime_output: str) -> float:
+    for line in importtime_output.splitlines():
+        if line.startswith("import time:") and line.endswith("| ai_feedback.main"):
+            _, cumulative_us, _ = line.removeprefix("import time:").split("|")
+            return int(cumulative_us) / 1_000_000
+    raise AssertionError("ai_feedback.main missing from the -X importtime output")
+
+
+def test_main_imports_without_credentials():
+    result = import_main()
+    assert result.returncode == 0, result.stderr
+
+
+def test_main_import_stays_under_budget():
+    # The first run may compile bytecode
+    seconds = min(import_seconds(import_main().stderr) for _ in range(2))
+    assert seconds < IMPORT_BUDGET_SECONDS, (
+        f"Importing ai_feedback.main took {seconds:.2f}s, "
+        f"budget is {IMPORT_BUDGET_SECONDS}s"
+    )
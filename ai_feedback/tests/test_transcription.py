@@ -0,0 +1,162 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from ai_feedback import transcription
+from ai_feedback.audio import WHISPER_SAMPLE_RATE
+from ai_feedback.config import settings
+from ai_feedback.models import Transcript, TranscriptSegment
+from ai_feedback.transcription import (
+    CHUNK_OVERLAP_SECONDS,
+    AudioChunk,
+    _drop_repeated_prefix,
+    get_chunk_count,
+    plan_chunks,
+    stitch_transcripts,
+    transcribe_long_recording,
+)
+
+
+def speech_like_audio(seconds: int) -> np.ndarray:
+    """Two-second tones separated by one second of silence."""
+    t = np.arange(2 * WHISPER_SAMPLE_RATE) / WHISPER_SAMPLE_RATE
+    tone = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    silence = np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32)
+    return np.concatenate([tone, silence] * (seconds // 3))
+
+
+def seconds(value: float) -> int:
+    return int(value * WHISPER_SAMPLE_RATE)
+
+
+def test_long_recording_is_split_into_several_chunks():
+    threshold = settings.whisper_chunking_threshold_seconds
+    assert threshold is not None
+    samples = speech_like_audio(int(threshold) + 60)
+
+    n_chunks = get_chunk_count(samples)
+    chunks = plan_chunks(samples, n_chunks)
+
+    assert n_chunks > 1
+    assert len(chunks) == n_chunks
+    assert chunks[0].core_start == 0
+    assert chunks[-1].core_end == len(samples)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert previous.core_end == current.core_start
+
+
+def test_short_recording_is_not_split():
+    assert get_chunk_count(speech_like_audio(30)) == 1
+
+
+def test_recording_passed_as_a_path_is_not_split():
+    assert get_chunk_count("video.mp4") == 1
+
+
+def test_chunks_are_cut_in_silence_and_overlap(monkeypatch):
+    samples = np.zeros(seconds(60), dtype=np.float32)
+    # Speech with gaps at 26-28s (midpoint 27s) and 40-42s
+    speech = [(0, 26), (28, 40), (42, 60)]
+    monkeypatch.setattr(
+        transcription,
+        "get_speech_timestamps",
+        lambda audio, vad_options: [
+            {"start": seconds(start), "end": seconds(end)} for start, end in speech
+        ],
+    )
+    overlap = seconds(CHUNK_OVERLAP_SECONDS)
+
+    chunks = plan_chunks(samples, 2)
+
+    # The gap nearest the even split point at 30s, within a quarter chunk
+    assert chunks[0].core_end == chunks[1].core_start == seconds(27)
+    assert (chunks[0].start, chunks[0].end) == (0, seconds(27) + overlap)
+    assert (chunks[1].start, chunks[1].end) == (seconds(27) - overlap, len(samples))
+
+
+def test_chunks_are_cut_evenly_without_a_nearby_gap(monkeypatch):
+    samples = np.zeros(seconds(60), dtype=np.float32)
+    monkeypatch.setattr(
+        transcription,
+        "get_speech_timestamps",
+        lambda audio, vad_options: [
+            {"start": 0, "end": seconds(10)},
+            {"start": seconds(12), "end": seconds(60)},
+        ],
+    )
+
+    chunks = plan_chunks(samples, 2)
+
+    assert chunks[0].core_end == seconds(30)
+
+
+def test_single_chunk_covers_the_recording():
+    samples = speech_like_audio(30)
+    assert plan_chunks(samples, 1) == [AudioChunk(0, len(samples), 0, len(samples))]
+
+
+def test_repeated_prefix_is_dropped():
+    assert (
+        _drop_repeated_prefix("The quick brown fox.", " brown Fox jumps over")
+        == " jumps over"
+    )
+
+
+def test_prefix_without_repetition_is_kept():
+    assert _drop_repeated_prefix("The quick brown fox", " jumps over") == " jumps over"
+
+
+def test_fully_repeated_text_is_dropped():
+    assert _drop_repeated_prefix("The quick brown fox", " brown fox") == ""
+
+
+def test_stitching_keeps_core_segments_in_order():
+    chunks = [
+        AudioChunk(0, seconds(11), 0, seconds(10)),
+        AudioChunk(seconds(9), seconds(20), seconds(10), seconds(20)),
+    ]
+    first = [
+        TranscriptSegment(start=0, end=4, text=" Hello there."),
+        TranscriptSegment(start=4, end=9.5, text=" How are you"),
+        # In the overlap, transcribed by the second chunk
+        TranscriptSegment(start=10.2, end=11, text=" you doing"),
+    ]
+    second = [
+        # In the overlap, transcribed by the first chunk
+        TranscriptSegment(start=0, end=0.5, text=" you"),
+        TranscriptSegment(start=0.5, end=3, text=" are you doing today"),
+        TranscriptSegment(start=3, end=5, text=" Fine."),
+    ]
+
+    transcript = stitch_transcripts(
+        chunks,
+        [Transcript(text="", segments=first), Transcript(text="", segments=second)],
+    )
+
+    assert transcript.text == " Hello there.  How are you  doing today  Fine."
+    assert [(segment.start, segment.end) for segment in transcript.segments] == [
+        (0, 4),
+        (4, 9.5),
+        (9.5, 12),
+        (12, 14),
+    ]
+
+
+def test_single_replica_batches_the_whole_recording():
+    samples = speech_like_audio(150)
+    calls = []
+
+    async def transcribe_batch(audio_sources, language, batch_size, decode_profile):
+        calls.append((audio_sources, batch_size))
+        return [Transcript(text=" words", segments=[])]
+
+    pool = SimpleNamespace(replicas=1, transcribe_batch=transcribe_batch)
+    transcript = asyncio.run(
+        transcribe_long_recording(pool, samples, "english", None, 4)  # type: ignore
+    )
+
+    assert transcript.text == " words"
+    ((audio_sources, batch_size),) = calls
+    assert len(audio_sources) == 1 and audio_sources[0] is samples
+    assert batch_size == 4
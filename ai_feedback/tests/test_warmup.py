@@ -0,0 +1,31 @@
+import asyncio
+from types import SimpleNamespace
+
+from ai_feedback import warmup
+from ai_feedback.warmup import WarmUp
+
+
+def test_whisper_warm_up_is_retried_until_ready(monkeypatch):
+    attempts = []
+
+    async def transcribe(audio, language):
+        attempts.append(language)
+        if len(attempts) < 3:
+            raise RuntimeError("model download failed")
+
+    async def no_llm_connections(self):
+        raise RuntimeError("no network")
+
+    monkeypatch.setattr(warmup, "WHISPER_RETRY_INITIAL_SECONDS", 0)
+    monkeypatch.setattr(
+        warmup, "whisper_pool", SimpleNamespace(transcribe=transcribe, replicas=1)
+    )
+    monkeypatch.setattr(WarmUp, "_warm_up_llm_connections", no_llm_connections)
+
+    warm_up = WarmUp()
+    asyncio.run(warm_up.run())
+
+    assert len(attempts) == 3
+    # Neither the LLM connections nor prompts loaded from Langfuse gate readiness
+    assert warm_up.status()["ready"]
+    assert set(warm_up.status()["prompts"].values()) == {"fallback"}